@@ -8,18 +8,8 @@ import xml.etree.ElementTree as ET
 import json
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
-from .factory import ParserFactory
-from .parsers import (
-    IliasComponentParser,
-    GroupParser,
-    TestParser,
-    MediaCastParser,
-    FileParser,
-    ItemGroupParser,
-    CourseParser,
-    MediaPoolParser,
-    LearningModuleParser
-)
+from .factory import ParserFactory, parse_components
+from .parsers.base import MEDIA_EXTS, guess_mime_type, iter_files
 from .container_parser import ContainerStructureParser, ContainerStructure
 from ..log_handler import InMemoryLogHandler, create_log_handler
 
@@ -54,6 +44,10 @@ Item = Dict[str, Any]
 class IliasAnalyzer:
     """Analysiert einen ILIAS-Export und extrahiert die Struktur und Inhalte."""
     
+    # Anzahl der Worker-Prozesse für das Parsen der Komponenten; None parst
+    # nacheinander im aktuellen Prozess (siehe parse_components)
+    PARSE_WORKERS: Optional[int] = None
+    
     def __init__(self, export_dir: str):
         """
         Initialisiert den Analyzer.
@@ -188,8 +182,7 @@ class IliasAnalyzer:
             
             # Komponenten in den Export-Sets analysieren
             # Jeder "Export-Set" Pfad IST ein Komponenten-Verzeichnis
-            for component_path in export_sets:
-                self._analyze_component(component_path)
+            self._analyze_components(export_sets)
             
             # Versuche, die Container-Struktur zu parsen (falls vorhanden)
             self._parse_container_structure(export_sets)
@@ -254,8 +247,7 @@ class IliasAnalyzer:
             
             # Wenn Komponenten-Verzeichnisse gefunden wurden, analysiere diese
             if component_dirs:
-                for component_path in component_dirs:
-                    self._analyze_component(component_path)
+                self._analyze_components(component_dirs)
                 return
             
             # Fallback: Suche nach manifest.xml
@@ -302,11 +294,67 @@ class IliasAnalyzer:
         Args:
             component_path: Pfad zur Komponente
         """
+        self._analyze_components([component_path])
+    
+    def _analyze_components(self, component_paths: List[str]) -> None:
+        """
+        Analysiert mehrere Komponenten und extrahiert die Daten.
+        
+        Typ und Titel werden nacheinander ermittelt; die Parser (XML-Auswertung und
+        Dateisystem-Fallbacks) laufen anschließend gesammelt über parse_components(),
+        mit PARSE_WORKERS in eigenen Prozessen. Die Reihenfolge der Komponenten
+        bleibt erhalten.
+        
+        Args:
+            component_paths: Pfade zu den Komponenten
+        """
+        prepared = [self._prepare_component(component_path) for component_path in component_paths]
+        pending = []
+        for entry in prepared:
+            if entry is None or "data" in entry:
+                continue
+            if ParserFactory.get_parser_class(entry["type"]) is None:
+                logger.warning(f"Kein Parser für Komponententyp '{entry['type']}' gefunden")
+                continue
+            pending.append(entry)
+        parsed = parse_components([(entry["type"], entry["path"]) for entry in pending],
+                                  max_workers=self.PARSE_WORKERS)
+        results = {id(entry): result for entry, result in zip(pending, parsed)}
+        
+        for entry in prepared:
+            if entry is None:
+                continue
+            if "data" in entry:
+                self.components.append(entry)
+                continue
+            # Komponenten ohne Parser wurden oben bereits übersprungen
+            result = results.get(id(entry))
+            if result is None:
+                continue
+            component_data, error = result
+            if error is not None:
+                # Im Analyzer-Logger protokollieren, damit der Fehler im Frontend erscheint
+                logger.error(error)
+                continue
+            self._add_parsed_component(entry, component_data)
+    
+    def _prepare_component(self, component_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Ermittelt Typ und Titel einer Komponente ohne sie zu parsen.
+        
+        Args:
+            component_path: Pfad zur Komponente
+            
+        Returns:
+            Fertige Komponente (mit "data"), wenn kein Manifest vorhanden ist, sonst die
+            zu parsende Komponente mit "type", "path", "title" und "manifest_title";
+            None, wenn die Komponente nicht analysiert werden kann
+        """
         try:
             # Prüfen, ob die Komponente existiert
             if not os.path.exists(component_path):
                 logger.error(f"Die Komponente existiert nicht: {component_path}")
-                return
+                return None
             
             logger.info(f"Analysiere Komponente: {component_path}")
             
@@ -366,21 +414,18 @@ class IliasAnalyzer:
                     logger.info(f"Verwende Komponententyp aus Pfad: {path_component_type}")
                     
                     # Erstelle eine einfache Komponente basierend auf dem Pfad
-                    # Komponente zur Liste hinzufügen
-                    self.components.append({
+                    logger.info(f"Komponente aus Pfad erstellt: {path_component_type} - {component_title}")
+                    return {
                         "type": path_component_type,
                         "path": component_path,
                         "data": {
                             "id": component_id,
                             "title": component_title
                         }
-                    })
-                    
-                    logger.info(f"Komponente aus Pfad erstellt: {path_component_type} - {component_title}")
-                    return
+                    }
                 
                 logger.info(f"Verzeichnisinhalt: {os.listdir(component_path)}")
-                return
+                return None
             
             # Manifest-Datei parsen
             try:
@@ -388,7 +433,7 @@ class IliasAnalyzer:
                 root = tree.getroot()
             except ET.ParseError as e:
                 logger.error(f"Fehler beim Parsen der Manifest-Datei {manifest_path}: {str(e)}")
-                return
+                return None
             
             # Komponententyp ermitteln (MainEntity ist das korrekte Attribut in ILIAS-Manifesten)
             component_type = root.get("MainEntity", "unknown")
@@ -405,44 +450,56 @@ class IliasAnalyzer:
                 component_type = path_component_type
                 logger.info(f"Verwende Komponententyp aus Pfad: {component_type}")
             
-            # Parser für den Komponententyp auswählen
-            parser = ParserFactory.get_parser(component_type, component_path)
-            if parser:
-                # Komponente parsen
-                try:
-                    component_data = parser.parse()
-                    
-                    # Wenn der Titel in den geparsten Daten vorhanden ist, verwende diesen
-                    # ABER: manifest-Titel hat Priorität, falls Parser-Titel nur ein Dateiname ist (MediaObject)
-                    if "title" in component_data and component_data["title"]:
-                        parser_title = component_data["title"]
-                        # Wenn wir einen manifest-Titel haben und der Parser-Titel ein Dateiname ist
-                        # (z.B. "reward-points.png"), behalte den manifest-Titel
-                        if manifest_title and '.' in parser_title and not parser_title.startswith(manifest_title):
-                            # Parser hat einen Dateinamen gefunden, verwende manifest-Titel
-                            component_title = manifest_title
-                            component_data["title"] = manifest_title
-                        else:
-                            component_title = parser_title
-                    else:
-                        # Füge den extrahierten Titel zu den Daten hinzu
-                        component_data["title"] = component_title if component_title else manifest_title
-                    
-                    # Komponente zur Liste hinzufügen
-                    self.components.append({
-                        "type": component_type,
-                        "path": component_path,
-                        "data": component_data
-                    })
-                    
-                    logger.info(f"Komponente analysiert: {component_type} - {component_data.get('title', 'Unbekannt')}")
-                except Exception as e:
-                    logger.exception(f"Fehler beim Parsen der Komponente {component_path}: {str(e)}")
-            else:
-                logger.warning(f"Kein Parser für Komponententyp '{component_type}' gefunden")
+            # Geparst wird gesammelt in _analyze_components()
+            return {
+                "type": component_type,
+                "path": component_path,
+                "title": component_title,
+                "manifest_title": manifest_title
+            }
         
         except Exception as e:
             logger.exception(f"Fehler bei der Analyse der Komponente {component_path}: {str(e)}")
+            return None
+    
+    def _add_parsed_component(self, entry: Dict[str, Any], component_data: Dict[str, Any]) -> None:
+        """
+        Übernimmt die Parser-Ergebnisse einer Komponente in die Komponentenliste.
+        
+        Args:
+            entry: Von _prepare_component() ermittelte Komponente
+            component_data: Vom Parser extrahierte Daten
+        """
+        component_type = entry["type"]
+        component_title = entry["title"]
+        manifest_title = entry["manifest_title"]
+        try:
+            # Wenn der Titel in den geparsten Daten vorhanden ist, verwende diesen
+            # ABER: manifest-Titel hat Priorität, falls Parser-Titel nur ein Dateiname ist (MediaObject)
+            if "title" in component_data and component_data["title"]:
+                parser_title = component_data["title"]
+                # Wenn wir einen manifest-Titel haben und der Parser-Titel ein Dateiname ist
+                # (z.B. "reward-points.png"), behalte den manifest-Titel
+                if manifest_title and '.' in parser_title and not parser_title.startswith(manifest_title):
+                    # Parser hat einen Dateinamen gefunden, verwende manifest-Titel
+                    component_title = manifest_title
+                    component_data["title"] = manifest_title
+                else:
+                    component_title = parser_title
+            else:
+                # Füge den extrahierten Titel zu den Daten hinzu
+                component_data["title"] = component_title if component_title else manifest_title
+            
+            # Komponente zur Liste hinzufügen
+            self.components.append({
+                "type": component_type,
+                "path": entry["path"],
+                "data": component_data
+            })
+            
+            logger.info(f"Komponente analysiert: {component_type} - {component_data.get('title', 'Unbekannt')}")
+        except Exception as e:
+            logger.exception(f"Fehler beim Parsen der Komponente {entry['path']}: {str(e)}")
     
     def _parse_container_structure(self, export_sets: List[str]) -> None:
         """
@@ -630,17 +687,14 @@ class IliasAnalyzer:
                 elif "title" in comp_data:
                     # Suche nach Mediendateien im Komponenten-Pfad
                     media_files = []
-                    component_path = component["path"]
-                    for root, dirs, files in os.walk(component_path):
-                        for file in files:
-                            if file.lower().endswith(('.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv')):
-                                media_files.append(os.path.join(root, file))
+                    for filename, _, _ in iter_files(component["path"]):
+                        _, dot, ext = filename.lower().rpartition('.')
+                        if dot and ext in MEDIA_EXTS:
+                            media_files.append(filename)
                     
                     # Füge gefundene Mediendateien als Items hinzu
-                    for i, media_path in enumerate(media_files):
-                        filename = os.path.basename(media_path)
-                        import mimetypes
-                        mime_type, encoding = mimetypes.guess_type(media_path)
+                    for i, filename in enumerate(media_files):
+                        mime_type = guess_mime_type(filename)
                         
                         module.add_item(
                             id=f"media_{i}",
@@ -4,37 +4,52 @@ Factory für ILIAS-Komponenten-Parser.
 
 import os
 import logging
-from typing import Optional, Dict, Type
-from .parsers import (
-    IliasComponentParser,
-    GroupParser,
-    TestParser,
-    MediaCastParser,
-    FileParser,
-    ItemGroupParser,
-    CourseParser,
-    MediaPoolParser,
-    LearningModuleParser
-)
+import multiprocessing
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Dict, Sequence, Tuple, Type, Union
+from . import parsers
+from .parsers import IliasComponentParser
 
 logger = logging.getLogger(__name__)
 
+# Unterhalb dieser Anzahl von Komponenten kostet der Prozess-Pool mehr, als er spart
+_PARALLEL_MIN_JOBS = 4
+
 class ParserFactory:
     """Factory-Klasse für die Erstellung von Parsern für verschiedene ILIAS-Komponenten."""
     
-    # Mapping von Komponententypen zu Parser-Klassen
-    _parsers: Dict[str, Type[IliasComponentParser]] = {
-        'crs': CourseParser,
-        'grp': GroupParser,
-        'fold': GroupParser,  # Folder (Ordner) sind strukturell ähnlich zu Groups
-        'tst': TestParser,
-        'mcst': MediaCastParser,
-        'mep': MediaPoolParser,
-        'lm': LearningModuleParser,
-        'file': FileParser,
-        'itgr': ItemGroupParser
+    # Mapping von Komponententypen zu Parser-Klassen; die eingebauten Parser sind
+    # als Klassennamen hinterlegt und werden erst beim ersten Zugriff importiert
+    _parsers: Dict[str, Union[str, Type[IliasComponentParser]]] = {
+        'crs': 'CourseParser',
+        'grp': 'GroupParser',
+        'fold': 'GroupParser',  # Folder (Ordner) sind strukturell ähnlich zu Groups
+        'tst': 'TestParser',
+        'mcst': 'MediaCastParser',
+        'mep': 'MediaPoolParser',
+        'lm': 'LearningModuleParser',
+        'file': 'FileParser',
+        'itgr': 'ItemGroupParser'
     }
     
+    @classmethod
+    def get_parser_class(cls, component_type: str) -> Optional[Type[IliasComponentParser]]:
+        """
+        Gibt die Parser-Klasse für den angegebenen Komponententyp zurück.
+        
+        Args:
+            component_type: Typ der Komponente
+            
+        Returns:
+            Parser-Klasse oder None, wenn kein Parser registriert ist
+        """
+        parser_class = cls._parsers.get(component_type)
+        if isinstance(parser_class, str):
+            # Lädt das Parser-Modul über das Paket parsers (PEP 562)
+            parser_class = cls._parsers[component_type] = getattr(parsers, parser_class)
+        return parser_class
+    
     @classmethod
     def get_parser(cls, component_type: str, component_path: str) -> Optional[IliasComponentParser]:
         """
@@ -52,7 +67,7 @@ class ParserFactory:
             logger.error(f"Der Komponenten-Pfad existiert nicht: {component_path}")
             return None
         
-        parser_class = cls._parsers.get(component_type)
+        parser_class = cls.get_parser_class(component_type)
         if parser_class:
             try:
                 return parser_class(component_path)
@@ -83,4 +98,86 @@ class ParserFactory:
         Returns:
             Liste der unterstützten Typen
         """
-        return list(cls._parsers.keys()) 
\ No newline at end of file
+        return list(cls._parsers.keys()) 
+
+
+def _parse_one(job: Tuple[Type[IliasComponentParser], str]
+               ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parst eine einzelne Komponente (läuft ggf. im Worker-Prozess).
+    
+    Fehler werden nicht hier protokolliert, sondern als Text zurückgegeben, damit der
+    Aufrufer sie in seinem Prozess und mit seinem Logger ausgeben kann.
+    
+    Args:
+        job: Tupel aus Parser-Klasse und Komponenten-Pfad
+        
+    Returns:
+        (Daten, None) oder (None, Fehlermeldung samt Traceback), wenn der Parser fehlschlägt
+    """
+    parser_class, component_path = job
+    try:
+        return parser_class(component_path).parse(), None
+    except Exception as e:
+        message = f"Fehler beim Parsen der Komponente {component_path}: {str(e)}"
+        return None, f"{message}\n{traceback.format_exc().rstrip()}"
+
+
+def parse_components(components: Sequence[Tuple[str, str]],
+                     parser_map: Optional[Dict[str, Type[IliasComponentParser]]] = None,
+                     max_workers: Optional[int] = None
+                     ) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parst mehrere voneinander unabhängige Komponenten, auf Wunsch in eigenen Prozessen.
+    
+    Standardmäßig wird nacheinander im aufrufenden Prozess geparst. Mit max_workers > 1
+    und mindestens _PARALLEL_MIN_JOBS Komponenten läuft jeder Parser in einem Worker
+    eines nur für diesen Aufruf erstellten Prozess-Pools. Die Worker werden per
+    'spawn' gestartet, da ein fork aus einem Prozess mit Threads (z.B. einem
+    Web-Server) deren Sperren in undefiniertem Zustand übernimmt. Lässt sich der
+    Pool nicht nutzen (z.B. nicht picklebare Parser-Klassen), wird nacheinander geparst.
+    
+    Args:
+        components: Liste von (Komponententyp, Komponenten-Pfad)
+        parser_map: Mapping von Komponententypen zu Parser-Klassen (Standard: ParserFactory)
+        max_workers: Höchstzahl der Worker-Prozesse (Standard: None, kein Prozess-Pool)
+        
+    Returns:
+        (Daten, Fehlermeldung) in der Reihenfolge von components: (Daten, None) bei
+        Erfolg, (None, Fehlermeldung) wenn der Parser fehlgeschlagen ist und
+        (None, None) für Typen ohne Parser (hier als Warnung protokolliert)
+    """
+    get_parser_class = parser_map.get if parser_map is not None else ParserFactory.get_parser_class
+    
+    results: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [(None, None)] * len(components)
+    jobs = []
+    indices = []
+    for index, (component_type, component_path) in enumerate(components):
+        parser_class = get_parser_class(component_type)
+        if parser_class is None:
+            logger.warning(f"Kein Parser für Komponententyp '{component_type}' gefunden")
+            continue
+        jobs.append((parser_class, component_path))
+        indices.append(index)
+    
+    # Ohne max_workers oder für wenige Komponenten lohnt sich kein Prozess-Pool
+    workers = min(len(jobs), max_workers or 1)
+    parsed = None
+    if len(jobs) >= _PARALLEL_MIN_JOBS and workers > 1:
+        # Etwa vier Pakete pro Worker (wie bei multiprocessing.Pool.map)
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                parsed = list(executor.map(_parse_one, jobs, chunksize=chunksize))
+        except Exception as e:
+            # Parser-Fehler fängt _parse_one ab; hier bleiben Fehler des Pools selbst
+            # (Start der Worker, Pickling der Aufträge, abgebrochene Worker)
+            logger.warning(f"Prozess-Pool nicht nutzbar, parse Komponenten nacheinander: {str(e)}")
+            parsed = None
+    if parsed is None:
+        parsed = [_parse_one(job) for job in jobs]
+    
+    for index, result in zip(indices, parsed):
+        results[index] = result
+    return results
@@ -15,6 +15,39 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Schlüssel, aus denen der Intro-Text einer Aktivität gelesen wird (in Prioritätsreihenfolge)
+_INTRO_METADATA_KEYS = ('description', 'intro', 'summary', 'content')
+_INTRO_ITEM_KEYS = ('description', 'intro', 'summary')
+
+# Vorgefertigter Inhalt für XML-Dateien, die nur aus einem leeren Wurzelelement bestehen
+_EMPTY_XML_FILES = {
+    tag: f'<?xml version="1.0" encoding="UTF-8"?>\n<{tag} />'.encode('utf-8')
+    for tag in (
+        'files', 'scales', 'outcomes', 'question_categories', 'groups', 'gradebook',
+        'grade_history', 'completions', 'badges', 'activity_gradebook', 'roles', 'inforef',
+        'filters', 'comments', 'logstores', 'competencies', 'calendar', 'xapistate', 'logs'
+    )
+}
+
+# Zusätzliche Aktivitätsdateien (Dateiname, Wurzelelement)
+_ADDITIONAL_ACTIVITY_FILES = (
+    ('grading.xml', 'activity_gradebook'),
+    ('filters.xml', 'filters'),
+    ('comments.xml', 'comments'),
+    ('completion.xml', 'completions'),
+    ('logstores.xml', 'logstores'),
+    ('competencies.xml', 'competencies'),
+    ('grade_history.xml', 'grade_history'),
+    ('calendar.xml', 'calendar'),
+    ('xapistate.xml', 'xapistate'),
+    ('logs.xml', 'logs'),
+)
+
+# Bereits komprimierte Formate, die unkomprimiert (ZIP_STORED) ins Archiv kommen
+_STORED_EXTENSIONS = frozenset({
+    'mp4', 'mp3', 'pdf', 'docx', 'pptx', 'xlsx', 'zip', 'jpg', 'jpeg', 'png', 'gif'
+})
+
 class MoodleConverter:
     """
     Konvertiert ILIAS-Kursdaten in ein Moodle-Backup-Format.
@@ -37,6 +70,9 @@ class MoodleConverter:
         self.conversion_report = None
         self.use_structure_mapper = True  # Flag zum Aktivieren des neuen Mappings
         
+        # Zeitstempel des Backup-Laufs (siehe _backup_timestamp)
+        self._ts = None
+        
     def _write_xml_file(self, tree, filepath):
         """
         Schreibt eine XML-Datei mit korrekter XML-Deklaration.
@@ -48,6 +84,17 @@ class MoodleConverter:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
             tree.write(f, encoding='unicode', xml_declaration=False)
+    
+    def _write_empty_xml_file(self, root_tag, filepath):
+        """
+        Schreibt eine XML-Datei, die nur aus einem leeren Wurzelelement besteht.
+        
+        Args:
+            root_tag: Name des Wurzelelements (Schlüssel in _EMPTY_XML_FILES)
+            filepath: Pfad, wohin die XML-Datei geschrieben werden soll
+        """
+        with open(filepath, 'wb') as f:
+            f.write(_EMPTY_XML_FILES[root_tag])
         
     def convert(self, generate_report: bool = True) -> str:
         """
@@ -749,8 +796,23 @@ class MoodleConverter:
         tree = ET.ElementTree(root)
         self._write_xml_file(tree, os.path.join(self.moodle_dir, 'course', 'sections.xml'))
     
+    def _backup_timestamp(self) -> str:
+        """
+        Liefert den Zeitstempel des Backup-Laufs; wird beim ersten Zugriff gesetzt,
+        falls die Hilfsmethoden ohne _create_activity_xmls aufgerufen werden.
+        
+        Returns:
+            Unix-Zeitstempel als String
+        """
+        if self._ts is None:
+            self._ts = str(int(datetime.now().timestamp()))
+        return self._ts
+    
     def _create_activity_xmls(self):
         """Erstellt die XML-Dateien für die Aktivitäten."""
+        # Ein Zeitstempel pro Backup-Lauf für alle Aktivitätsdateien
+        self._ts = str(int(datetime.now().timestamp()))
+        
         # NEU: Nutze MoodleStructure wenn verfügbar
         if self.moodle_structure:
             # Neue Struktur-basierte Generierung
@@ -904,19 +966,16 @@ class MoodleConverter:
         if fallback_intro:
             return fallback_intro
 
-        metadata = item.get('metadata') if isinstance(item, dict) else None
-        if isinstance(metadata, dict):
-            for key in ('description', 'intro', 'summary', 'content'):
-                value = metadata.get(key)
-                if value:
-                    return value
+        if not isinstance(item, dict):
+            return ''
 
-        for key in ('description', 'intro', 'summary'):
-            value = item.get(key) if isinstance(item, dict) else None
+        metadata = item.get('metadata')
+        if isinstance(metadata, dict):
+            value = next((v for key in _INTRO_METADATA_KEYS if (v := metadata.get(key))), None)
             if value:
                 return value
 
-        return ''
+        return next((v for key in _INTRO_ITEM_KEYS if (v := item.get(key))), '')
 
     def _create_activity_xml(
         self,
@@ -949,7 +1008,7 @@ class MoodleConverter:
         intro_elem.text = intro or ''
         ET.SubElement(root, 'introformat').text = '1'
 
-        timestamp = str(int(datetime.now().timestamp()))
+        timestamp = self._backup_timestamp()
         ET.SubElement(root, 'timecreated').text = timestamp
         ET.SubElement(root, 'timemodified').text = timestamp
 
@@ -984,8 +1043,7 @@ class MoodleConverter:
         ET.SubElement(root, 'instance').text = str(instance_id)
         ET.SubElement(root, 'idnumber').text = ''
 
-        timestamp = str(int(datetime.now().timestamp()))
-        ET.SubElement(root, 'added').text = timestamp
+        ET.SubElement(root, 'added').text = self._backup_timestamp()
         ET.SubElement(root, 'score').text = '0'
         ET.SubElement(root, 'indent').text = '0'
         ET.SubElement(root, 'visible').text = '1' if visible else '0'
@@ -1004,19 +1062,11 @@ class MoodleConverter:
     
     def _create_grades_xml(self, activity_dir):
         """Erstellt die grades.xml-Datei für eine Aktivität."""
-        root = ET.Element('activity_gradebook')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'grades.xml'))
+        self._write_empty_xml_file('activity_gradebook', os.path.join(activity_dir, 'grades.xml'))
     
     def _create_roles_xml_for_activity(self, activity_dir):
         """Erstellt die roles.xml-Datei für eine Aktivität."""
-        root = ET.Element('roles')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'roles.xml'))
+        self._write_empty_xml_file('roles', os.path.join(activity_dir, 'roles.xml'))
     
     def _create_resource_xml(
         self,
@@ -1046,7 +1096,7 @@ class MoodleConverter:
         ET.SubElement(resource, 'section').text = str(section_number)
         ET.SubElement(resource, 'sectionnumber').text = str(section_number)
         ET.SubElement(resource, 'visible').text = '1' if visible else '0'
-        ET.SubElement(resource, 'timemodified').text = str(int(datetime.now().timestamp()))
+        ET.SubElement(resource, 'timemodified').text = self._backup_timestamp()
 
         tree = ET.ElementTree(root)
         self._write_xml_file(tree, os.path.join(activity_dir, 'resource.xml'))
@@ -1079,7 +1129,7 @@ class MoodleConverter:
         ET.SubElement(forum, 'section').text = str(section_number)
         ET.SubElement(forum, 'sectionnumber').text = str(section_number)
         ET.SubElement(forum, 'visible').text = '1' if visible else '0'
-        ET.SubElement(forum, 'timemodified').text = str(int(datetime.now().timestamp()))
+        ET.SubElement(forum, 'timemodified').text = self._backup_timestamp()
 
         tree = ET.ElementTree(root)
         self._write_xml_file(tree, os.path.join(activity_dir, 'forum.xml'))
@@ -1112,7 +1162,7 @@ class MoodleConverter:
         ET.SubElement(quiz, 'section').text = str(section_number)
         ET.SubElement(quiz, 'sectionnumber').text = str(section_number)
         ET.SubElement(quiz, 'visible').text = '1' if visible else '0'
-        ET.SubElement(quiz, 'timemodified').text = str(int(datetime.now().timestamp()))
+        ET.SubElement(quiz, 'timemodified').text = self._backup_timestamp()
 
         tree = ET.ElementTree(root)
         self._write_xml_file(tree, os.path.join(activity_dir, 'quiz.xml'))
@@ -1145,18 +1195,14 @@ class MoodleConverter:
         ET.SubElement(folder, 'section').text = str(section_number)
         ET.SubElement(folder, 'sectionnumber').text = str(section_number)
         ET.SubElement(folder, 'visible').text = '1' if visible else '0'
-        ET.SubElement(folder, 'timemodified').text = str(int(datetime.now().timestamp()))
+        ET.SubElement(folder, 'timemodified').text = self._backup_timestamp()
 
         tree = ET.ElementTree(root)
         self._write_xml_file(tree, os.path.join(activity_dir, 'folder.xml'))
     
     def _create_files_xml(self):
         """Erstellt die files.xml-Datei."""
-        root = ET.Element('files')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'files.xml'))
+        self._write_empty_xml_file('files', os.path.join(self.moodle_dir, 'files.xml'))
     
     def _create_users_xml(self):
         """Erstellt die users.xml-Datei."""
@@ -1212,67 +1258,35 @@ class MoodleConverter:
     
     def _create_scales_xml(self):
         """Erstellt die scales.xml-Datei."""
-        root = ET.Element('scales')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'scales.xml'))
+        self._write_empty_xml_file('scales', os.path.join(self.moodle_dir, 'scales.xml'))
     
     def _create_outcomes_xml(self):
         """Erstellt die outcomes.xml-Datei."""
-        root = ET.Element('outcomes')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'outcomes.xml'))
+        self._write_empty_xml_file('outcomes', os.path.join(self.moodle_dir, 'outcomes.xml'))
     
     def _create_questions_xml(self):
         """Erstellt die questions.xml-Datei."""
-        root = ET.Element('question_categories')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'questions.xml'))
+        self._write_empty_xml_file('question_categories', os.path.join(self.moodle_dir, 'questions.xml'))
     
     def _create_groups_xml(self):
         """Erstellt die groups.xml-Datei."""
-        root = ET.Element('groups')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'groups.xml'))
+        self._write_empty_xml_file('groups', os.path.join(self.moodle_dir, 'groups.xml'))
     
     def _create_gradebook_xml(self):
         """Erstellt die gradebook.xml-Datei."""
-        root = ET.Element('gradebook')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'gradebook.xml'))
+        self._write_empty_xml_file('gradebook', os.path.join(self.moodle_dir, 'gradebook.xml'))
     
     def _create_grade_history_xml(self):
         """Erstellt die grade_history.xml-Datei."""
-        root = ET.Element('grade_history')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'grade_history.xml'))
+        self._write_empty_xml_file('grade_history', os.path.join(self.moodle_dir, 'grade_history.xml'))
     
     def _create_completion_xml(self):
         """Erstellt die completion.xml-Datei."""
-        root = ET.Element('completions')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'completion.xml'))
+        self._write_empty_xml_file('completions', os.path.join(self.moodle_dir, 'completion.xml'))
     
     def _create_badges_xml(self):
         """Erstellt die badges.xml-Datei."""
-        root = ET.Element('badges')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(self.moodle_dir, 'badges.xml'))
+        self._write_empty_xml_file('badges', os.path.join(self.moodle_dir, 'badges.xml'))
     
     def _create_section_files(self):
         """Erstellt die Abschnittsverzeichnisse und XML-Dateien."""
@@ -1405,63 +1419,12 @@ class MoodleConverter:
     
     def _create_inforef_xml(self, directory):
         """Erstellt eine inforef.xml-Datei im angegebenen Verzeichnis."""
-        root = ET.Element('inforef')
-        
-        # Schreibe die XML-Datei
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(directory, 'inforef.xml'))
+        self._write_empty_xml_file('inforef', os.path.join(directory, 'inforef.xml'))
     
     def _create_additional_activity_files(self, activity_dir):
         """Erstellt zusätzliche XML-Dateien für eine Aktivität."""
-        # Grading
-        root = ET.Element('activity_gradebook')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'grading.xml'))
-        
-        # Filters
-        root = ET.Element('filters')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'filters.xml'))
-        
-        # Comments
-        root = ET.Element('comments')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'comments.xml'))
-        
-        # Completion
-        root = ET.Element('completions')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'completion.xml'))
-        
-        # Logstores
-        root = ET.Element('logstores')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'logstores.xml'))
-        
-        # Competencies
-        root = ET.Element('competencies')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'competencies.xml'))
-        
-        # Grade history
-        root = ET.Element('grade_history')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'grade_history.xml'))
-        
-        # Calendar
-        root = ET.Element('calendar')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'calendar.xml'))
-        
-        # XAPIState
-        root = ET.Element('xapistate')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'xapistate.xml'))
-        
-        # Logs
-        root = ET.Element('logs')
-        tree = ET.ElementTree(root)
-        self._write_xml_file(tree, os.path.join(activity_dir, 'logs.xml'))
+        for filename, root_tag in _ADDITIONAL_ACTIVITY_FILES:
+            self._write_empty_xml_file(root_tag, os.path.join(activity_dir, filename))
     
     def _create_mbz_file(self) -> str:
         """
@@ -1475,13 +1438,24 @@ class MoodleConverter:
         mbz_filename = f"{safe_title}_moodle_backup.mbz"
         mbz_path = os.path.join(self.temp_dir, mbz_filename)
         
-        # Erstelle die ZIP-Datei
-        with zipfile.ZipFile(mbz_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(self.moodle_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, self.moodle_dir)
-                    zipf.write(file_path, arcname)
+        # Erstelle die ZIP-Datei (ZIP64 von Anfang an, schnelle Kompressionsstufe)
+        with zipfile.ZipFile(mbz_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1) as zipf:
+            # Verzeichnisse mit ihrem Archivpräfix; Pfade werden per Verkettung gebildet
+            stack = [(self.moodle_dir, '')]
+            while stack:
+                directory, prefix = stack.pop()
+                subdirs = []
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((entry.path, prefix + entry.name + '/'))
+                            continue
+                        _, dot, ext = entry.name.rpartition('.')
+                        if dot and ext.lower() in _STORED_EXTENSIONS:
+                            zipf.write(entry.path, prefix + entry.name, compress_type=zipfile.ZIP_STORED)
+                        else:
+                            zipf.write(entry.path, prefix + entry.name)
+                stack.extend(reversed(subdirs))
         
         logger.info(f"Moodle-Backup erstellt: {mbz_path}")
         return mbz_path
@@ -1,31 +1,41 @@
 """
 ILIAS-Komponenten-Parser.
+
+Die einzelnen Parser werden erst beim ersten Zugriff importiert (PEP 562),
+sodass nur die tatsächlich verwendeten Module geladen werden.
 """
 
+import importlib
+
 from .base import IliasComponentParser
-from .group import GroupParser
-from .test import TestParser
-from .media_cast import MediaCastParser
-from .file import FileParser
-from .item_group import ItemGroupParser
-from .forum import ForumParser
-from .wiki import WikiParser
-from .exercise import ExerciseParser
-from .course import CourseParser
-from .media_pool import MediaPoolParser
-from .learning_module import LearningModuleParser
-
-__all__ = [
-    'IliasComponentParser',
-    'GroupParser',
-    'TestParser',
-    'MediaCastParser',
-    'FileParser',
-    'ItemGroupParser',
-    'ForumParser',
-    'WikiParser',
-    'ExerciseParser',
-    'CourseParser',
-    'MediaPoolParser',
-    'LearningModuleParser'
-] 
\ No newline at end of file
+
+# Parser-Klasse -> Modul, aus dem sie beim ersten Zugriff geladen wird
+_LAZY = {
+    'GroupParser': '.group',
+    'TestParser': '.test',
+    'MediaCastParser': '.media_cast',
+    'FileParser': '.file',
+    'ItemGroupParser': '.item_group',
+    'ForumParser': '.forum',
+    'WikiParser': '.wiki',
+    'ExerciseParser': '.exercise',
+    'CourseParser': '.course',
+    'MediaPoolParser': '.media_pool',
+    'LearningModuleParser': '.learning_module'
+}
+
+__all__ = ['IliasComponentParser', *_LAZY]
+
+
+def __getattr__(name):
+    """Importiert eine Parser-Klasse beim ersten Zugriff."""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
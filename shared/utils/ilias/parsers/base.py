@@ -2,16 +2,449 @@
 Basisklassen für die ILIAS-Komponenten-Parser.
 """
 
+import io
 import os
-import xml.etree.ElementTree as ET
+import re
+import sys
+import copy
+import mimetypes
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:  # lxml ist optional, die Standardbibliothek reicht funktional aus
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Typ-Tabellen einmalig beim Import laden statt beim ersten Aufruf während des Parsens
+mimetypes.init()
+
+# Standard-Namespaces der ILIAS-Exporte
+NS_EXP = 'http://www.ilias.de/Services/Export/exp/4_1'
+NAMESPACES = {
+    'exp': NS_EXP,
+    'ds': 'http://www.ilias.de/Services/DataSet/ds/4_3'
+}
+# ExportItem in Clark-Notation, damit root.iter() ohne Präfix-Auflösung auskommt
+EXPORT_ITEM_TAG = f'{{{NS_EXP}}}ExportItem'
+# Präfix aller Tags im Export-Namespace (Clark-Notation)
+_EXP_PREFIX = f'{{{NS_EXP}}}'
+
+# Verzeichnisname einer Komponente, z.B. "1695736035__0__grp_6623" -> ("grp", "6623")
+_COMPONENT_NAME_RE = re.compile(r'^.*?__.*?__([^_]+)(?:_([^_]+))?')
+# Dateinamen, aus denen ein Komponententitel gelesen werden kann
+_DESCRIPTION_FILES = frozenset({"description.txt", "title.txt", "info.txt"})
+# Dateiendungen (ohne Punkt) für Medien- und Dokumentdateien
+MEDIA_EXTS = frozenset({"mp4", "mp3", "avi", "mov", "wmv", "flv"})
+_DOC_EXTS = frozenset({"pdf", "doc", "docx", "ppt", "pptx", "xls", "xlsx", "txt"})
+# Attributwerte bis zu dieser Länge werden interniert (Typen, Sprachen, Formate usw.
+# wiederholen sich in tausenden Datensätzen und teilen sich dann ein String-Objekt)
+_INTERN_MAX_LEN = 32
+# Ab dieser Dateigröße (in Bytes) werden XML-Dateien inkrementell geparst
+_STREAM_MIN_SIZE = 1024 * 1024
+# Parser-Optionen für lxml: Kommentare und Processing Instructions tauchen sonst als
+# Kindelemente ohne String-Tag auf
+_LXML_PARSER_OPTIONS = {
+    'remove_blank_text': True,
+    'remove_comments': True,
+    'remove_pis': True,
+    'collect_ids': False,
+    'huge_tree': True
+}
+
+# Obergrenze der Threads für das parallele Parsen vieler kleiner Dateien (I/O-gebunden)
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Höchstens so viele Dateien pro Thread sind gleichzeitig in Arbeit oder warten auf Abholung
+_PARSE_AHEAD = 2
+
+# lxml-Parser sind nicht für die gleichzeitige Nutzung aus mehreren Threads gedacht
+_parser_state = threading.local()
+# Schützt den prozessweiten Cache der Dateisystem-Durchläufe
+_fs_scan_lock = threading.Lock()
+# Schützt den prozessweiten Cache der Parse-Ergebnisse
+_result_cache_lock = threading.Lock()
+
+
+def _xml_parser():
+    """
+    Liefert den wiederverwendbaren lxml-Parser des aktuellen Threads.
+    
+    Returns:
+        lxml-XMLParser oder None, wenn die Standardbibliothek verwendet wird
+    """
+    if not LXML_AVAILABLE:
+        return None
+    parser = getattr(_parser_state, 'parser', None)
+    if parser is None:
+        parser = _parser_state.parser = ET.XMLParser(**_LXML_PARSER_OPTIONS)
+    return parser
+
+
+@lru_cache(maxsize=1024)
+def field_key(tag: str) -> str:
+    """
+    Liefert den Ergebnis-Schlüssel für einen Tag-Namen (kleingeschrieben und interniert).
+    
+    Gleiche Tags ergeben so über alle Datensätze hinweg dasselbe String-Objekt,
+    statt für jedes Element ein neues per lower() zu erzeugen.
+    
+    Args:
+        tag: Tag-Name
+        
+    Returns:
+        Kleingeschriebener, internierter Tag-Name
+    """
+    return sys.intern(tag.lower())
+
+
+@lru_cache(maxsize=4096)
+def local_name(tag: str) -> str:
+    """
+    Liefert den lokalen Namen eines Tags ohne Namespace ("{ns}Title" -> "Title").
+    
+    Exporte verwenden nur wenige verschiedene Tags, sodass die Zerlegung je Tag
+    einmal statt für jedes Element erfolgt.
+    
+    Args:
+        tag: Tag-Name, ggf. in Clark-Notation
+        
+    Returns:
+        Lokaler Tag-Name
+    """
+    return tag.rpartition('}')[2] if '}' in tag else tag
+
+
+@lru_cache(maxsize=256)
+def _guess_type_for_ext(ext: str) -> Optional[str]:
+    """MIME-Typ für eine Dateiendung (mit Punkt), gecacht."""
+    return mimetypes.guess_type('x' + ext)[0]
+
+
+def guess_mime_type(filename: str) -> Optional[str]:
+    """
+    Bestimmt den MIME-Typ eines Dateinamens wie mimetypes.guess_type, gecacht pro Endung.
+    
+    Args:
+        filename: Dateiname oder -pfad
+        
+    Returns:
+        MIME-Typ oder None, wenn er nicht bestimmt werden kann
+    """
+    ext = os.path.splitext(filename)[1]
+    # Bei Kompressionsendungen (.gz, .bz2, ...) hängt der Typ von der vorletzten Endung ab
+    if ext in mimetypes.encodings_map or ext.lower() in mimetypes.encodings_map:
+        return mimetypes.guess_type(filename)[0]
+    return _guess_type_for_ext(ext)
+
+
+def parse_xml_file(xml_path: str) -> ET.Element:
+    """
+    Parst eine XML-Datei vollständig mit dem C-Parser (lxml bzw. _elementtree).
+    
+    Args:
+        xml_path: Pfad zur XML-Datei
+        
+    Returns:
+        XML-Root-Element
+    """
+    return ET.parse(xml_path, _xml_parser()).getroot()
+
+
+def _iterparse(xml_path: str, events: Tuple[str, ...]):
+    """
+    Startet inkrementelles Parsen mit denselben Optionen wie beim vollständigen Parsen.
+    
+    Args:
+        xml_path: Pfad zur XML-Datei
+        events: Zu meldende Ereignisse
+        
+    Returns:
+        iterparse-Kontext
+    """
+    if LXML_AVAILABLE:
+        return ET.iterparse(xml_path, events=events, **_LXML_PARSER_OPTIONS)
+    return ET.iterparse(xml_path, events=events)
+
+
+# Byte-Order-Marks, mit denen eine XML-Datei beginnen darf
+_UTF8_BOM = b'\xef\xbb\xbf'
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+
+def looks_like_xml(source: Union[str, bytes]) -> bool:
+    """
+    Prüft anhand der ersten Bytes, ob eine Datei überhaupt XML sein kann.
+    
+    Dient als günstige Vorprüfung vor dem Parsen, damit z.B. versehentlich als
+    .xml abgelegte Binärdateien nicht erst am Parser scheitern.
+    
+    Args:
+        source: Pfad zur Datei oder bereits eingelesener Inhalt
+        
+    Returns:
+        True, wenn der Inhalt (nach BOM und Leerraum) mit '<' beginnt;
+        False auch dann, wenn die Datei nicht gelesen werden kann
+    """
+    if isinstance(source, bytes):
+        head = source[:64]
+    else:
+        try:
+            fd = os.open(source, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            head = os.read(fd, 64)
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+    if head.startswith(_UTF16_BOMS):
+        return True
+    if head.startswith(_UTF8_BOM):
+        head = head[len(_UTF8_BOM):]
+    return head.lstrip().startswith(b'<')
+
+
+def scan_xml_fields(xml_path: Union[str, bytes], fields: FrozenSet[str]) -> Dict[str, Optional[str]]:
+    """
+    Liest die Texte der ersten Vorkommen einzelner Elemente, ohne die Datei vollständig zu parsen.
+    
+    Das Einlesen endet, sobald alle gesuchten Elemente gefunden wurden; der Rest
+    der Datei wird weder gelesen noch als Baum aufgebaut.
+    
+    Args:
+        xml_path: Pfad zur XML-Datei oder bereits eingelesener Inhalt
+        fields: Gesuchte Tag-Namen
+        
+    Returns:
+        Dict von Tag-Name zu Text (None bei leerem Element); nicht gefundene Tags fehlen
+    """
+    found = {}
+    # Eigenes Datei-Handle, damit die Datei auch beim vorzeitigen Abbruch sofort geschlossen wird
+    with (io.BytesIO(xml_path) if isinstance(xml_path, bytes) else open(xml_path, 'rb')) as source:
+        for _, elem in _iterparse(source, ('end',)):
+            tag = elem.tag
+            if tag in fields and tag not in found:
+                found[tag] = elem.text
+                if len(found) == len(fields):
+                    break
+            elem.clear()
+    return found
+
+
+class _CompiledPath:
+    """
+    Einmalig vorbereiteter Pfadausdruck für wiederholte Suchen.
+    
+    Vereinigungen ("Date|Status|Grade") werden mit lxml in einem XPath-Aufruf
+    ausgewertet. ElementPath kennt kein "|"; ohne lxml werden die Teilpfade
+    nacheinander gesucht, die Treffer stehen dann nach Teilpfaden gruppiert
+    (innerhalb eines Teilpfads in Dokumentreihenfolge).
+    """
+    
+    __slots__ = ('path', 'namespaces', 'xpath', 'alternatives')
+    
+    def __init__(self, path: str, namespaces: Optional[Dict[str, str]]):
+        self.path = path
+        self.namespaces = dict(namespaces) if namespaces else None
+        self.alternatives = tuple(part.strip() for part in path.split('|')) if '|' in path else None
+        # Mit lxml wird findall über kompiliertes XPath ausgeführt (Clark-Notation ist kein XPath)
+        self.xpath = None
+        if LXML_AVAILABLE and '{' not in path:
+            self.xpath = ET.XPath(path, namespaces=self.namespaces)
+    
+    def find(self, element: ET.Element) -> Optional[ET.Element]:
+        """Liefert das erste passende Element oder None."""
+        if self.alternatives is not None:
+            matches = self.findall(element)
+            return matches[0] if matches else None
+        return element.find(self.path, self.namespaces)
+    
+    def findall(self, element: ET.Element) -> list:
+        """Liefert alle passenden Elemente."""
+        if self.xpath is not None:
+            return self.xpath(element)
+        if self.alternatives is not None:
+            matches = []
+            for alternative in self.alternatives:
+                matches.extend(element.findall(alternative, self.namespaces))
+            return matches
+        return element.findall(self.path, self.namespaces)
+
+
+def compile_path(path: str, namespaces: Optional[Dict[str, str]] = None) -> _CompiledPath:
+    """
+    Bereitet einen Pfadausdruck einmalig vor, z.B. als Modulkonstante eines Parsers.
+    
+    Args:
+        path: ElementPath-Ausdruck (mit lxml zusätzlich als XPath kompiliert)
+        namespaces: Optional zu verwendende Namespaces
+        
+    Returns:
+        Vorbereiteter Pfadausdruck mit find() und findall()
+    """
+    return _CompiledPath(path, namespaces)
+
+
+# Erstes Nachfahren-Element mit einem lokalen Namen (Namespace egal); der Name wird
+# als XPath-Variable übergeben, sodass ein kompilierter Ausdruck für alle Namen reicht
+_XP_DESCENDANT_BY_NAME = ET.XPath('(.//*[local-name()=$name])[1]') if LXML_AVAILABLE else None
+
+
+def find_descendant(root: ET.Element, name: str) -> Optional[ET.Element]:
+    """
+    Sucht das erste Nachfahren-Element mit dem angegebenen lokalen Namen.
+    
+    Args:
+        root: Element, unterhalb dessen gesucht wird
+        name: Lokaler Tag-Name (mit oder ohne Namespace im Dokument)
+        
+    Returns:
+        Gefundenes Element oder None
+    """
+    if _XP_DESCENDANT_BY_NAME is not None:
+        matches = _XP_DESCENDANT_BY_NAME(root, name=name)
+        return matches[0] if matches else None
+    return root.find(f'.//{{*}}{name}')
+
+
+def find_export_item(root: ET.Element) -> Optional[ET.Element]:
+    """
+    Sucht das ExportItem eines ILIAS-Exports.
+    
+    ILIAS-Exporte haben exp:Export (oder exp:ExportItem) als Wurzel; das ExportItem
+    ist dann die Wurzel selbst oder ein direktes Kind und wird ohne Suche über den
+    gesamten Baum gefunden. Andere Wurzeln (z.B. ein Wrapper um den Export) werden
+    wie bisher vollständig durchsucht, mit lxml und der Standardbibliothek gleich.
+    
+    Args:
+        root: XML-Root-Element
+        
+    Returns:
+        Erstes ExportItem-Element oder None
+    """
+    tag = root.tag
+    if tag == EXPORT_ITEM_TAG:
+        return root
+    if isinstance(tag, str) and tag.startswith(_EXP_PREFIX):
+        export_item = root.find(EXPORT_ITEM_TAG)
+        if export_item is not None:
+            return export_item
+    return next(root.iter(EXPORT_ITEM_TAG), None)
+
+
+def iter_files(path: str, missing_ok: bool = False) -> Iterator[Tuple[str, str, int]]:
+    """
+    Durchläuft ein Verzeichnis rekursiv mit os.scandir in der Reihenfolge von os.walk.
+    
+    Die Größe stammt aus DirEntry.stat(), ein zusätzliches os.path.getsize entfällt.
+    
+    Args:
+        path: Zu durchsuchendes Verzeichnis
+        missing_ok: Fehlt path (oder ist kein Verzeichnis), gibt es ohne Warnung keine
+            Dateien (erspart dem Aufrufer eine vorherige Existenzprüfung)
+        
+    Returns:
+        Iterator über (Dateiname, Dateipfad, Größe in Bytes)
+    """
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.name, entry.path, entry.stat().st_size
+        except (FileNotFoundError, NotADirectoryError) as e:
+            if not (missing_ok and current is path):
+                logger.warning(f"Fehler beim Durchsuchen von {current}: {str(e)}")
+            continue
+        except OSError as e:
+            logger.warning(f"Fehler beim Durchsuchen von {current}: {str(e)}")
+            continue
+        # Unterverzeichnisse in Auflistungsreihenfolge besuchen
+        stack.extend(reversed(subdirs))
+
+
+def _try_parse_xml_file(xml_path: str) -> Tuple[Optional[ET.Element], Optional[Exception]]:
+    """Parst eine XML-Datei und liefert (Root, None) bzw. bei Fehlern (None, Exception)."""
+    try:
+        return parse_xml_file(xml_path), None
+    except Exception as e:
+        return None, e
+
+
+def parse_xml_files(paths: List[str]) -> Iterator[Tuple[str, Tuple[Optional[ET.Element], Optional[Exception]]]]:
+    """
+    Parst viele unabhängige XML-Dateien parallel und liefert sie der Reihe nach.
+    
+    lxml gibt den GIL während des Parsens frei, sodass sich Lesen und Parsen auf
+    mehrere Kerne verteilen (jeder Thread nutzt seinen eigenen Parser). Es sind nur
+    wenige Dateien pro Thread gleichzeitig in Arbeit; jeder Baum wird geliefert,
+    sobald er an der Reihe ist, und kann danach freigegeben werden, sodass der
+    Speicherbedarf nicht mit der Größe des Exports wächst. Fehler werden nicht
+    geworfen, sondern je Datei zurückgegeben, damit der Aufrufer sie wie beim
+    seriellen Parsen an passender Stelle protokollieren kann.
+    
+    Args:
+        paths: Pfade der zu parsenden Dateien
+        
+    Yields:
+        (Pfad, (Root-Element, None)) bzw. (Pfad, (None, Exception)) in der Reihenfolge von paths
+    """
+    if len(paths) < 2:
+        for path in paths:
+            yield path, _try_parse_xml_file(path)
+        return
+    
+    workers = min(_READ_WORKERS, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for path in paths:
+            if len(pending) >= workers * _PARSE_AHEAD:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+            pending.append((path, executor.submit(_try_parse_xml_file, path)))
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+
 class IliasComponentParser:
     """Basisklasse für alle ILIAS-Komponenten-Parser."""
     
+    # Vorbereitete Pfadausdrücke, geteilt von allen Parser-Instanzen
+    _path_cache: Dict[Tuple[str, FrozenSet], _CompiledPath] = {}
+    
+    # Ergebnisse von Dateisystem-Durchläufen, geteilt von allen Parser-Instanzen
+    # ((Name, Komponenten-Pfad, Änderungszeit) -> Ergebnis, älteste zuerst)
+    _fs_scan_cache: "OrderedDict[Tuple[str, str, int], Any]" = OrderedDict()
+    _FS_SCAN_CACHE_SIZE = 128
+    
+    # Parse-Ergebnisse, geteilt von allen Parser-Instanzen (nur mit CACHE_RESULTS)
+    # ((Parser-Klasse, Komponenten-Pfad, XML-Pfad, Änderungszeit, Größe) -> Ergebnis)
+    _result_cache: "OrderedDict[Tuple[type, Optional[str], str, int, int], Dict[str, Any]]" = OrderedDict()
+    _RESULT_CACHE_SIZE = 64
+    
+    # Ergebnisse von parse() je XML-Datei zwischenspeichern (z.B. bei wiederholten
+    # Importen desselben Exports); eine unveränderte Datei wird dann nicht neu geparst
+    CACHE_RESULTS = False
+    
+    # Elemente, die beim inkrementellen Parsen sofort verarbeitet und verworfen werden
+    # (Tag -> erwarteter Tag des Elternelements oder None für beliebige Eltern)
+    STREAM_TAGS: Dict[str, Optional[str]] = {}
+    
     def __init__(self, component_path: str = None):
         """
         Initialisiert den Parser mit Standard-Namespaces und dem Pfad zur Komponente.
@@ -19,12 +452,11 @@ class IliasComponentParser:
         Args:
             component_path: Pfad zur Komponente
         """
-        self.namespaces = {
-            'exp': 'http://www.ilias.de/Services/Export/exp/4_1',
-            'ds': 'http://www.ilias.de/Services/DataSet/ds/4_3'
-        }
+        self.namespaces = dict(NAMESPACES)
         
         self.component_path = component_path
+        self._stream_records: Dict[str, List[Any]] = {}
+        self._basic_info_cache: Optional[Dict[str, Any]] = None
         if component_path and not os.path.exists(component_path):
             logger.warning(f"Der Komponenten-Pfad existiert nicht: {component_path}")
     
@@ -45,11 +477,7 @@ class IliasComponentParser:
                 return {}
             
             # Suche nach export.xml im Komponenten-Pfad
-            export_xml_path = None
-            for root, dirs, files in os.walk(self.component_path):
-                if "export.xml" in files:
-                    export_xml_path = os.path.join(root, "export.xml")
-                    break
+            export_xml_path = self._find_first("export.xml")
             
             if export_xml_path:
                 xml_path = export_xml_path
@@ -58,6 +486,7 @@ class IliasComponentParser:
                 # Suche nach XML-Dateien im Komponenten-Pfad
                 xml_files = []
                 for root, dirs, files in os.walk(self.component_path):
+                    dirs[:] = [d for d in dirs if not d.startswith('.')]
                     for file in files:
                         if file.endswith('.xml'):
                             xml_files.append(os.path.join(root, file))
@@ -79,22 +508,131 @@ class IliasComponentParser:
             return self._extract_basic_info()
         
         try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
+            stat = os.stat(xml_path)
+            cache_key = None
+            if self.CACHE_RESULTS:
+                cache_key = (type(self), self.component_path, xml_path, stat.st_mtime_ns, stat.st_size)
+                cached = self._cached_result(cache_key)
+                if cached is not None:
+                    return cached
+            
+            if self.STREAM_TAGS and stat.st_size >= _STREAM_MIN_SIZE:
+                root = self._parse_stream(xml_path)
+            else:
+                self._stream_records = {}
+                root = parse_xml_file(xml_path)
             data = self._parse_xml(root)
             
             # Wenn keine Titel gefunden wurde, versuche ihn aus dem Dateinamen zu extrahieren
             if "title" not in data or not data["title"]:
                 data.update(self._extract_basic_info())
             
+            if cache_key is not None:
+                self._store_result(cache_key, data)
             return data
         except ET.ParseError as e:
             logger.error(f"XML-Parsing-Fehler in {xml_path}: {e}")
             return self._extract_basic_info()
         except Exception as e:
-            logger.error(f"Fehler beim Parsen von {xml_path}: {e}")
+            # Programmierfehler der Unterklassen mit Traceback protokollieren
+            logger.exception(f"Fehler beim Parsen von {xml_path}: {e}")
             return self._extract_basic_info()
     
+    def _cached_result(self, key: Tuple[type, Optional[str], str, int, int]) -> Optional[Dict[str, Any]]:
+        """
+        Liefert ein zwischengespeichertes Parse-Ergebnis.
+        
+        Args:
+            key: Parser-Klasse, Komponenten-Pfad, XML-Pfad, Änderungszeit und Größe der Datei
+            
+        Returns:
+            Kopie des Ergebnisses, die der Aufrufer verändern darf, oder None
+        """
+        cache = IliasComponentParser._result_cache
+        with _result_cache_lock:
+            if key not in cache:
+                return None
+            cache.move_to_end(key)
+            return copy.deepcopy(cache[key])
+    
+    def _store_result(self, key: Tuple[type, Optional[str], str, int, int], data: Dict[str, Any]) -> None:
+        """
+        Speichert ein Parse-Ergebnis zwischen (die älteste Eintragung wird verdrängt).
+        
+        Args:
+            key: Parser-Klasse, Komponenten-Pfad, XML-Pfad, Änderungszeit und Größe der Datei
+            data: Ergebnis von parse(); gespeichert wird eine Kopie
+        """
+        data = copy.deepcopy(data)
+        cache = IliasComponentParser._result_cache
+        with _result_cache_lock:
+            cache[key] = data
+            if len(cache) > self._RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    def _parse_stream(self, xml_path: str) -> ET.Element:
+        """
+        Parst eine XML-Datei inkrementell.
+        
+        Elemente aus STREAM_TAGS (verglichen über den lokalen Namen) werden direkt nach dem Einlesen an
+        _handle_stream_element übergeben und anschließend geleert, sodass
+        große Listen nicht vollständig im Speicher gehalten werden. Die
+        Ergebnisse stehen in _parse_xml über self._stream_records bereit.
+        
+        Args:
+            xml_path: Pfad zur XML-Datei
+            
+        Returns:
+            XML-Root-Element (ohne die Inhalte der verarbeiteten Elemente)
+        """
+        self._stream_records = {}
+        context = _iterparse(xml_path, ('start', 'end'))
+        for tag, elem in self._iter_stream_elements(context):
+            record = self._handle_stream_element(tag, elem)
+            if record is not None:
+                self._stream_records.setdefault(tag, []).append(record)
+        return context.root
+    
+    def _iter_stream_elements(self, context) -> Iterator[Tuple[str, ET.Element]]:
+        """
+        Liefert die vollständig eingelesenen Elemente aus STREAM_TAGS eines iterparse-Kontexts.
+        
+        Jedes Element wird geleert, sobald der Aufrufer das nächste anfordert.
+        
+        Args:
+            context: iterparse-Kontext mit den Ereignissen 'start' und 'end'
+            
+        Returns:
+            Iterator über (lokaler Name, Element)
+        """
+        stream_tags = self.STREAM_TAGS
+        open_tags = []
+        for event, elem in context:
+            # Vergleich über lokale Namen, damit Default-Namespaces das Streaming nicht verhindern
+            tag = local_name(elem.tag)
+            if event == 'start':
+                open_tags.append(tag)
+                continue
+            open_tags.pop()
+            if tag in stream_tags:
+                parent_tag = stream_tags[tag]
+                if parent_tag is None or (open_tags and open_tags[-1] == parent_tag):
+                    yield tag, elem
+                    elem.clear()
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Any:
+        """
+        Verarbeitet ein Element aus STREAM_TAGS beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Vollständig eingelesenes XML-Element
+            
+        Returns:
+            Extrahierter Datensatz oder None
+        """
+        raise NotImplementedError("Diese Methode muss von Parsern mit STREAM_TAGS implementiert werden.")
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst ein XML-Element. Muss von abgeleiteten Klassen implementiert werden.
@@ -107,6 +645,18 @@ class IliasComponentParser:
         """
         raise NotImplementedError("Diese Methode muss von abgeleiteten Klassen implementiert werden.")
     
+    def _strip_namespaces(self, root: ET.Element) -> None:
+        """
+        Entfernt die Namespaces aller Tags im Baum, sodass lokale Namen direkt verglichen werden können.
+        
+        Args:
+            root: XML-Root-Element (wird verändert)
+        """
+        for elem in root.iter():
+            tag = elem.tag
+            if '}' in tag:
+                elem.tag = tag.rpartition('}')[2]
+    
     def _get_text(self, element: Optional[ET.Element], default: str = "") -> str:
         """
         Extrahiert den Text aus einem XML-Element.
@@ -118,7 +668,22 @@ class IliasComponentParser:
         Returns:
             Extrahierter Text oder Standardwert
         """
-        return element.text if element is not None and element.text else default
+        return default if element is None else (element.text or default)
+    
+    def _text_of(self, parent: ET.Element, tag: str, default: str = "") -> str:
+        """
+        Extrahiert den Text des ersten Kind-Elements mit dem angegebenen Tag.
+        
+        Args:
+            parent: Eltern-Element
+            tag: Tag (bzw. Pfad) des Kind-Elements
+            default: Standardwert, falls das Element fehlt oder keinen Text hat
+            
+        Returns:
+            Extrahierter Text oder Standardwert
+        """
+        child = parent.find(tag)
+        return default if child is None else (child.text or default)
     
     def _get_attribute(self, element: ET.Element, attr: str, default: str = "") -> str:
         """
@@ -130,9 +695,125 @@ class IliasComponentParser:
             default: Standardwert, falls das Attribut nicht gefunden wird
             
         Returns:
-            Attributwert oder Standardwert
+            Attributwert oder Standardwert (kurze Werte interniert)
+        """
+        value = element.get(attr, default)
+        if type(value) is str and len(value) <= _INTERN_MAX_LEN:
+            return sys.intern(value)
+        return value
+    
+    def _selector(self, path: str, namespaces: Optional[Dict[str, str]] = None) -> _CompiledPath:
+        """
+        Liefert den vorbereiteten Selektor für einen Pfadausdruck aus dem Cache.
+        
+        Args:
+            path: XPath zum Element
+            namespaces: Optional zu verwendende Namespaces
+            
+        Returns:
+            Vorbereiteter Pfadausdruck
         """
-        return element.get(attr, default)
+        ns = namespaces if namespaces is not None else self.namespaces
+        key = (path, frozenset(ns.items()))
+        selector = self._path_cache.get(key)
+        if selector is None:
+            selector = IliasComponentParser._path_cache[key] = compile_path(path, ns)
+        return selector
+    
+    def _child_dict(self, elem: ET.Element) -> Dict[str, str]:
+        """
+        Liest alle direkten Kinder (z.B. von Settings oder Details) als Schlüssel-Wert-Paare.
+        
+        Die Schlüssel sind die kleingeschriebenen, internierten Tag-Namen, sodass
+        gleiche Einstellungen über alle Datensätze hinweg dieselben String-Objekte teilen.
+        Unbekannte Tags bleiben erhalten; das letzte Vorkommen gewinnt.
+        
+        Args:
+            elem: Eltern-Element
+            
+        Returns:
+            Dict von Schlüssel zu Text
+        """
+        return {field_key(child.tag): child.text or '' for child in elem}
+    
+    def _field_texts(self, elem: ET.Element, fields: FrozenSet[str]) -> Dict[str, str]:
+        """
+        Liest die Texte ausgewählter direkter Kinder in einem Durchlauf.
+        
+        Ersetzt eine Folge von elem.find(field)-Aufrufen, die jeweils erneut
+        über alle Kinder laufen.
+        
+        Args:
+            elem: Eltern-Element
+            fields: Gesuchte Tag-Namen
+            
+        Returns:
+            Dict von kleingeschriebenem Tag-Namen zu Text (erstes Vorkommen gewinnt)
+        """
+        texts = {}
+        for child in elem:
+            tag = child.tag
+            if tag in fields:
+                texts.setdefault(field_key(tag), child.text or '')
+        return texts
+    
+    def _keyed_texts(self, elem: ET.Element, field_keys: Dict[str, str]) -> Dict[str, str]:
+        """
+        Liest die Texte ausgewählter direkter Kinder in einem Durchlauf unter festen Schlüsseln.
+        
+        Anders als _field_texts enthält das Ergebnis jeden Schlüssel aus field_keys
+        (in dessen Reihenfolge); fehlende Kinder ergeben wie _get_text(None) ''.
+        
+        Args:
+            elem: Eltern-Element
+            field_keys: Dict von Tag-Name zu Ergebnis-Schlüssel
+            
+        Returns:
+            Dict von Ergebnis-Schlüssel zu Text (erstes Vorkommen gewinnt)
+        """
+        found = {}
+        for child in elem:
+            key = field_keys.get(child.tag)
+            if key is not None:
+                found.setdefault(key, child.text or '')
+        return {key: found.get(key, '') for key in field_keys.values()}
+    
+    def _index_children(self, elem: ET.Element, tags: FrozenSet[str]) -> Dict[str, ET.Element]:
+        """
+        Ordnet ausgewählte direkte Kinder in einem Durchlauf ihrem Tag-Namen zu.
+        
+        Ersetzt mehrere elem.find(tag)-Aufrufe auf demselben Element, wenn neben
+        dem Text auch Attribute oder Unterelemente der Kinder benötigt werden.
+        
+        Args:
+            elem: Eltern-Element
+            tags: Gesuchte Tag-Namen
+            
+        Returns:
+            Dict von Tag-Name zu Kind-Element (erstes Vorkommen gewinnt, wie bei find)
+        """
+        children = {}
+        for child in elem:
+            tag = child.tag
+            if tag in tags and tag not in children:
+                children[tag] = child
+        return children
+    
+    def _selected_texts(self, elem: ET.Element, selector: _CompiledPath) -> Dict[str, str]:
+        """
+        Liest die Texte der von einer Pfad-Vereinigung gefundenen Elemente.
+        
+        Args:
+            elem: Eltern-Element
+            selector: Vorbereiteter Pfad aus compile_path() (z.B. 'Date|Status|Grade')
+            
+        Returns:
+            Dict von kleingeschriebenem Tag-Namen zu Text (erstes Vorkommen gewinnt)
+        """
+        texts = {}
+        for field_elem in selector.findall(elem):
+            texts.setdefault(field_key(field_elem.tag), field_elem.text or '')
+        return texts
     
     def _find_element(self, root: ET.Element, path: str, namespaces: Optional[Dict[str, str]] = None) -> Optional[ET.Element]:
         """
@@ -146,9 +827,8 @@ class IliasComponentParser:
         Returns:
             Gefundenes Element oder None
         """
-        ns = namespaces if namespaces is not None else self.namespaces
         try:
-            return root.find(path, ns)
+            return self._selector(path, namespaces).find(root)
         except Exception as e:
             logger.error(f"Fehler beim Suchen von {path}: {e}")
             return None
@@ -165,17 +845,145 @@ class IliasComponentParser:
         Returns:
             Liste der gefundenen Elemente
         """
-        ns = namespaces if namespaces is not None else self.namespaces
         try:
-            return root.findall(path, ns)
+            return self._selector(path, namespaces).findall(root)
         except Exception as e:
             logger.error(f"Fehler beim Suchen von {path}: {e}")
             return []
     
+    def _find_first(self, filename: str) -> Optional[str]:
+        """
+        Sucht die erste Datei mit dem angegebenen Namen im Komponenten-Pfad.
+        
+        Durchsucht wird in der Reihenfolge von os.walk (wie _scan_component), sodass
+        parse() und _extract_basic_info dieselbe Datei wählen. Die Suche bricht beim
+        ersten Treffer ab, sodass der restliche Baum nicht gelesen wird.
+        
+        Args:
+            filename: Gesuchter Dateiname
+            
+        Returns:
+            Pfad zur gefundenen Datei oder None
+        """
+        stack = [self.component_path]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.name == filename and entry.is_file():
+                            return entry.path
+                        # Versteckte Verzeichnisse (.git, .svn, ...) enthalten keine ILIAS-Daten
+                        if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                            subdirs.append(entry.path)
+            except OSError as e:
+                logger.warning(f"Fehler beim Durchsuchen von {current}: {str(e)}")
+                continue
+            # Unterverzeichnisse in Auflistungsreihenfolge besuchen
+            stack.extend(reversed(subdirs))
+        return None
+    
+    def _scan_component(self) -> Dict[str, list]:
+        """
+        Durchläuft den Komponenten-Pfad einmal und sortiert die Dateien nach Kategorien.
+        
+        Returns:
+            Dict mit den Listen 'description' und 'export' (Dateipfade) sowie 'media'
+            und 'document' (os.DirEntry, damit Name und Größe ohne weitere
+            Pfadoperationen verfügbar sind), jeweils in der Reihenfolge von os.walk
+        """
+        result = {"description": [], "export": [], "media": [], "document": []}
+        stack = [self.component_path]
+        while stack:
+            current = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Versteckte Verzeichnisse (.git, .svn, ...) enthalten keine ILIAS-Daten
+                            if not entry.name.startswith('.'):
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                        name = entry.name
+                        lower_name = name.lower()
+                        if lower_name in _DESCRIPTION_FILES:
+                            result["description"].append(entry.path)
+                        if name == "export.xml":
+                            result["export"].append(entry.path)
+                        # Ignoriere XML-Dateien und versteckte Dateien
+                        if name.endswith('.xml') or name.startswith('.'):
+                            continue
+                        _, dot, ext = lower_name.rpartition('.')
+                        if not dot:
+                            continue
+                        if ext in MEDIA_EXTS:
+                            result["media"].append(entry)
+                        elif ext in _DOC_EXTS:
+                            result["document"].append(entry)
+            except OSError as e:
+                logger.warning(f"Fehler beim Durchsuchen von {current}: {str(e)}")
+                continue
+            # Unterverzeichnisse in Auflistungsreihenfolge besuchen
+            stack.extend(reversed(subdirs))
+        return result
+    
+    def _cached_fs_scan(self, name: str, scan: Callable[[], Any]) -> Any:
+        """
+        Führt einen Dateisystem-Durchlauf des Komponenten-Pfads höchstens einmal aus.
+        
+        Der Cache ist an die Änderungszeit des Komponenten-Verzeichnisses gebunden;
+        wird dort ein Eintrag angelegt oder entfernt, wird neu durchsucht. Änderungen
+        nur in tieferen Unterverzeichnissen erkennt der Schlüssel nicht.
+        
+        Args:
+            name: Name des Durchlaufs (unterscheidet mehrere Durchläufe je Pfad)
+            scan: Führt den eigentlichen Durchlauf aus
+            
+        Returns:
+            Kopie des (ggf. gecachten) Ergebnisses, die der Aufrufer verändern darf
+        """
+        try:
+            mtime = os.stat(self.component_path).st_mtime_ns
+        except OSError:
+            return scan()
+        
+        cache = IliasComponentParser._fs_scan_cache
+        key = (name, self.component_path, mtime)
+        with _fs_scan_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return copy.deepcopy(cache[key])
+        
+        result = scan()
+        with _fs_scan_lock:
+            cache[key] = result
+            if len(cache) > self._FS_SCAN_CACHE_SIZE:
+                cache.popitem(last=False)
+        return copy.deepcopy(result)
+    
     def _extract_basic_info(self) -> Dict[str, Any]:
         """
         Extrahiert grundlegende Informationen aus dem Komponenten-Pfad.
         
+        Das Ergebnis wird pro Instanz zwischengespeichert, da der Komponenten-Pfad
+        sich nicht ändert; zurückgegeben wird jeweils eine tiefe Kopie, da die
+        Listen (z.B. media_items) in die Parser-Ergebnisse übernommen werden.
+        
+        Returns:
+            Dict mit grundlegenden Informationen
+        """
+        if self._basic_info_cache is None:
+            self._basic_info_cache = self._collect_basic_info()
+        return copy.deepcopy(self._basic_info_cache)
+    
+    def _collect_basic_info(self) -> Dict[str, Any]:
+        """
+        Sammelt die grundlegenden Informationen aus dem Komponenten-Pfad.
+        
         Returns:
             Dict mit grundlegenden Informationen
         """
@@ -189,85 +997,68 @@ class IliasComponentParser:
         component_type = "unknown"
         
         # Versuche, den Titel aus dem Verzeichnisnamen zu extrahieren
-        if "__" in component_name:
-            parts = component_name.split("__")
-            if len(parts) >= 3:
-                type_id_parts = parts[2].split("_")
-                if len(type_id_parts) > 0:
-                    component_type = type_id_parts[0]  # z.B. "grp" aus "grp_6623"
-                if len(type_id_parts) > 1:
-                    component_id = type_id_parts[1]
-                    
-                    # Suche nach einer Beschreibungsdatei im Komponenten-Pfad
-                    for root, dirs, files in os.walk(self.component_path):
-                        for file in files:
-                            if file.lower() in ["description.txt", "title.txt", "info.txt"]:
-                                try:
-                                    with open(os.path.join(root, file), "r", encoding="utf-8") as f:
-                                        component_title = f.read().strip()
-                                        logger.info(f"Titel aus {file} extrahiert: {component_title}")
-                                        break
-                                except Exception as e:
-                                    logger.warning(f"Fehler beim Lesen von {file}: {str(e)}")
+        has_id = False
+        match = _COMPONENT_NAME_RE.match(component_name)
+        if match:
+            component_type = match.group(1)  # z.B. "grp" aus "grp_6623"
+            if match.group(2):
+                component_id = match.group(2)
+                has_id = True
+        
+        # Ein einziger Durchlauf über den Komponenten-Pfad
+        scan = self._scan_component()
+        
+        # Suche nach einer Beschreibungsdatei im Komponenten-Pfad
+        if has_id:
+            for path in scan["description"]:
+                file = os.path.basename(path)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        component_title = f.read().strip()
+                    logger.info(f"Titel aus {file} extrahiert: {component_title}")
+                    break
+                except Exception as e:
+                    logger.warning(f"Fehler beim Lesen von {file}: {str(e)}")
         
         # Suche nach dem Titel in Unterverzeichnissen
-        if component_title == "Unbekannt" and self.component_path:
-            for root, dirs, files in os.walk(self.component_path):
-                for file in files:
-                    if file == "export.xml":
-                        try:
-                            tree = ET.parse(os.path.join(root, file))
-                            xml_root = tree.getroot()
-                            
-                            # Suche nach dem Titel in verschiedenen Formaten
-                            title_elem = xml_root.find(".//Title")
-                            if title_elem is not None and title_elem.text:
-                                component_title = title_elem.text
-                                logger.info(f"Titel aus export.xml extrahiert: {component_title}")
-                                break
-                            else:
-                                # Alternative Suche nach dem Titel
-                                for elem in xml_root.iter():
-                                    if elem.tag.endswith("Title") and elem.text:
-                                        component_title = elem.text
-                                        logger.info(f"Titel aus alternativer Quelle extrahiert: {component_title}")
-                                        break
-                        except Exception as e:
-                            logger.warning(f"Fehler beim Extrahieren des Titels aus export.xml: {str(e)}")
+        if component_title == "Unbekannt":
+            for path in scan["export"]:
+                try:
+                    xml_root = parse_xml_file(path)
+                    
+                    # Suche nach dem Titel ohne Namespace (schneller C-Pfad von iter)
+                    title_elem = next((e for e in xml_root.iter("Title") if e.text), None)
+                    if title_elem is not None:
+                        component_title = title_elem.text
+                        logger.info(f"Titel aus export.xml extrahiert: {component_title}")
+                        break
+                    
+                    # Alternative Suche nach dem Titel in beliebigem Namespace
+                    title_elem = next((e for e in xml_root.iterfind(".//{*}Title") if e.text), None)
+                    if title_elem is not None:
+                        component_title = title_elem.text
+                        logger.info(f"Titel aus alternativer Quelle extrahiert: {component_title}")
+                        break
+                except Exception as e:
+                    logger.warning(f"Fehler beim Extrahieren des Titels aus export.xml: {str(e)}")
         
         # Wenn immer noch kein Titel gefunden wurde, suche nach relevanten Dateien
-        if component_title == "Unbekannt" and self.component_path:
-            # Suche nach Mediendateien oder anderen relevanten Dateien
-            media_files = []
-            document_files = []
-            
-            for root, dirs, files in os.walk(self.component_path):
-                for file in files:
-                    # Ignoriere XML-Dateien und versteckte Dateien
-                    if file.endswith('.xml') or file.startswith('.'):
-                        continue
-                    
-                    # Mediendateien
-                    if file.lower().endswith(('.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv')):
-                        media_files.append(os.path.join(root, file))
-                    # Dokumente
-                    elif file.lower().endswith(('.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt')):
-                        document_files.append(os.path.join(root, file))
+        if component_title == "Unbekannt":
+            media_files = scan["media"]
+            document_files = scan["document"]
             
             # Verwende den Dateinamen als Titel
             if media_files:
-                component_title = os.path.basename(media_files[0])
+                component_title = media_files[0].name
                 logger.info(f"Titel aus Mediendatei extrahiert: {component_title}")
                 
                 # Füge Mediendateien zu den Daten hinzu
                 media_items = []
-                for media_path in media_files:
-                    filename = os.path.basename(media_path)
-                    import mimetypes
-                    mime_type, encoding = mimetypes.guess_type(media_path)
+                for media_entry in media_files:
+                    mime_type = guess_mime_type(media_entry.name)
                     
                     media_items.append({
-                        "location": filename,
+                        "location": media_entry.name,
                         "format": mime_type or "Unbekannt",
                         "location_type": "file"
                     })
@@ -280,14 +1071,13 @@ class IliasComponentParser:
                 }
             
             elif document_files:
-                component_title = os.path.basename(document_files[0])
+                document_entry = document_files[0]
+                component_title = document_entry.name
                 logger.info(f"Titel aus Dokumentdatei extrahiert: {component_title}")
                 
-                # Füge Dokumentinformationen zu den Daten hinzu
-                file_path = document_files[0]
-                file_size = os.path.getsize(file_path)
-                import mimetypes
-                mime_type, encoding = mimetypes.guess_type(file_path)
+                # Füge Dokumentinformationen zu den Daten hinzu (Größe aus dem DirEntry-Cache)
+                file_size = document_entry.stat().st_size
+                mime_type = guess_mime_type(component_title)
                 
                 return {
                     "id": component_id,
@@ -2,17 +2,36 @@
 Parser für ILIAS-Kurs-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any
 import logging
-import os
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET
 
 logger = logging.getLogger(__name__)
 
+# Basis-Informationen eines Kurses (direkte Kinder von Course)
+_BASE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate'})
+# Kurs-spezifische Einstellungen (direkte Kinder von Settings)
+_SETTINGS_FIELDS = frozenset({'Syllabus', 'ImportantInformation', 'ContactName',
+                              'ContactResponsibility', 'ContactPhone', 'ContactEmail',
+                              'ContactConsultation'})
+
+# Tag- und Attributnamen der Item-/Member-Schleifen
+_TAG_ITEMS = 'Items'
+_TAG_ITEM = 'Item'
+_TAG_MEMBERS = 'Members'
+_TAG_MEMBER = 'Member'
+_ATTR_REF_ID = 'ref_id'
+_ATTR_TYPE = 'type'
+_ATTR_ID = 'id'
+_ATTR_LOGIN = 'login'
+_ATTR_ROLE = 'role'
+
 class CourseParser(IliasComponentParser):
     """Parser für ILIAS-Kurse."""
     
+    # Container-Items und Mitglieder sind die unbegrenzt großen Teile eines Kurs-Exports
+    STREAM_TAGS = {_TAG_ITEM: _TAG_ITEMS, _TAG_MEMBER: _TAG_MEMBERS}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten eines ILIAS-Kurses.
@@ -26,8 +45,11 @@ class CourseParser(IliasComponentParser):
         course_data = {}
         
         try:
+            # Namespaces einmalig entfernen; der Kurs-Parser unterscheidet keine Namespaces
+            self._strip_namespaces(root)
+            
             # Suche nach ExportItem/Course
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = root if root.tag == 'ExportItem' else root.find('.//ExportItem')
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
@@ -41,86 +63,22 @@ class CourseParser(IliasComponentParser):
                     logger.warning("Kein Course-Element gefunden")
                     return self._extract_basic_info()
             
-            # Basis-Informationen
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate']:
-                elem = course_elem.find(field)
-                if elem is not None:
-                    course_data[field.lower()] = self._get_text(elem)
-            
-            # Kurs-spezifische Einstellungen
-            settings_elem = course_elem.find('Settings')
-            if settings_elem is not None:
-                settings = {}
-                for field in ['Syllabus', 'ImportantInformation', 'ContactName', 
-                            'ContactResponsibility', 'ContactPhone', 'ContactEmail', 
-                            'ContactConsultation']:
-                    elem = settings_elem.find(field)
-                    if elem is not None:
-                        settings[field.lower()] = self._get_text(elem)
-                
-                if settings:
-                    course_data['settings'] = settings
-            
-            # Aktivierung und Zeiteinstellungen
-            activation_elem = course_elem.find('Activation')
-            if activation_elem is not None:
-                activation = {
-                    'type': self._get_attribute(activation_elem, 'type', 'unlimited'),
-                    'start': self._get_text(activation_elem.find('Start') if activation_elem.find('Start') is not None else None),
-                    'end': self._get_text(activation_elem.find('End') if activation_elem.find('End') is not None else None)
-                }
-                course_data['activation'] = activation
-            
-            # Container-Einstellungen
-            container_elem = course_elem.find('Container')
-            if container_elem is not None:
-                container_settings = {
-                    'view': self._get_attribute(container_elem, 'view', 'by_type'),
-                    'sorting': self._get_attribute(container_elem, 'sorting', 'title')
-                }
-                
-                # Items im Container
-                items = []
-                items_elem = container_elem.find('Items')
-                if items_elem is not None:
-                    for item_elem in items_elem.findall('Item'):
-                        item_data = {
-                            'ref_id': self._get_attribute(item_elem, 'ref_id', ''),
-                            'type': self._get_attribute(item_elem, 'type', ''),
-                            'title': self._get_text(item_elem)
-                        }
-                        items.append(item_data)
-                
-                if items:
-                    container_settings['items'] = items
-                
-                course_data['container_settings'] = container_settings
-            
-            # Registrierungseinstellungen
-            registration_elem = course_elem.find('Registration')
-            if registration_elem is not None:
-                registration = {
-                    'type': self._get_attribute(registration_elem, 'type', 'direct'),
-                    'waiting_list': self._get_attribute(registration_elem, 'waiting_list', '0') == '1',
-                    'max_members': self._get_attribute(registration_elem, 'max_members', '0'),
-                    'min_members': self._get_attribute(registration_elem, 'min_members', '0')
-                }
-                course_data['registration'] = registration
-            
-            # Mitglieder
-            members = []
-            members_elem = course_elem.find('Members')
-            if members_elem is not None:
-                for member_elem in members_elem.findall('Member'):
-                    member_data = {
-                        'id': self._get_attribute(member_elem, 'id', ''),
-                        'login': self._get_attribute(member_elem, 'login', ''),
-                        'role': self._get_attribute(member_elem, 'role', 'member')
-                    }
-                    members.append(member_data)
-            
-            if members:
-                course_data['members'] = members
+            # Ein Durchlauf über die Kinder des Course-Elements; das erste Vorkommen gewinnt
+            handlers = {
+                'Settings': self._parse_settings,
+                'Activation': self._parse_activation,
+                'Container': self._parse_container,
+                'Registration': self._parse_registration,
+                _TAG_MEMBERS: self._parse_members
+            }
+            handled = set()
+            for child in course_elem:
+                tag = child.tag
+                if tag in _BASE_FIELDS:
+                    course_data.setdefault(tag.lower(), child.text or '')
+                elif tag in handlers and tag not in handled:
+                    handled.add(tag)
+                    handlers[tag](child, course_data)
             
             # Wenn keine Titel gefunden wurde, nutze Basis-Info
             if 'title' not in course_data or not course_data['title']:
@@ -132,4 +90,144 @@ class CourseParser(IliasComponentParser):
         except Exception as e:
             logger.error(f"Fehler beim Parsen der Kurs-XML: {str(e)}")
             return self._extract_basic_info()
-
+    
+    def _parse_settings(self, settings_elem: ET.Element, course_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die kurs-spezifischen Einstellungen.
+        
+        Args:
+            settings_elem: Settings-Element
+            course_data: Zu ergänzende Kursdaten
+        """
+        settings = {}
+        for elem in settings_elem:
+            if elem.tag in _SETTINGS_FIELDS:
+                settings.setdefault(elem.tag.lower(), self._get_text(elem))
+        
+        if settings:
+            course_data['settings'] = settings
+    
+    def _parse_activation(self, activation_elem: ET.Element, course_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Aktivierungs- und Zeiteinstellungen.
+        
+        Args:
+            activation_elem: Activation-Element
+            course_data: Zu ergänzende Kursdaten
+        """
+        start_elem = activation_elem.find('Start')
+        end_elem = activation_elem.find('End')
+        course_data['activation'] = {
+            'type': self._get_attribute(activation_elem, 'type', 'unlimited'),
+            'start': self._get_text(start_elem),
+            'end': self._get_text(end_elem)
+        }
+    
+    def _parse_container(self, container_elem: ET.Element, course_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Container-Einstellungen samt enthaltener Items.
+        
+        Args:
+            container_elem: Container-Element
+            course_data: Zu ergänzende Kursdaten
+        """
+        container_settings = {
+            'view': self._get_attribute(container_elem, 'view', 'by_type'),
+            'sorting': self._get_attribute(container_elem, 'sorting', 'title')
+        }
+        
+        # Items im Container (beim inkrementellen Parsen bereits extrahiert)
+        items = self._stream_records.get(_TAG_ITEM)
+        if items is None:
+            items = []
+            items_elem = container_elem.find(_TAG_ITEMS)
+            if items_elem is not None:
+                for item_elem in items_elem.iterfind(_TAG_ITEM):
+                    items.append(self._parse_item(item_elem))
+                    item_elem.clear()
+        
+        if items:
+            container_settings['items'] = items
+        
+        course_data['container_settings'] = container_settings
+    
+    def _parse_registration(self, registration_elem: ET.Element, course_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Registrierungseinstellungen.
+        
+        Args:
+            registration_elem: Registration-Element
+            course_data: Zu ergänzende Kursdaten
+        """
+        course_data['registration'] = {
+            'type': self._get_attribute(registration_elem, 'type', 'direct'),
+            'waiting_list': self._get_attribute(registration_elem, 'waiting_list', '0') == '1',
+            'max_members': self._get_attribute(registration_elem, 'max_members', '0'),
+            'min_members': self._get_attribute(registration_elem, 'min_members', '0')
+        }
+    
+    def _parse_members(self, members_elem: ET.Element, course_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Kursmitglieder.
+        
+        Args:
+            members_elem: Members-Element
+            course_data: Zu ergänzende Kursdaten
+        """
+        # Beim inkrementellen Parsen bereits extrahiert
+        members = self._stream_records.get(_TAG_MEMBER)
+        if members is None:
+            members = []
+            for member_elem in members_elem.iterfind(_TAG_MEMBER):
+                members.append(self._parse_member(member_elem))
+                member_elem.clear()
+        
+        if members:
+            course_data['members'] = members
+    
+    def _parse_item(self, item_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert ein Item aus dem Container.
+        
+        Args:
+            item_elem: Item-Element
+            
+        Returns:
+            Dict mit den Item-Daten
+        """
+        return {
+            _ATTR_REF_ID: self._get_attribute(item_elem, _ATTR_REF_ID, ''),
+            _ATTR_TYPE: self._get_attribute(item_elem, _ATTR_TYPE, ''),
+            'title': item_elem.text or ''
+        }
+    
+    def _parse_member(self, member_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert ein Kursmitglied.
+        
+        Args:
+            member_elem: Member-Element
+            
+        Returns:
+            Dict mit den Mitgliedsdaten
+        """
+        return {
+            _ATTR_ID: self._get_attribute(member_elem, _ATTR_ID, ''),
+            _ATTR_LOGIN: self._get_attribute(member_elem, _ATTR_LOGIN, ''),
+            _ATTR_ROLE: self._get_attribute(member_elem, _ATTR_ROLE, 'member')
+        }
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert Items und Mitglieder beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Item- oder Member-Element
+            
+        Returns:
+            Dict mit den extrahierten Daten
+        """
+        if tag == _TAG_ITEM:
+            return self._parse_item(elem)
+        return self._parse_member(elem)
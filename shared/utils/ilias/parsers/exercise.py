@@ -3,17 +3,57 @@ Parser für ILIAS-Übungs-Komponenten.
 """
 
 from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
 import logging
 import os
-import glob
-from .base import IliasComponentParser
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from .base import IliasComponentParser, ET, compile_path, field_key, find_export_item, iter_files, scan_xml_fields
+from .records import AssignmentRecord, FileRecord, SubmissionRecord
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_EXERCISE = compile_path('.//Exercise')
+_XP_ASSIGN = compile_path('Assignments/Assignment')
+_XP_FILES = compile_path('Files/File')
+_XP_SUBMISSIONS = compile_path('Submissions/Submission')
+
+# Textfelder der Übung, gelesen in einem Durchlauf über die direkten Kinder
+_EXERCISE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate', 'Instructions'})
+# Textfelder von Aufgaben, Einreichungen und Dateien, jeweils mit einer Pfad-Vereinigung gelesen
+_XP_ASSIGNMENT_FIELDS = compile_path('Title|Description|Type|StartDate|EndDate|SubmissionDate')
+_XP_SUBMISSION_FIELDS = compile_path('Date|Status|Feedback|Grade')
+_XP_FILE_FIELDS = compile_path('Name|Size|Type|Path')
+# Gesuchte Elemente in den XML-Dateien der Aufgabenverzeichnisse
+_PROBE_DATES = ('StartDate', 'EndDate', 'SubmissionDate')
+_PROBE_FIELDS = frozenset({'Title', 'Description', *_PROBE_DATES})
+
+# Internierte Schlüssel der Aufgaben-, Einreichungs- und Dateidatensätze
+_K_ID = sys.intern('id')
+_K_TITLE = sys.intern('title')
+_K_DESCRIPTION = sys.intern('description')
+_K_TYPE = sys.intern('type')
+_K_USER_ID = sys.intern('user_id')
+_K_DATE = sys.intern('date')
+_K_STATUS = sys.intern('status')
+_K_FEEDBACK = sys.intern('feedback')
+_K_GRADE = sys.intern('grade')
+_K_STARTDATE = sys.intern('startdate')
+_K_ENDDATE = sys.intern('enddate')
+_K_SUBMISSIONDATE = sys.intern('submissiondate')
+_K_NAME = sys.intern('name')
+_K_SIZE = sys.intern('size')
+_K_PATH = sys.intern('path')
+
+# Obergrenze der Threads für Dateisystem-Durchläufe (I/O-gebunden, gibt den GIL frei)
+_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 class ExerciseParser(IliasComponentParser):
     """Parser für ILIAS-Übungen."""
     
+    # Aufgaben mit ihren Einreichungen sind der unbegrenzt große Teil eines Übungs-Exports
+    STREAM_TAGS = {'Assignment': 'Assignments'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten einer ILIAS-Übung.
@@ -26,140 +66,168 @@ class ExerciseParser(IliasComponentParser):
         """
         exercise_data = {}
         
-        try:
-            # Suche nach ExportItem/Exercise
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
-            if export_item is None:
-                logger.warning("Kein ExportItem-Element gefunden")
-                return self._extract_basic_info()
-            
-            # Suche nach Exercise
-            exercise_elem = export_item.find('.//Exercise')
+        # Suche nach ExportItem/Exercise
+        export_item = find_export_item(root)
+        if export_item is None:
+            logger.warning("Kein ExportItem-Element gefunden")
+            return self._extract_basic_info()
+        
+        # Suche nach Exercise
+        exercise_elem = _XP_EXERCISE.find(export_item)
+        if exercise_elem is None:
+            # Versuche alternative Pfade
+            exercise_elem = _XP_EXERCISE.find(root)
             if exercise_elem is None:
-                # Versuche alternative Pfade
-                exercise_elem = root.find('.//Exercise')
-                if exercise_elem is None:
-                    logger.warning("Kein Exercise-Element gefunden")
-                    return self._extract_basic_info()
+                logger.warning("Kein Exercise-Element gefunden")
+                return self._extract_basic_info()
+        
+        # Basis-Informationen und Einstellungen in einem Durchlauf
+        settings_elem = None
+        for child in exercise_elem:
+            tag = child.tag
+            if tag in _EXERCISE_FIELDS:
+                exercise_data.setdefault(field_key(tag), child.text or '')
+            elif tag == 'Settings' and settings_elem is None:
+                settings_elem = child
+        
+        # Einstellungen
+        if settings_elem is not None:
+            settings = self._child_dict(settings_elem)
+            if settings:
+                exercise_data['settings'] = settings
+        
+        # Aufgaben (beim inkrementellen Parsen bereits extrahiert)
+        assignments = self._stream_records.get('Assignment')
+        if assignments is None:
+            assignments = []
+            for assignment_elem in _XP_ASSIGN.findall(exercise_elem):
+                assignments.append(self._parse_assignment(assignment_elem))
+                assignment_elem.clear()
+        
+        if assignments:
+            exercise_data['assignments'] = [assignment.to_dict() for assignment in assignments]
+        else:
+            # Wenn keine Aufgaben in der XML gefunden wurden, versuche sie aus dem
+            # Dateisystem zu extrahieren (der Durchlauf ist pro Komponente gecacht)
+            exercise_data.update(self._assignments_fallback())
+        
+        return exercise_data
+    
+    def _parse_assignment(self, assignment_elem: ET.Element) -> AssignmentRecord:
+        """
+        Extrahiert eine Aufgabe samt Dateien und Einreichungen.
+        
+        Args:
+            assignment_elem: Assignment-Element
             
-            # Basis-Informationen
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate', 'Instructions']:
-                elem = exercise_elem.find(field)
-                if elem is not None:
-                    exercise_data[field.lower()] = self._get_text(elem)
+        Returns:
+            Datensatz der Aufgabe
+        """
+        # Methoden einmal als lokale Namen binden (LOAD_FAST statt Attributsuche in den Schleifen)
+        get_attribute = self._get_attribute
+        selected_texts = self._selected_texts
+        parse_file = self._parse_file
+        
+        fields = selected_texts(assignment_elem, _XP_ASSIGNMENT_FIELDS)
+        assignment = AssignmentRecord(
+            id=get_attribute(assignment_elem, _K_ID, ''),
+            title=fields.get(_K_TITLE, ''),
+            description=fields.get(_K_DESCRIPTION, ''),
+            type=fields.get(_K_TYPE, ''),
+            # Termine
+            startdate=fields.get(_K_STARTDATE),
+            enddate=fields.get(_K_ENDDATE),
+            submissiondate=fields.get(_K_SUBMISSIONDATE)
+        )
+        
+        # Aufgabendetails
+        details_elem = assignment_elem.find('Details')
+        if details_elem is not None:
+            details = self._child_dict(details_elem)
+            if details:
+                assignment.details = details
+        
+        # Dateien
+        files = assignment.files
+        for file_elem in _XP_FILES.findall(assignment_elem):
+            files.append(parse_file(file_elem))
+        
+        # Einreichungen
+        for submission_elem in _XP_SUBMISSIONS.findall(assignment_elem):
+            fields = selected_texts(submission_elem, _XP_SUBMISSION_FIELDS)
+            submission = SubmissionRecord(
+                id=get_attribute(submission_elem, _K_ID, ''),
+                user_id=get_attribute(submission_elem, _K_USER_ID, ''),
+                date=fields.get(_K_DATE, ''),
+                status=fields.get(_K_STATUS, ''),
+                feedback=fields.get(_K_FEEDBACK, ''),
+                grade=fields.get(_K_GRADE, '')
+            )
             
-            # Einstellungen
-            settings_elem = exercise_elem.find('Settings')
-            if settings_elem is not None:
-                settings = {}
-                for setting_elem in settings_elem:
-                    setting_name = setting_elem.tag
-                    setting_value = self._get_text(setting_elem)
-                    settings[setting_name.lower()] = setting_value
-                
-                if settings:
-                    exercise_data['settings'] = settings
+            # Eingereichte Dateien
+            sub_files = submission.files
+            for sub_file_elem in _XP_FILES.findall(submission_elem):
+                sub_files.append(parse_file(sub_file_elem))
             
-            # Aufgaben
-            assignments = []
-            assignments_elem = exercise_elem.find('Assignments')
-            if assignments_elem is not None:
-                for assignment_elem in assignments_elem.findall('Assignment'):
-                    assignment_data = {
-                        'id': self._get_attribute(assignment_elem, 'id', ''),
-                        'title': self._get_text(assignment_elem.find('Title')),
-                        'description': self._get_text(assignment_elem.find('Description')),
-                        'type': self._get_text(assignment_elem.find('Type')),
-                    }
-                    
-                    # Termine
-                    for date_field in ['StartDate', 'EndDate', 'SubmissionDate']:
-                        date_elem = assignment_elem.find(date_field)
-                        if date_elem is not None:
-                            assignment_data[date_field.lower()] = self._get_text(date_elem)
-                    
-                    # Aufgabendetails
-                    details_elem = assignment_elem.find('Details')
-                    if details_elem is not None:
-                        details = {}
-                        for detail_elem in details_elem:
-                            detail_name = detail_elem.tag
-                            detail_value = self._get_text(detail_elem)
-                            details[detail_name.lower()] = detail_value
-                        
-                        if details:
-                            assignment_data['details'] = details
-                    
-                    # Dateien
-                    files = []
-                    files_elem = assignment_elem.find('Files')
-                    if files_elem is not None:
-                        for file_elem in files_elem.findall('File'):
-                            file_data = {
-                                'name': self._get_text(file_elem.find('Name')),
-                                'size': self._get_text(file_elem.find('Size')),
-                                'type': self._get_text(file_elem.find('Type')),
-                                'path': self._get_text(file_elem.find('Path'))
-                            }
-                            files.append(file_data)
-                    
-                    if files:
-                        assignment_data['files'] = files
-                    
-                    # Einreichungen
-                    submissions = []
-                    submissions_elem = assignment_elem.find('Submissions')
-                    if submissions_elem is not None:
-                        for submission_elem in submissions_elem.findall('Submission'):
-                            submission_data = {
-                                'id': self._get_attribute(submission_elem, 'id', ''),
-                                'user_id': self._get_attribute(submission_elem, 'user_id', ''),
-                                'date': self._get_text(submission_elem.find('Date')),
-                                'status': self._get_text(submission_elem.find('Status')),
-                                'feedback': self._get_text(submission_elem.find('Feedback')),
-                                'grade': self._get_text(submission_elem.find('Grade'))
-                            }
-                            
-                            # Eingereichte Dateien
-                            sub_files = []
-                            sub_files_elem = submission_elem.find('Files')
-                            if sub_files_elem is not None:
-                                for sub_file_elem in sub_files_elem.findall('File'):
-                                    sub_file_data = {
-                                        'name': self._get_text(sub_file_elem.find('Name')),
-                                        'size': self._get_text(sub_file_elem.find('Size')),
-                                        'type': self._get_text(sub_file_elem.find('Type')),
-                                        'path': self._get_text(sub_file_elem.find('Path'))
-                                    }
-                                    sub_files.append(sub_file_data)
-                            
-                            if sub_files:
-                                submission_data['files'] = sub_files
-                            
-                            submissions.append(submission_data)
-                    
-                    if submissions:
-                        assignment_data['submissions'] = submissions
-                    
-                    assignments.append(assignment_data)
+            assignment.submissions.append(submission)
+        
+        return assignment
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> AssignmentRecord:
+        """
+        Extrahiert Aufgaben beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Assignment-Element
             
-            if assignments:
-                exercise_data['assignments'] = assignments
-            else:
-                # Wenn keine Aufgaben in der XML gefunden wurden, versuche sie aus dem Dateisystem zu extrahieren
-                filesystem_assignments = self._extract_assignments_from_filesystem()
-                if filesystem_assignments:
-                    exercise_data['assignments'] = filesystem_assignments
+        Returns:
+            Datensatz der Aufgabe
+        """
+        return self._parse_assignment(elem)
+    
+    def _parse_file(self, file_elem: ET.Element) -> FileRecord:
+        """
+        Extrahiert eine Datei einer Aufgabe oder Einreichung.
+        
+        Args:
+            file_elem: File-Element
             
-            return exercise_data
+        Returns:
+            Datensatz der Datei
+        """
+        fields = self._selected_texts(file_elem, _XP_FILE_FIELDS)
+        return FileRecord(
+            fields.get(_K_NAME, ''),
+            fields.get(_K_SIZE, ''),
+            fields.get(_K_TYPE, ''),
+            fields.get(_K_PATH, '')
+        )
+    
+    def _assignments_fallback(self) -> Dict[str, Any]:
+        """
+        Liefert die Aufgaben aus dem Dateisystem als Ergänzung der XML-Daten.
         
-        except Exception as e:
-            logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
-            return self._extract_basic_info()
+        Returns:
+            Dict mit 'assignments' oder leeres Dict, wenn keine gefunden wurden
+        """
+        filesystem_assignments = self._extract_assignments_from_filesystem()
+        return {'assignments': filesystem_assignments} if filesystem_assignments else {}
     
     def _extract_assignments_from_filesystem(self) -> List[Dict[str, Any]]:
         """
-        Extrahiert Aufgabeninformationen aus dem Dateisystem.
+        Extrahiert Aufgabeninformationen aus dem Dateisystem (gecacht pro Komponenten-Pfad).
+        
+        Returns:
+            Liste mit Aufgabeninformationen
+        """
+        if not self.component_path:
+            return []
+        return self._cached_fs_scan('assignments', self._scan_assignments_from_filesystem)
+    
+    def _scan_assignments_from_filesystem(self) -> List[Dict[str, Any]]:
+        """
+        Durchsucht das Dateisystem ohne Cache (siehe _extract_assignments_from_filesystem).
         
         Returns:
             Liste mit Aufgabeninformationen
@@ -170,101 +238,124 @@ class ExerciseParser(IliasComponentParser):
             return assignments
         
         try:
-            # Suche nach Aufgabenverzeichnissen
-            assignment_dirs = glob.glob(os.path.join(self.component_path, "assignment_*"))
+            # Suche nach Aufgabenverzeichnissen (ein scandir statt glob mit fnmatch je Eintrag)
+            with os.scandir(self.component_path) as it:
+                assignment_dirs = [entry for entry in it
+                                   if entry.name.startswith("assignment_") and entry.is_dir()]
             
             for assignment_dir in assignment_dirs:
-                assignment_id = os.path.basename(assignment_dir).replace("assignment_", "")
+                assignment_id = assignment_dir.name.replace("assignment_", "")
+                
+                # XML-Dateien, files/ und submissions/ in einem Durchlauf bestimmen
+                xml_files = []
+                files_dir = None
+                submissions_dir = None
+                with os.scandir(assignment_dir.path) as it:
+                    for entry in it:
+                        name = entry.name
+                        if name.endswith(".xml") and not name.startswith("."):
+                            xml_files.append(entry.path)
+                        elif name == "files" and entry.is_dir():
+                            files_dir = entry.path
+                        elif name == "submissions" and entry.is_dir():
+                            submissions_dir = entry.path
                 
                 # Basis-Informationen aus dem Verzeichnisnamen
-                assignment_data = {
-                    'id': assignment_id,
-                    'title': f"Aufgabe {assignment_id}",
-                    'description': f"Aus dem Dateisystem extrahierte Aufgabe {assignment_id}"
-                }
+                assignment = AssignmentRecord(
+                    id=assignment_id,
+                    title=f"Aufgabe {assignment_id}",
+                    description=f"Aus dem Dateisystem extrahierte Aufgabe {assignment_id}"
+                )
                 
-                # Suche nach XML-Dateien für weitere Informationen
-                xml_files = glob.glob(os.path.join(assignment_dir, "*.xml"))
+                # Werte XML-Dateien für weitere Informationen aus
                 for xml_file in xml_files:
                     try:
-                        tree = ET.parse(xml_file)
-                        xml_root = tree.getroot()
+                        # Liest nur bis alle gesuchten Elemente gefunden wurden
+                        found = scan_xml_fields(xml_file, _PROBE_FIELDS)
                         
-                        # Suche nach Titel und Beschreibung
-                        title_elem = xml_root.find(".//Title")
-                        if title_elem is not None and title_elem.text:
-                            assignment_data['title'] = title_elem.text
+                        # Titel und Beschreibung
+                        if found.get('Title'):
+                            assignment.title = found['Title']
                         
-                        desc_elem = xml_root.find(".//Description")
-                        if desc_elem is not None and desc_elem.text:
-                            assignment_data['description'] = desc_elem.text
+                        if found.get('Description'):
+                            assignment.description = found['Description']
                         
-                        # Suche nach Terminen
-                        for date_field in ['StartDate', 'EndDate', 'SubmissionDate']:
-                            date_elem = xml_root.find(f".//{date_field}")
-                            if date_elem is not None and date_elem.text:
-                                assignment_data[date_field.lower()] = date_elem.text
+                        # Termine
+                        for date_field in _PROBE_DATES:
+                            if found.get(date_field):
+                                setattr(assignment, field_key(date_field), found[date_field])
                     
                     except Exception as e:
                         logger.warning(f"Fehler beim Extrahieren von Informationen aus {xml_file}: {str(e)}")
                 
                 # Suche nach Dateien
-                files = []
-                file_dirs = glob.glob(os.path.join(assignment_dir, "files"))
-                for file_dir in file_dirs:
-                    for root, _, filenames in os.walk(file_dir):
-                        for filename in filenames:
-                            file_path = os.path.join(root, filename)
-                            file_size = os.path.getsize(file_path)
-                            file_type = os.path.splitext(filename)[1][1:]  # Entferne den Punkt
-                            
-                            files.append({
-                                'name': filename,
-                                'size': str(file_size),
-                                'type': file_type,
-                                'path': os.path.relpath(file_path, self.component_path)
-                            })
-                
-                if files:
-                    assignment_data['files'] = files
+                if files_dir is not None:
+                    make_file_record = self._make_file_record
+                    assignment.files = [make_file_record(filename, file_path, file_size)
+                                        for filename, file_path, file_size in iter_files(files_dir)]
                 
                 # Suche nach Einreichungen
-                submissions = []
-                submission_dirs = glob.glob(os.path.join(assignment_dir, "submissions", "*"))
-                for submission_dir in submission_dirs:
-                    user_id = os.path.basename(submission_dir)
-                    
-                    submission_data = {
-                        'id': f"{assignment_id}_{user_id}",
-                        'user_id': user_id
-                    }
-                    
-                    # Suche nach eingereichten Dateien
-                    sub_files = []
-                    for root, _, filenames in os.walk(submission_dir):
-                        for filename in filenames:
-                            file_path = os.path.join(root, filename)
-                            file_size = os.path.getsize(file_path)
-                            file_type = os.path.splitext(filename)[1][1:]  # Entferne den Punkt
-                            
-                            sub_files.append({
-                                'name': filename,
-                                'size': str(file_size),
-                                'type': file_type,
-                                'path': os.path.relpath(file_path, self.component_path)
-                            })
-                    
-                    if sub_files:
-                        submission_data['files'] = sub_files
-                    
-                    submissions.append(submission_data)
+                submission_dirs = []
+                if submissions_dir is not None:
+                    with os.scandir(submissions_dir) as it:
+                        submission_dirs = [entry for entry in it if not entry.name.startswith(".")]
                 
-                if submissions:
-                    assignment_data['submissions'] = submissions
+                # Die Verzeichnisse der Einreichungen sind unabhängig; ihre Stat-Aufrufe überlappen in Threads
+                if len(submission_dirs) > 1:
+                    with ThreadPoolExecutor(max_workers=min(_WALK_WORKERS, len(submission_dirs))) as executor:
+                        assignment.submissions = list(executor.map(
+                            lambda entry: self._walk_submission(assignment_id, entry), submission_dirs))
+                else:
+                    assignment.submissions = [self._walk_submission(assignment_id, entry) for entry in submission_dirs]
                 
-                assignments.append(assignment_data)
+                assignments.append(assignment.to_dict())
         
         except Exception as e:
             logger.warning(f"Fehler beim Extrahieren von Aufgaben aus dem Dateisystem: {str(e)}")
         
-        return assignments 
\ No newline at end of file
+        return assignments
+    
+    def _walk_submission(self, assignment_id: str, submission_dir: os.DirEntry) -> SubmissionRecord:
+        """
+        Extrahiert eine Einreichung samt ihrer Dateien aus dem Dateisystem.
+        
+        Args:
+            assignment_id: ID der Aufgabe
+            submission_dir: Verzeichniseintrag der Einreichung (Name = Benutzer-ID)
+            
+        Returns:
+            Datensatz der Einreichung
+        """
+        user_id = submission_dir.name
+        
+        submission = SubmissionRecord(
+            id=f"{assignment_id}_{user_id}",
+            user_id=user_id
+        )
+        
+        # Suche nach eingereichten Dateien
+        if submission_dir.is_dir():
+            make_file_record = self._make_file_record
+            submission.files = [make_file_record(filename, file_path, file_size)
+                                for filename, file_path, file_size in iter_files(submission_dir.path)]
+        
+        return submission
+    
+    def _make_file_record(self, filename: str, file_path: str, file_size: int) -> FileRecord:
+        """
+        Erstellt den Datensatz einer Datei aus dem Dateisystem.
+        
+        Args:
+            filename: Dateiname
+            file_path: Absoluter Dateipfad
+            file_size: Größe in Bytes
+            
+        Returns:
+            Datensatz mit Endung als Typ und Pfad relativ zur Komponente
+        """
+        return FileRecord(
+            filename,
+            str(file_size),
+            os.path.splitext(filename)[1][1:],  # Entferne den Punkt
+            os.path.relpath(file_path, self.component_path)
+        )
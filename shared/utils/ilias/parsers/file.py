@@ -3,16 +3,22 @@ Parser für ILIAS-Datei-Komponenten.
 """
 
 from typing import Dict, Any
-import xml.etree.ElementTree as ET
 import logging
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, compile_path, find_export_item, guess_mime_type
 import os
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_FILE = compile_path('.//File')
+_XP_VERSION = compile_path('Version')
+
 class FileParser(IliasComponentParser):
     """Parser für ILIAS-Dateien."""
     
+    # Die Versionshistorie wächst mit jeder hochgeladenen Version
+    STREAM_TAGS = {'Version': 'Versions'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten einer ILIAS-Datei.
@@ -25,81 +31,132 @@ class FileParser(IliasComponentParser):
         """
         file_data = {}
         
-        try:
-            # Suche nach ExportItem/File
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
-            if export_item is None:
-                logger.warning("Kein ExportItem-Element gefunden")
-                return self._extract_file_info_from_filesystem()
-            
-            file_elem = export_item.find('.//File')
-            if file_elem is None:
-                logger.warning("Kein File-Element gefunden")
-                return self._extract_file_info_from_filesystem()
-            
-            # Basis-Informationen
-            file_data.update({
-                'obj_id': self._get_attribute(file_elem, 'obj_id'),
-                'version': self._get_attribute(file_elem, 'version'),
-                'max_version': self._get_attribute(file_elem, 'max_version'),
-                'size': self._get_attribute(file_elem, 'size'),
-                'type': self._get_attribute(file_elem, 'type'),
-                'action': self._get_attribute(file_elem, 'action')
-            })
-            
-            # Dateiname und Titel
-            for field in ['Filename', 'Title', 'Description']:
-                elem = file_elem.find(field)
-                if elem is not None:
-                    file_data[field.lower()] = self._get_text(elem)
-                else:
-                    logger.debug(f"Kein {field}-Element gefunden")
-            
-            # Rating
-            rating = file_elem.find('Rating')
-            if rating is not None:
-                file_data['rating'] = self._get_text(rating)
-            
-            # Versionen
-            versions = file_elem.find('Versions')
-            if versions is not None:
+        # Suche nach ExportItem/File
+        export_item = find_export_item(root)
+        if export_item is None:
+            logger.warning("Kein ExportItem-Element gefunden")
+            return self._extract_file_info_from_filesystem()
+        
+        file_elem = _XP_FILE.find(export_item)
+        if file_elem is None:
+            logger.warning("Kein File-Element gefunden")
+            return self._extract_file_info_from_filesystem()
+        
+        # Basis-Informationen
+        file_data.update({
+            'obj_id': self._get_attribute(file_elem, 'obj_id'),
+            'version': self._get_attribute(file_elem, 'version'),
+            'max_version': self._get_attribute(file_elem, 'max_version'),
+            'size': self._get_attribute(file_elem, 'size'),
+            'type': self._get_attribute(file_elem, 'type'),
+            'action': self._get_attribute(file_elem, 'action')
+        })
+        
+        # Dateiname und Titel
+        for field in ['Filename', 'Title', 'Description']:
+            elem = file_elem.find(field)
+            if elem is not None:
+                file_data[field.lower()] = self._get_text(elem)
+            else:
+                logger.debug(f"Kein {field}-Element gefunden")
+        
+        # Rating
+        rating = file_elem.find('Rating')
+        if rating is not None:
+            file_data['rating'] = self._get_text(rating)
+        
+        # Versionen
+        versions = file_elem.find('Versions')
+        if versions is not None:
+            # Beim inkrementellen Parsen bereits extrahiert
+            version_list = self._stream_records.get('Version')
+            if version_list is None:
                 version_list = []
-                for version in versions.findall('Version'):
-                    version_data = {
-                        'version': self._get_attribute(version, 'version'),
-                        'max_version': self._get_attribute(version, 'max_version'),
-                        'date': self._get_attribute(version, 'date'),
-                        'usr_id': self._get_attribute(version, 'usr_id'),
-                        'action': self._get_attribute(version, 'action'),
-                        'rollback_version': self._get_attribute(version, 'rollback_version'),
-                        'rollback_user_id': self._get_attribute(version, 'rollback_user_id'),
-                        'mode': self._get_attribute(version, 'mode'),
-                        'path': self._get_text(version)
-                    }
-                    version_list.append(version_data)
-                file_data['versions'] = version_list
+                for version in _XP_VERSION.findall(versions):
+                    version_list.append(self._parse_version(version))
+                    version.clear()
+            file_data['versions'] = version_list
+        
+        # Wenn kein Titel gefunden wurde, verwende den Dateinamen
+        if 'title' not in file_data or not file_data['title']:
+            if 'filename' in file_data and file_data['filename']:
+                file_data['title'] = file_data['filename']
+        
+        # Wenn keine Größe gefunden wurde, versuche sie aus dem Dateisystem zu ermitteln
+        # (der Durchlauf ist pro Komponente gecacht)
+        if 'size' not in file_data or not file_data['size'] or file_data['size'] == '0':
+            file_data.update(self._size_fallback(bool(file_data.get('type'))))
+        
+        return file_data
+    
+    def _size_fallback(self, has_type: bool) -> Dict[str, Any]:
+        """
+        Liefert Größe und ggf. Typ aus dem Dateisystem als Ergänzung der XML-Daten.
+        
+        Args:
+            has_type: Ob die XML bereits einen Typ enthielt
             
-            # Wenn kein Titel gefunden wurde, verwende den Dateinamen
-            if 'title' not in file_data or not file_data['title']:
-                if 'filename' in file_data and file_data['filename']:
-                    file_data['title'] = file_data['filename']
+        Returns:
+            Dict mit den zu übernehmenden Werten
+        """
+        filesystem_info = self._extract_file_info_from_filesystem()
+        updates = {}
+        if 'size' in filesystem_info:
+            updates['size'] = filesystem_info['size']
+        if 'type' in filesystem_info and not has_type:
+            updates['type'] = filesystem_info['type']
+        return updates
+    
+    def _parse_version(self, version: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert eine Dateiversion.
+        
+        Args:
+            version: Version-Element
             
-            # Wenn keine Größe gefunden wurde, versuche sie aus dem Dateisystem zu ermitteln
-            if 'size' not in file_data or not file_data['size'] or file_data['size'] == '0':
-                filesystem_info = self._extract_file_info_from_filesystem()
-                if 'size' in filesystem_info:
-                    file_data['size'] = filesystem_info['size']
-                if 'type' in filesystem_info and ('type' not in file_data or not file_data['type']):
-                    file_data['type'] = filesystem_info['type']
+        Returns:
+            Dict mit den Versionsdaten
+        """
+        get_attribute = self._get_attribute
+        return {
+            'version': get_attribute(version, 'version'),
+            'max_version': get_attribute(version, 'max_version'),
+            'date': get_attribute(version, 'date'),
+            'usr_id': get_attribute(version, 'usr_id'),
+            'action': get_attribute(version, 'action'),
+            'rollback_version': get_attribute(version, 'rollback_version'),
+            'rollback_user_id': get_attribute(version, 'rollback_user_id'),
+            'mode': get_attribute(version, 'mode'),
+            'path': self._get_text(version)
+        }
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert Dateiversionen beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Version-Element
             
-            return file_data
-        except Exception as e:
-            logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
-            return self._extract_file_info_from_filesystem()
+        Returns:
+            Dict mit den Versionsdaten
+        """
+        return self._parse_version(elem)
     
     def _extract_file_info_from_filesystem(self) -> Dict[str, Any]:
         """
-        Extrahiert Dateiinformationen aus dem Dateisystem.
+        Extrahiert Dateiinformationen aus dem Dateisystem (gecacht pro Komponenten-Pfad).
+        
+        Returns:
+            Dict mit Dateiinformationen
+        """
+        if not self.component_path:
+            return {}
+        return self._cached_fs_scan('file_info', self._scan_file_info_from_filesystem)
+    
+    def _scan_file_info_from_filesystem(self) -> Dict[str, Any]:
+        """
+        Durchsucht das Dateisystem ohne Cache (siehe _extract_file_info_from_filesystem).
         
         Returns:
             Dict mit Dateiinformationen
@@ -121,8 +178,7 @@ class FileParser(IliasComponentParser):
                     file_size = os.path.getsize(file_path)
                     
                     # Bestimme den MIME-Typ
-                    import mimetypes
-                    mime_type, encoding = mimetypes.guess_type(file_path)
+                    mime_type = guess_mime_type(file)
                     
                     file_data = {
                         'filename': file,
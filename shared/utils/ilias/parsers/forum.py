@@ -2,18 +2,119 @@
 Parser für ILIAS-Forum-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 import logging
 import os
-import glob
-from .base import IliasComponentParser
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from .base import IliasComponentParser, ET, _iterparse, compile_path, field_key, find_export_item, iter_files, looks_like_xml, scan_xml_fields
 
 logger = logging.getLogger(__name__)
 
+# Internierte Tag-Namen der Themen-/Beitragsschleifen
+_TAG_TOPICS = sys.intern('Topics')
+_TAG_TOPIC = sys.intern('Topic')
+_TAG_POSTS = sys.intern('Posts')
+_TAG_ATTACHMENTS = sys.intern('Attachments')
+_TAG_SETTINGS = sys.intern('Settings')
+
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_FORUM = compile_path('.//Forum')
+_XP_TOPIC = compile_path(_TAG_TOPIC)
+_XP_POST = compile_path('Post')
+_XP_ATTACHMENT = compile_path('Attachment')
+
+# Basis-Informationen eines Forums (direkte Kinder von Forum)
+_BASE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate'})
+# Textfelder von Themen (Tag -> Schlüssel), gelesen in einem Durchlauf über die direkten Kinder
+_TOPIC_FIELDS = {
+    'Title': 'title',
+    'Description': 'description',
+    'Author': 'author',
+    'CreateDate': 'create_date',
+    'LastUpdate': 'last_update',
+    'Views': 'views',
+    'Sticky': 'sticky',
+    'Closed': 'closed'
+}
+# Textfelder von Beiträgen (Tag -> Schlüssel), ebenfalls in einem Durchlauf gelesen
+_POST_FIELDS = {
+    'Title': 'title',
+    'Message': 'message',
+    'Author': 'author',
+    'CreateDate': 'create_date',
+    'LastUpdate': 'last_update',
+    'ParentId': 'parent_id',
+    'Depth': 'depth'
+}
+# Textfelder von Anhängen, mit einer einmalig vorbereiteten Pfad-Vereinigung gelesen
+# (mit lxml als kompiliertes XPath)
+_XP_ATTACHMENT_FIELDS = compile_path('Name|Size|Type|Path')
+# Gesuchte Elemente in den XML-Dateien der Themen- und Beitragsverzeichnisse (Tag -> Schlüssel)
+_TOPIC_PROBE = {'Title': 'title', 'Description': 'description', 'Author': 'author', 'CreateDate': 'create_date'}
+_POST_PROBE = {'Title': 'title', 'Message': 'message', 'Author': 'author', 'CreateDate': 'create_date'}
+_TOPIC_PROBE_FIELDS = frozenset(_TOPIC_PROBE)
+_POST_PROBE_FIELDS = frozenset(_POST_PROBE)
+# Obergrenze der Threads für die Verarbeitung der Themenverzeichnisse
+_TOPIC_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Verzeichnis-Präfixe im Dateisystem-Export; die ID folgt direkt auf das Präfix
+_TOPIC_PREFIX = 'topic_'
+_POST_PREFIX = 'post_'
+_TOPIC_PREFIX_LEN = len(_TOPIC_PREFIX)
+_POST_PREFIX_LEN = len(_POST_PREFIX)
+
+
+def _extension(filename: str) -> str:
+    """
+    Liefert die Dateiendung ohne Punkt (wie os.path.splitext, führende Punkte zählen nicht).
+    
+    Args:
+        filename: Dateiname ohne Verzeichnis
+        
+    Returns:
+        Dateiendung oder leerer String
+    """
+    head, _, ext = filename.rpartition('.')
+    return ext if head.lstrip('.') else ''
+
+
+def _scan_dir(path: str, dir_prefix: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Listet XML-Dateien und Unterverzeichnisse mit einem Präfix in einem os.scandir-Durchlauf.
+    
+    Datei- und Verzeichnistyp stammen aus dem DirEntry, ohne zusätzliche stat-Aufrufe.
+    
+    Args:
+        path: Zu durchsuchendes Verzeichnis
+        dir_prefix: Präfix der gesuchten Unterverzeichnisse (None: keine)
+        
+    Returns:
+        Tupel aus den Pfaden der XML-Dateien und der passenden Unterverzeichnisse
+    """
+    xml_files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                # Wie bei glob werden versteckte Einträge ignoriert
+                if name.startswith('.'):
+                    continue
+                if dir_prefix is not None and name.startswith(dir_prefix):
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                elif name.endswith('.xml') and entry.is_file():
+                    xml_files.append(entry.path)
+    except OSError as e:
+        logger.warning(f"Fehler beim Durchsuchen von {path}: {str(e)}")
+    return xml_files, subdirs
+
 class ForumParser(IliasComponentParser):
     """Parser für ILIAS-Foren."""
     
+    # Themen mit ihren Beiträgen sind der unbegrenzt große Teil eines Forum-Exports
+    STREAM_TAGS = {_TAG_TOPIC: _TAG_TOPICS}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten eines ILIAS-Forums.
@@ -28,93 +129,44 @@ class ForumParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/Forum
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Suche nach Forum
-            forum_elem = export_item.find('.//Forum')
+            forum_elem = _XP_FORUM.find(export_item)
             if forum_elem is None:
                 # Versuche alternative Pfade
-                forum_elem = root.find('.//Forum')
+                forum_elem = _XP_FORUM.find(root)
                 if forum_elem is None:
                     logger.warning("Kein Forum-Element gefunden")
                     return self._extract_basic_info()
             
-            # Basis-Informationen
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate']:
-                elem = forum_elem.find(field)
-                if elem is not None:
-                    forum_data[field.lower()] = self._get_text(elem)
-            
-            # Einstellungen
-            settings_elem = forum_elem.find('Settings')
-            if settings_elem is not None:
-                settings = {}
-                for setting_elem in settings_elem:
-                    setting_name = setting_elem.tag
-                    setting_value = self._get_text(setting_elem)
-                    settings[setting_name.lower()] = setting_value
-                
-                if settings:
-                    forum_data['settings'] = settings
+            # Basis-Informationen, Einstellungen und Themen in einem Durchlauf über die
+            # Kinder des Forum-Elements; jeweils das erste Vorkommen gewinnt
+            stream_topics = self._stream_records.get(_TAG_TOPIC)
+            topics = None
+            settings_elem = None
+            for child in forum_elem:
+                tag = child.tag
+                if tag in _BASE_FIELDS:
+                    forum_data.setdefault(field_key(tag), child.text or '')
+                elif tag == _TAG_SETTINGS:
+                    if settings_elem is None:
+                        settings_elem = child
+                        settings = self._child_dict(child)
+                        if settings:
+                            forum_data['settings'] = settings
+                elif tag == _TAG_TOPICS and topics is None and stream_topics is None:
+                    topics = []
+                    for topic_elem in _XP_TOPIC.findall(child):
+                        topics.append(self._parse_topic(topic_elem))
+                        topic_elem.clear()
             
-            # Themen
-            topics = []
-            topics_elem = forum_elem.find('Topics')
-            if topics_elem is not None:
-                for topic_elem in topics_elem.findall('Topic'):
-                    topic_data = {
-                        'id': self._get_attribute(topic_elem, 'id', ''),
-                        'title': self._get_text(topic_elem.find('Title')),
-                        'description': self._get_text(topic_elem.find('Description')),
-                        'author': self._get_text(topic_elem.find('Author')),
-                        'create_date': self._get_text(topic_elem.find('CreateDate')),
-                        'last_update': self._get_text(topic_elem.find('LastUpdate')),
-                        'views': self._get_text(topic_elem.find('Views')),
-                        'sticky': self._get_text(topic_elem.find('Sticky')) == '1',
-                        'closed': self._get_text(topic_elem.find('Closed')) == '1'
-                    }
-                    
-                    # Beiträge
-                    posts = []
-                    posts_elem = topic_elem.find('Posts')
-                    if posts_elem is not None:
-                        for post_elem in posts_elem.findall('Post'):
-                            post_data = {
-                                'id': self._get_attribute(post_elem, 'id', ''),
-                                'title': self._get_text(post_elem.find('Title')),
-                                'message': self._get_text(post_elem.find('Message')),
-                                'author': self._get_text(post_elem.find('Author')),
-                                'create_date': self._get_text(post_elem.find('CreateDate')),
-                                'last_update': self._get_text(post_elem.find('LastUpdate')),
-                                'parent_id': self._get_text(post_elem.find('ParentId')),
-                                'depth': self._get_text(post_elem.find('Depth'))
-                            }
-                            
-                            # Anhänge
-                            attachments = []
-                            attachments_elem = post_elem.find('Attachments')
-                            if attachments_elem is not None:
-                                for attachment_elem in attachments_elem.findall('Attachment'):
-                                    attachment_data = {
-                                        'name': self._get_text(attachment_elem.find('Name')),
-                                        'size': self._get_text(attachment_elem.find('Size')),
-                                        'type': self._get_text(attachment_elem.find('Type')),
-                                        'path': self._get_text(attachment_elem.find('Path'))
-                                    }
-                                    attachments.append(attachment_data)
-                            
-                            if attachments:
-                                post_data['attachments'] = attachments
-                            
-                            posts.append(post_data)
-                    
-                    if posts:
-                        topic_data['posts'] = posts
-                    
-                    topics.append(topic_data)
+            # Beim inkrementellen Parsen bereits extrahiert
+            if stream_topics is not None:
+                topics = stream_topics
             
             if topics:
                 forum_data['topics'] = topics
@@ -130,9 +182,144 @@ class ForumParser(IliasComponentParser):
             logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
             return self._extract_basic_info()
     
+    def iter_topics(self, xml_path: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert die Themen eines Forums einzeln, ohne den Export vollständig aufzubauen.
+        
+        Die XML wird inkrementell gelesen und jedes Topic-Element nach der Übergabe
+        geleert, sodass z.B. beim Schreiben in eine Datenbank nur ein Thema zur Zeit
+        im Speicher liegt. Enthält die XML keine Themen, werden wie bei parse() die
+        Themen aus dem Dateisystem geliefert.
+        
+        Args:
+            xml_path: Pfad zur XML-Datei. Wenn None, wird export.xml im Komponenten-Pfad gesucht.
+            
+        Returns:
+            Iterator über die Themendaten
+        """
+        if xml_path is None and self.component_path:
+            xml_path = self._find_first("export.xml")
+        
+        found = False
+        if xml_path and os.path.isfile(xml_path):
+            try:
+                for _, topic_elem in self._iter_stream_elements(_iterparse(xml_path, ('start', 'end'))):
+                    found = True
+                    yield self._parse_topic(topic_elem)
+            except ET.ParseError as e:
+                logger.error(f"XML-Parsing-Fehler in {xml_path}: {e}")
+        
+        if not found and self.component_path:
+            yield from self._extract_topics_from_filesystem()
+    
+    def _parse_topic(self, topic_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert ein Thema samt Beiträgen und Anhängen.
+        
+        Args:
+            topic_elem: Topic-Element
+            
+        Returns:
+            Dict mit den Themendaten
+        """
+        # Textfelder und Beitragsliste in einem Durchlauf über die Kinder
+        fields = {}
+        posts_elem = None
+        for child in topic_elem:
+            key = _TOPIC_FIELDS.get(child.tag)
+            if key is not None:
+                fields.setdefault(key, child.text or '')
+            elif child.tag == _TAG_POSTS and posts_elem is None:
+                posts_elem = child
+        
+        topic_data = {
+            'id': self._get_attribute(topic_elem, 'id', ''),
+            'title': fields.get('title', ''),
+            'description': fields.get('description', ''),
+            'author': fields.get('author', ''),
+            'create_date': fields.get('create_date', ''),
+            'last_update': fields.get('last_update', ''),
+            'views': fields.get('views', ''),
+            'sticky': fields.get('sticky') == '1',
+            'closed': fields.get('closed') == '1'
+        }
+        
+        # Beiträge
+        posts = []
+        if posts_elem is not None:
+            for post_elem in _XP_POST.findall(posts_elem):
+                # Textfelder und Anhangsliste in einem Durchlauf über die Kinder (Sprungtabelle)
+                fields = {}
+                attachments_elem = None
+                for child in post_elem:
+                    tag = child.tag
+                    key = _POST_FIELDS.get(tag)
+                    if key is not None:
+                        fields.setdefault(key, child.text or '')
+                    elif tag == _TAG_ATTACHMENTS and attachments_elem is None:
+                        attachments_elem = child
+                
+                post_data = {
+                    'id': self._get_attribute(post_elem, 'id', ''),
+                    'title': fields.get('title', ''),
+                    'message': fields.get('message', ''),
+                    'author': fields.get('author', ''),
+                    'create_date': fields.get('create_date', ''),
+                    'last_update': fields.get('last_update', ''),
+                    'parent_id': fields.get('parent_id', ''),
+                    'depth': fields.get('depth', '')
+                }
+                
+                # Anhänge
+                attachments = []
+                if attachments_elem is not None:
+                    for attachment_elem in _XP_ATTACHMENT.findall(attachments_elem):
+                        fields = self._selected_texts(attachment_elem, _XP_ATTACHMENT_FIELDS)
+                        attachment_data = {
+                            'name': fields.get('name', ''),
+                            'size': fields.get('size', ''),
+                            'type': fields.get('type', ''),
+                            'path': fields.get('path', '')
+                        }
+                        attachments.append(attachment_data)
+                
+                if attachments:
+                    post_data['attachments'] = attachments
+                
+                posts.append(post_data)
+        
+        if posts:
+            topic_data['posts'] = posts
+        
+        return topic_data
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert Themen beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Topic-Element
+            
+        Returns:
+            Dict mit den Themendaten
+        """
+        return self._parse_topic(elem)
+    
     def _extract_topics_from_filesystem(self) -> List[Dict[str, Any]]:
         """
-        Extrahiert Themeninformationen aus dem Dateisystem.
+        Extrahiert Themeninformationen aus dem Dateisystem (gecacht pro Komponenten-Pfad).
+        
+        Returns:
+            Liste mit Themeninformationen
+        """
+        if not self.component_path:
+            return []
+        return self._cached_fs_scan('topics', self._scan_topics_from_filesystem)
+    
+    def _scan_topics_from_filesystem(self) -> List[Dict[str, Any]]:
+        """
+        Durchsucht das Dateisystem ohne Cache (siehe _extract_topics_from_filesystem).
         
         Returns:
             Liste mit Themeninformationen
@@ -144,116 +331,124 @@ class ForumParser(IliasComponentParser):
         
         try:
             # Suche nach Themenverzeichnissen
-            topic_dirs = glob.glob(os.path.join(self.component_path, "topic_*"))
+            _, topic_dirs = _scan_dir(self.component_path, _TOPIC_PREFIX)
             
+            # Zuerst alle Verzeichnisse auflisten (XML-Dateien und Beitragsverzeichnisse
+            # in einem Durchlauf)
+            layout = []
             for topic_dir in topic_dirs:
-                topic_id = os.path.basename(topic_dir).replace("topic_", "")
-                
-                # Basis-Informationen aus dem Verzeichnisnamen
-                topic_data = {
-                    'id': topic_id,
-                    'title': f"Thema {topic_id}",
-                    'description': f"Aus dem Dateisystem extrahiertes Thema {topic_id}"
-                }
-                
-                # Suche nach XML-Dateien für weitere Informationen
-                xml_files = glob.glob(os.path.join(topic_dir, "*.xml"))
-                for xml_file in xml_files:
-                    try:
-                        tree = ET.parse(xml_file)
-                        xml_root = tree.getroot()
-                        
-                        # Suche nach Titel und Beschreibung
-                        title_elem = xml_root.find(".//Title")
-                        if title_elem is not None and title_elem.text:
-                            topic_data['title'] = title_elem.text
-                        
-                        desc_elem = xml_root.find(".//Description")
-                        if desc_elem is not None and desc_elem.text:
-                            topic_data['description'] = desc_elem.text
-                        
-                        # Suche nach Autor und Datum
-                        author_elem = xml_root.find(".//Author")
-                        if author_elem is not None and author_elem.text:
-                            topic_data['author'] = author_elem.text
-                        
-                        create_date_elem = xml_root.find(".//CreateDate")
-                        if create_date_elem is not None and create_date_elem.text:
-                            topic_data['create_date'] = create_date_elem.text
-                    
-                    except Exception as e:
-                        logger.warning(f"Fehler beim Extrahieren von Informationen aus {xml_file}: {str(e)}")
-                
-                # Suche nach Beiträgen
-                posts = []
-                post_dirs = glob.glob(os.path.join(topic_dir, "post_*"))
-                
+                xml_files, post_dirs = _scan_dir(topic_dir, _POST_PREFIX)
+                post_layout = []
                 for post_dir in post_dirs:
-                    post_id = os.path.basename(post_dir).replace("post_", "")
-                    
-                    # Basis-Informationen aus dem Verzeichnisnamen
-                    post_data = {
-                        'id': post_id,
-                        'title': f"Beitrag {post_id}",
-                        'message': f"Aus dem Dateisystem extrahierter Beitrag {post_id}"
-                    }
-                    
-                    # Suche nach XML-Dateien für weitere Informationen
-                    xml_files = glob.glob(os.path.join(post_dir, "*.xml"))
-                    for xml_file in xml_files:
-                        try:
-                            tree = ET.parse(xml_file)
-                            xml_root = tree.getroot()
-                            
-                            # Suche nach Titel und Nachricht
-                            title_elem = xml_root.find(".//Title")
-                            if title_elem is not None and title_elem.text:
-                                post_data['title'] = title_elem.text
-                            
-                            message_elem = xml_root.find(".//Message")
-                            if message_elem is not None and message_elem.text:
-                                post_data['message'] = message_elem.text
-                            
-                            # Suche nach Autor und Datum
-                            author_elem = xml_root.find(".//Author")
-                            if author_elem is not None and author_elem.text:
-                                post_data['author'] = author_elem.text
-                            
-                            create_date_elem = xml_root.find(".//CreateDate")
-                            if create_date_elem is not None and create_date_elem.text:
-                                post_data['create_date'] = create_date_elem.text
-                        
-                        except Exception as e:
-                            logger.warning(f"Fehler beim Extrahieren von Informationen aus {xml_file}: {str(e)}")
-                    
-                    # Suche nach Anhängen
-                    attachments = []
-                    attachment_dir = os.path.join(post_dir, "attachments")
-                    if os.path.exists(attachment_dir):
-                        for root, _, filenames in os.walk(attachment_dir):
-                            for filename in filenames:
-                                file_path = os.path.join(root, filename)
-                                file_size = os.path.getsize(file_path)
-                                file_type = os.path.splitext(filename)[1][1:]  # Entferne den Punkt
-                                
-                                attachments.append({
-                                    'name': filename,
-                                    'size': str(file_size),
-                                    'type': file_type,
-                                    'path': os.path.relpath(file_path, self.component_path)
-                                })
-                    
-                    if attachments:
-                        post_data['attachments'] = attachments
-                    
-                    posts.append(post_data)
-                
-                if posts:
-                    topic_data['posts'] = posts
-                
-                topics.append(topic_data)
+                    post_xml_files, _ = _scan_dir(post_dir)
+                    post_layout.append((post_dir, post_xml_files))
+                layout.append((topic_dir, xml_files, post_layout))
+            
+            # Themenverzeichnisse sind unabhängig voneinander und werden parallel verarbeitet;
+            # jedes Thema liest nur seine eigenen XML-Dateien, sodass nie alle Inhalte
+            # gleichzeitig im Speicher liegen
+            if len(layout) > 1:
+                with ThreadPoolExecutor(max_workers=min(_TOPIC_WORKERS, len(layout))) as executor:
+                    topics = list(executor.map(self._build_topic, layout))
+            else:
+                topics = [self._build_topic(entry) for entry in layout]
         
         except Exception as e:
             logger.warning(f"Fehler beim Extrahieren von Themen aus dem Dateisystem: {str(e)}")
         
-        return topics 
\ No newline at end of file
+        return topics
+    
+    def _build_topic(self, entry: Tuple[str, List[str], List[Tuple[str, List[str]]]]) -> Dict[str, Any]:
+        """
+        Erstellt ein Thema samt Beiträgen aus einem aufgelisteten Themenverzeichnis.
+        
+        Args:
+            entry: Themenverzeichnis, dessen XML-Dateien und (Beitragsverzeichnis, XML-Dateien)-Paare
+            
+        Returns:
+            Dict mit den Themendaten
+        """
+        topic_dir, xml_files, post_layout = entry
+        # Alle Pfade beginnen mit dem Komponenten-Pfad; relative Pfade entstehen per Slicing
+        prefix_len = len(os.path.join(self.component_path, ''))
+        
+        topic_id = topic_dir.rpartition(os.sep)[2][_TOPIC_PREFIX_LEN:]
+        
+        # Basis-Informationen aus dem Verzeichnisnamen
+        topic_data = {
+            'id': topic_id,
+            'title': f"Thema {topic_id}",
+            'description': f"Aus dem Dateisystem extrahiertes Thema {topic_id}"
+        }
+        
+        # XML-Dateien für weitere Informationen
+        for xml_file in xml_files:
+            if not looks_like_xml(xml_file):
+                continue
+            try:
+                # Titel, Beschreibung, Autor und Datum in einem abbrechbaren Durchlauf
+                self._apply_probe(topic_data, xml_file, _TOPIC_PROBE, _TOPIC_PROBE_FIELDS)
+            except ET.ParseError as e:
+                logger.warning(f"Fehler beim Extrahieren von Informationen aus {xml_file}: {str(e)}")
+        
+        # Suche nach Beiträgen
+        posts = []
+        for post_dir, post_xml_files in post_layout:
+            post_id = post_dir.rpartition(os.sep)[2][_POST_PREFIX_LEN:]
+            
+            # Basis-Informationen aus dem Verzeichnisnamen
+            post_data = {
+                'id': post_id,
+                'title': f"Beitrag {post_id}",
+                'message': f"Aus dem Dateisystem extrahierter Beitrag {post_id}"
+            }
+            
+            # XML-Dateien für weitere Informationen
+            for xml_file in post_xml_files:
+                if not looks_like_xml(xml_file):
+                    continue
+                try:
+                    # Titel, Nachricht, Autor und Datum in einem abbrechbaren Durchlauf
+                    self._apply_probe(post_data, xml_file, _POST_PROBE, _POST_PROBE_FIELDS)
+                except ET.ParseError as e:
+                    logger.warning(f"Fehler beim Extrahieren von Informationen aus {xml_file}: {str(e)}")
+            
+            # Suche nach Anhängen
+            attachments = []
+            # Größe aus DirEntry.stat(); ein fehlendes Verzeichnis fällt beim Öffnen auf,
+            # eine vorherige Existenzprüfung entfällt
+            for filename, file_path, file_size in iter_files(f"{post_dir}{os.sep}attachments", missing_ok=True):
+                attachments.append({
+                    'name': filename,
+                    'size': str(file_size),
+                    'type': _extension(filename),
+                    'path': file_path[prefix_len:]
+                })
+            
+            if attachments:
+                post_data['attachments'] = attachments
+            
+            posts.append(post_data)
+        
+        if posts:
+            topic_data['posts'] = posts
+        
+        return topic_data
+    
+    def _apply_probe(self, data: Dict[str, Any], xml_file: Union[str, bytes], probe: Dict[str, str], fields: frozenset) -> None:
+        """
+        Übernimmt die nicht leeren Texte der ersten Vorkommen der gesuchten Elemente.
+        
+        Die XML wird nur geparst, bis alle gesuchten Elemente gefunden wurden.
+        
+        Args:
+            data: Zu ergänzende Themen- oder Beitragsdaten
+            xml_file: Pfad zur XML-Datei oder deren Inhalt
+            probe: Gesuchte Tags mit ihren Schlüsseln in data
+            fields: Gesuchte Tags als frozenset
+        """
+        found = scan_xml_fields(xml_file, fields)
+        for tag, key in probe.items():
+            text = found.get(tag)
+            if text:
+                data[key] = text
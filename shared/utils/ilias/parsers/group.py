@@ -3,13 +3,26 @@ Parser für ILIAS-Gruppen-Komponenten.
 """
 
 from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
 import logging
 import os
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, _COMPONENT_NAME_RE, compile_path, field_key, find_descendant, find_export_item, looks_like_xml, parse_xml_file
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_GROUP = compile_path('.//Group')
+_XP_ITEM = compile_path('Item')
+_XP_MEMBER = compile_path('Member')
+
+# Basis-Informationen einer Gruppe (direkte Kinder von Group)
+_BASE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate'})
+# Optionale Textfelder von Registrierung und Mitgliedern, jeweils mit einer einmalig
+# vorbereiteten Pfad-Vereinigung gelesen (mit lxml als kompiliertes XPath)
+_REGISTRATION_FIELDS = ('start', 'end', 'password')
+_XP_REGISTRATION_FIELDS = compile_path('Start|End|Password')
+_MEMBER_FIELDS = ('firstname', 'lastname', 'email')
+_XP_MEMBER_FIELDS = compile_path('Firstname|Lastname|Email')
+
 class GroupParser(IliasComponentParser):
     """Parser für ILIAS-Gruppen."""
     
@@ -27,102 +40,41 @@ class GroupParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/Group
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Suche nach Group
-            group_elem = export_item.find('.//Group')
+            group_elem = _XP_GROUP.find(export_item)
             if group_elem is None:
                 # Versuche alternative Pfade
-                group_elem = root.find('.//Group')
+                group_elem = _XP_GROUP.find(root)
                 if group_elem is None:
                     logger.warning("Kein Group-Element gefunden")
                     return self._extract_basic_info()
             
-            # Basis-Informationen
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate']:
-                elem = group_elem.find(field)
-                if elem is not None:
-                    group_data[field.lower()] = self._get_text(elem)
-            
-            # Registrierungseinstellungen
-            registration_elem = group_elem.find('Registration')
-            if registration_elem is not None:
-                registration = {
-                    'type': self._get_attribute(registration_elem, 'type', 'direct'),
-                    'waiting_list': self._get_attribute(registration_elem, 'waiting_list', '0') == '1',
-                    'max_members': self._get_attribute(registration_elem, 'max_members', '0'),
-                    'min_members': self._get_attribute(registration_elem, 'min_members', '0')
-                }
-                
-                # Weitere Registrierungsdetails
-                for field in ['Start', 'End', 'Password']:
-                    elem = registration_elem.find(field)
-                    if elem is not None:
-                        registration[field.lower()] = self._get_text(elem)
-                
-                group_data['registration'] = registration
-            
-            # Container-Einstellungen
-            container_elem = group_elem.find('Container')
-            if container_elem is not None:
-                container_settings = {
-                    'view': self._get_attribute(container_elem, 'view', 'by_type'),
-                    'sorting': self._get_attribute(container_elem, 'sorting', 'title')
-                }
-                
-                # Items im Container
-                items = []
-                items_elem = container_elem.find('Items')
-                if items_elem is not None:
-                    for item_elem in items_elem.findall('Item'):
-                        item_data = {
-                            'ref_id': self._get_attribute(item_elem, 'ref_id', ''),
-                            'type': self._get_attribute(item_elem, 'type', ''),
-                            'title': self._get_text(item_elem)
-                        }
-                        items.append(item_data)
-                
-                if items:
-                    container_settings['items'] = items
-                
-                group_data['container_settings'] = container_settings
+            # Ein Durchlauf über die Kinder des Group-Elements; das erste Vorkommen gewinnt
+            handlers = {
+                'Registration': self._parse_registration,
+                'Container': self._parse_container,
+                'Members': self._parse_members,
+                'Settings': self._parse_settings
+            }
+            handled = set()
+            for child in group_elem:
+                tag = child.tag
+                if tag in _BASE_FIELDS:
+                    group_data.setdefault(field_key(tag), child.text or '')
+                elif tag in handlers and tag not in handled:
+                    handled.add(tag)
+                    handlers[tag](child, group_data)
             
-            # Mitglieder
-            members = []
-            members_elem = group_elem.find('Members')
-            if members_elem is not None:
-                for member_elem in members_elem.findall('Member'):
-                    member_data = {
-                        'id': self._get_attribute(member_elem, 'id', ''),
-                        'login': self._get_attribute(member_elem, 'login', ''),
-                        'role': self._get_attribute(member_elem, 'role', 'member')
-                    }
-                    
-                    # Weitere Mitgliederdetails
-                    for field in ['Firstname', 'Lastname', 'Email']:
-                        elem = member_elem.find(field)
-                        if elem is not None:
-                            member_data[field.lower()] = self._get_text(elem)
-                    
-                    members.append(member_data)
-            
-            if members:
-                group_data['members'] = members
-            
-            # Einstellungen
-            settings_elem = group_elem.find('Settings')
-            if settings_elem is not None:
-                settings = {}
-                for setting_elem in settings_elem:
-                    setting_name = setting_elem.tag
-                    setting_value = self._get_text(setting_elem)
-                    settings[setting_name] = setting_value
-                
-                if settings:
-                    group_data['settings'] = settings
+            if 'items' not in group_data.get('container_settings', {}):
+                # Wenn keine Items in der XML gefunden wurden, versuche sie aus dem Dateisystem zu extrahieren
+                filesystem_items = self._extract_group_structure_from_filesystem().get('container_settings', {}).get('items')
+                if filesystem_items:
+                    group_data.setdefault('container_settings', {})['items'] = filesystem_items
             
             return group_data
         
@@ -130,9 +82,115 @@ class GroupParser(IliasComponentParser):
             logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
             return self._extract_basic_info()
     
+    def _parse_registration(self, registration_elem: ET.Element, group_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Registrierungseinstellungen.
+        
+        Args:
+            registration_elem: Registration-Element
+            group_data: Zu ergänzende Gruppendaten
+        """
+        registration = {
+            'type': self._get_attribute(registration_elem, 'type', 'direct'),
+            'waiting_list': self._get_attribute(registration_elem, 'waiting_list', '0') == '1',
+            'max_members': self._get_attribute(registration_elem, 'max_members', '0'),
+            'min_members': self._get_attribute(registration_elem, 'min_members', '0')
+        }
+        
+        # Weitere Registrierungsdetails
+        fields = self._selected_texts(registration_elem, _XP_REGISTRATION_FIELDS)
+        for field in _REGISTRATION_FIELDS:
+            if field in fields:
+                registration[field] = fields[field]
+        
+        group_data['registration'] = registration
+    
+    def _parse_container(self, container_elem: ET.Element, group_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Container-Einstellungen samt enthaltener Items.
+        
+        Args:
+            container_elem: Container-Element
+            group_data: Zu ergänzende Gruppendaten
+        """
+        container_settings = {
+            'view': self._get_attribute(container_elem, 'view', 'by_type'),
+            'sorting': self._get_attribute(container_elem, 'sorting', 'title')
+        }
+        
+        # Items im Container
+        items = []
+        items_elem = container_elem.find('Items')
+        if items_elem is not None:
+            for item_elem in _XP_ITEM.findall(items_elem):
+                item_data = {
+                    'ref_id': self._get_attribute(item_elem, 'ref_id', ''),
+                    'type': self._get_attribute(item_elem, 'type', ''),
+                    'title': self._get_text(item_elem)
+                }
+                items.append(item_data)
+        
+        if items:
+            container_settings['items'] = items
+        
+        group_data['container_settings'] = container_settings
+    
+    def _parse_members(self, members_elem: ET.Element, group_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Gruppenmitglieder.
+        
+        Args:
+            members_elem: Members-Element
+            group_data: Zu ergänzende Gruppendaten
+        """
+        members = []
+        for member_elem in _XP_MEMBER.findall(members_elem):
+            member_data = {
+                'id': self._get_attribute(member_elem, 'id', ''),
+                'login': self._get_attribute(member_elem, 'login', ''),
+                'role': self._get_attribute(member_elem, 'role', 'member')
+            }
+            
+            # Weitere Mitgliederdetails
+            fields = self._selected_texts(member_elem, _XP_MEMBER_FIELDS)
+            for field in _MEMBER_FIELDS:
+                if field in fields:
+                    member_data[field] = fields[field]
+            
+            members.append(member_data)
+        
+        if members:
+            group_data['members'] = members
+    
+    def _parse_settings(self, settings_elem: ET.Element, group_data: Dict[str, Any]) -> None:
+        """
+        Extrahiert die Gruppeneinstellungen (Schlüssel sind die Tag-Namen).
+        
+        Args:
+            settings_elem: Settings-Element
+            group_data: Zu ergänzende Gruppendaten
+        """
+        settings = {}
+        for setting_elem in settings_elem:
+            settings[setting_elem.tag] = self._get_text(setting_elem)
+        
+        if settings:
+            group_data['settings'] = settings
+    
     def _extract_group_structure_from_filesystem(self) -> Dict[str, Any]:
         """
-        Extrahiert die Gruppenstruktur aus dem Dateisystem.
+        Extrahiert die Gruppenstruktur aus dem Dateisystem (gecacht pro Komponenten-Pfad).
+        
+        Returns:
+            Dict mit Informationen über die Gruppenstruktur
+        """
+        if not self.component_path:
+            return self._extract_basic_info()
+        return self._cached_fs_scan('group_structure', self._scan_group_structure_from_filesystem)
+    
+    def _scan_group_structure_from_filesystem(self) -> Dict[str, Any]:
+        """
+        Durchsucht das Dateisystem ohne Cache (siehe _extract_group_structure_from_filesystem).
         
         Returns:
             Dict mit Informationen über die Gruppenstruktur
@@ -143,44 +201,45 @@ class GroupParser(IliasComponentParser):
             return group_data
         
         try:
-            # Suche nach Unterverzeichnissen, die Komponenten enthalten könnten
+            # Container-Items sind die direkten Unterverzeichnisse; tiefer liegende
+            # Komponenten gehören zu Unter-Containern und werden nicht durchsucht
             container_items = []
-            for root, dirs, files in os.walk(self.component_path):
-                for dir_name in dirs:
-                    if "__" in dir_name:
-                        # Versuche, den Typ aus dem Verzeichnisnamen zu extrahieren
-                        parts = dir_name.split("__")
-                        if len(parts) >= 3:
-                            type_id_parts = parts[2].split("_")
-                            if len(type_id_parts) > 0:
-                                item_type = type_id_parts[0]  # z.B. "grp" aus "grp_6623"
-                                item_id = type_id_parts[1] if len(type_id_parts) > 1 else "unknown"
-                                
-                                # Versuche, den Titel zu extrahieren
-                                item_title = dir_name
-                                item_path = os.path.join(root, dir_name)
-                                
-                                # Suche nach export.xml oder manifest.xml für den Titel
-                                for xml_file in ['export.xml', 'manifest.xml']:
-                                    xml_path = os.path.join(item_path, xml_file)
-                                    if os.path.exists(xml_path):
-                                        try:
-                                            tree = ET.parse(xml_path)
-                                            xml_root = tree.getroot()
-                                            
-                                            # Suche nach dem Titel
-                                            title_elem = xml_root.find(".//Title")
-                                            if title_elem is not None and title_elem.text:
-                                                item_title = title_elem.text
-                                                break
-                                        except Exception as e:
-                                            logger.warning(f"Fehler beim Extrahieren des Titels aus {xml_path}: {str(e)}")
-                                
-                                container_items.append({
-                                    'ref_id': item_id,
-                                    'type': item_type,
-                                    'title': item_title
-                                })
+            with os.scandir(self.component_path) as it:
+                subdirs = [entry for entry in it if entry.is_dir()]
+            for entry in subdirs:
+                dir_name = entry.name
+                # Typ und ID aus dem Verzeichnisnamen, z.B. "grp" und "6623" aus "..__0__grp_6623"
+                match = _COMPONENT_NAME_RE.match(dir_name)
+                if match is None:
+                    continue
+                item_type = match.group(1)
+                item_id = match.group(2) or "unknown"
+                
+                # Versuche, den Titel zu extrahieren
+                item_title = dir_name
+                item_path = entry.path
+                
+                # Suche nach export.xml oder manifest.xml für den Titel
+                for xml_file in ['export.xml', 'manifest.xml']:
+                    xml_path = os.path.join(item_path, xml_file)
+                    # Fehlende oder offensichtlich nicht-XML-Dateien ohne Parser-Ausnahme überspringen
+                    if looks_like_xml(xml_path):
+                        try:
+                            xml_root = parse_xml_file(xml_path)
+                            
+                            # Suche nach dem Titel
+                            title_elem = find_descendant(xml_root, 'Title')
+                            if title_elem is not None and title_elem.text:
+                                item_title = title_elem.text
+                                break
+                        except (ET.ParseError, OSError) as e:
+                            logger.warning(f"Fehler beim Extrahieren des Titels aus {xml_path}: {str(e)}")
+                
+                container_items.append({
+                    'ref_id': item_id,
+                    'type': item_type,
+                    'title': item_title
+                })
             
             if container_items:
                 if 'container_settings' not in group_data:
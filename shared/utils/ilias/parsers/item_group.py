@@ -2,17 +2,112 @@
 Parser für ILIAS-ItemGroup-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Optional
+import copy
+import html
 import logging
-import os
-from .base import IliasComponentParser
+import mmap
+from .base import (IliasComponentParser, ET, LXML_AVAILABLE, NAMESPACES, compile_path,
+                   field_key, find_export_item, iter_files, local_name)
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_DATASET = compile_path('.//ds:DataSet', NAMESPACES)
+_XP_ITGR_REC = compile_path('ds:Rec[@Entity="itgr"]', NAMESPACES)
+_XP_ITGR_ITEM_REC = compile_path('ds:Rec[@Entity="itgr_item"]', NAMESPACES)
+_XP_ITEM_GROUP = compile_path('.//ItemGroup')
+_XP_ITEM = compile_path('Item')
+
+# Basis-Informationen der alten Struktur (direkte Kinder von ItemGroup)
+_BASE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate'})
+# Textfelder eines Items bzw. seines Medienobjekts (alte Struktur)
+_ITEM_FIELDS = frozenset({'Title', 'Description', 'Content'})
+_MEDIA_OBJECT_FIELDS = frozenset({'Title', 'Description', 'Location', 'Format'})
+
+# ds:Rec in Clark-Notation und die ausgewerteten Entities
+_DS_REC_TAG = f"{{{NAMESPACES['ds']}}}Rec"
+_ENTITY_ITGR = 'itgr'
+_ENTITY_ITGR_ITEM = 'itgr_item'
+# Ausgewertete Felder des Itgr-Datensatzes (lokale Namen)
+_ITGR_FIELDS = frozenset({'Id', 'Title', 'Description', 'HideTitle', 'Behaviour'})
+# Ergebnis-Schlüssel nach vollständigem Tag (ggf. mit Namespace); Tags mit Namespace
+# werden beim ersten Auftreten ergänzt, nicht ausgewertete Tags mit None
+_ITGR_KEYS: Dict[str, Optional[str]] = {name: field_key(name) for name in _ITGR_FIELDS}
+_ITGR_ITEM_KEYS: Dict[str, Optional[str]] = {'ItemId': 'item_id', 'ItgrId': 'itgr_id'}
+
+
+def _inner_html(elem: ET.Element) -> str:
+    """
+    Serialisiert den Inhalt eines Elements (Text und Kinder) als HTML ohne das Element selbst.
+    
+    lxml übernimmt beim Serialisieren eines Teilbaums alle im Gültigkeitsbereich
+    liegenden Namespaces (z.B. exp/ds des Exports) in das öffnende Tag; die Kinder
+    werden daher aus einer Kopie ohne ungenutzte Namespaces serialisiert.
+    
+    Args:
+        elem: Element, dessen Inhalt serialisiert wird
+        
+    Returns:
+        HTML-String
+    """
+    if LXML_AVAILABLE and len(elem):
+        elem = copy.deepcopy(elem)
+        ET.cleanup_namespaces(elem)
+    parts = [html.escape(elem.text, quote=False)] if elem.text else []
+    # tostring liefert den Tail jedes Kindes mit
+    parts.extend(ET.tostring(child, encoding='unicode', method='html') for child in elem)
+    return ''.join(parts)
+
+
+def _read_html(path: str, size: int) -> str:
+    """
+    Liest eine HTML-Datei über mmap und dekodiert sie direkt aus dem Mapping.
+    
+    Die Datei wird ohne Zwischenkopie als bytes dekodiert; eine Erkennung der
+    Kodierung findet nicht statt (wie bisher wird UTF-8 angenommen).
+    Zeilenenden werden wie beim Lesen im Textmodus vereinheitlicht.
+    
+    Args:
+        path: Pfad der HTML-Datei
+        size: Dateigröße in Bytes (leere Dateien lassen sich nicht mappen)
+        
+    Returns:
+        Inhalt der Datei
+        
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann
+        UnicodeDecodeError: Wenn die Datei kein gültiges UTF-8 ist
+    """
+    if not size:
+        return ''
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        content = str(m, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _dispatch_key(keys: Dict[str, Optional[str]], tag: str) -> Optional[str]:
+    """
+    Liefert den Ergebnis-Schlüssel für einen noch nicht eingetragenen Tag und trägt ihn ein.
+    
+    Args:
+        keys: Tabelle von Tag zu Ergebnis-Schlüssel
+        tag: Vollständiger Tag-Name
+        
+    Returns:
+        Ergebnis-Schlüssel oder None, wenn der Tag nicht ausgewertet wird
+    """
+    return keys.setdefault(tag, keys.get(local_name(tag)))
+
+
 class ItemGroupParser(IliasComponentParser):
     """Parser für ILIAS-ItemGroup-Komponenten."""
     
+    # DataSet-Datensätze (moderne Exporte) bzw. Items (alte Struktur) wachsen mit der Gruppe
+    STREAM_TAGS = {'Rec': 'DataSet', 'Item': 'Items'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten einer ILIAS-ItemGroup-Komponente.
@@ -27,146 +122,77 @@ class ItemGroupParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/ItemGroup
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Versuche zuerst DataSet-Struktur (moderne ILIAS-Exporte)
-            dataset = export_item.find('.//ds:DataSet', self.namespaces)
+            dataset = _XP_DATASET.find(export_item)
             if dataset is not None:
-                # Extrahiere ItemGroup-Daten aus DataSet (ds:Rec sind direkte Kinder!)
-                for rec in dataset.findall('ds:Rec[@Entity="itgr"]', self.namespaces):
-                    # Itgr kann einen eigenen Namespace haben, daher direkt durch Kinder iterieren
-                    for child in rec:
-                        if child.tag.endswith('Itgr'):
-                            # Durchlaufe alle Kind-Elemente und extrahiere Felder
-                            for elem in child:
-                                tag_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                                if tag_name in ['Id', 'Title', 'Description', 'HideTitle', 'Behaviour']:
-                                    item_group_data[tag_name.lower()] = self._get_text(elem)
-                            break
+                # ds:Rec sind direkte Kinder des DataSet (beim inkrementellen Parsen bereits extrahiert)
+                records = self._stream_records.get('Rec')
+                if records is None:
+                    records = []
+                    # Methoden einmal als lokale Namen binden (LOAD_FAST statt Attributsuche)
+                    append = records.append
+                    parse_itgr_rec = self._parse_itgr_rec
+                    parse_itgr_item_rec = self._parse_itgr_item_rec
+                    for rec in _XP_ITGR_REC.findall(dataset):
+                        append((_ENTITY_ITGR, parse_itgr_rec(rec)))
+                    for rec in _XP_ITGR_ITEM_REC.findall(dataset):
+                        item = parse_itgr_item_rec(rec)
+                        if item is not None:
+                            append((_ENTITY_ITGR_ITEM, item))
                 
-                # Extrahiere Item-Referenzen aus DataSet (ds:Rec sind direkte Kinder!)
                 items = []
-                for rec in dataset.findall('ds:Rec[@Entity="itgr_item"]', self.namespaces):
-                    # ItgrItem kann einen eigenen Namespace haben
-                    for child in rec:
-                        if child.tag.endswith('ItgrItem'):
-                            item_id = None
-                            itgr_id = None
-                            for elem in child:
-                                if elem.tag.endswith('ItemId'):
-                                    item_id = self._get_text(elem)
-                                elif elem.tag.endswith('ItgrId'):
-                                    itgr_id = self._get_text(elem)
-                            
-                            if item_id:
-                                items.append({
-                                    'item_id': item_id,
-                                    'itgr_id': itgr_id,
-                                    'type': 'ref'  # Referenz auf ein anderes Item
-                                })
-                            break
+                append = items.append
+                for entity, record in records:
+                    if entity == _ENTITY_ITGR:
+                        item_group_data.update(record)
+                    else:
+                        append(record)
                 
                 if items:
                     item_group_data['items'] = items
-                    logger.info(f"ItemGroup '{item_group_data.get('title', 'Unbekannt')}' mit {len(items)} Items aus DataSet geparst")
+                    logger.info("ItemGroup '%s' mit %d Items aus DataSet geparst",
+                                item_group_data.get('title', 'Unbekannt'), len(items))
                 
                 return item_group_data
             
             # Fallback: Alte ItemGroup-Struktur
-            item_group = export_item.find('.//ItemGroup')
+            item_group = _XP_ITEM_GROUP.find(export_item)
             if item_group is None:
                 # Versuche alternative Pfade
-                item_group = root.find('.//ItemGroup')
+                item_group = _XP_ITEM_GROUP.find(root)
                 if item_group is None:
                     logger.warning("Kein ItemGroup-Element oder DataSet gefunden")
                     return self._extract_basic_info()
             
             # Basis-Informationen (alte Struktur)
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate']:
-                elem = item_group.find(field)
-                if elem is not None:
-                    item_group_data[field.lower()] = self._get_text(elem)
+            item_group_data.update(self._field_texts(item_group, _BASE_FIELDS))
             
             # Eigenschaften
             properties_elem = item_group.find('Properties')
             if properties_elem is not None:
                 properties = {}
+                get_text = self._get_text
                 for prop_elem in properties_elem:
-                    prop_name = prop_elem.tag
-                    prop_value = self._get_text(prop_elem)
-                    properties[prop_name] = prop_value
+                    properties[prop_elem.tag] = get_text(prop_elem)
                 
                 if properties:
                     item_group_data['properties'] = properties
             
-            # Items extrahieren (alte Struktur)
-            items = []
-            items_elem = item_group.find('Items')
-            
-            if items_elem is not None:
-                for item_elem in items_elem.findall('Item'):
-                    item_data = {
-                        'item_id': self._get_attribute(item_elem, 'id', ''),
-                        'type': self._get_attribute(item_elem, 'type', '')
-                    }
-                    
-                    # Weitere Informationen
-                    for field in ['Title', 'Description', 'Content', 'MediaObject']:
-                        elem = item_elem.find(field)
-                        if elem is not None:
-                            item_data[field.lower()] = self._get_text(elem)
-                    
-                    # Metadaten
-                    metadata_elem = item_elem.find('Metadata')
-                    if metadata_elem is not None:
-                        metadata = {}
-                        for meta_elem in metadata_elem:
-                            metadata[meta_elem.tag] = self._get_text(meta_elem)
-                        if metadata:
-                            item_data['metadata'] = metadata
-                    
-                    # Eigenschaften des Items
-                    item_props_elem = item_elem.find('Properties')
-                    if item_props_elem is not None:
-                        item_props = {}
-                        for prop_elem in item_props_elem:
-                            prop_name = prop_elem.tag
-                            prop_value = self._get_text(prop_elem)
-                            item_props[prop_name] = prop_value
-                        
-                        if item_props:
-                            item_data['properties'] = item_props
-                    
-                    # Medienobjekte
-                    media_elem = item_elem.find('MediaObject')
-                    if media_elem is not None:
-                        media_data = {
-                            'id': self._get_attribute(media_elem, 'id', ''),
-                            'type': self._get_attribute(media_elem, 'type', '')
-                        }
-                        
-                        # Weitere Informationen zum Medienobjekt
-                        for field in ['Title', 'Description', 'Location', 'Format']:
-                            elem = media_elem.find(field)
-                            if elem is not None:
-                                media_data[field.lower()] = self._get_text(elem)
-                        
-                        if media_data:
-                            item_data['media_object'] = media_data
-                    
-                    # Inhalte
-                    content_elem = item_elem.find('Content')
-                    if content_elem is not None:
-                        # Extrahiere den HTML-Inhalt
-                        content_html = ET.tostring(content_elem, encoding='utf-8', method='html').decode('utf-8')
-                        # Entferne das Content-Tag selbst
-                        content_html = content_html.replace('<Content>', '').replace('</Content>', '')
-                        item_data['content_html'] = content_html
-                    
-                    items.append(item_data)
+            # Items extrahieren (alte Struktur, beim inkrementellen Parsen bereits extrahiert)
+            items = self._stream_records.get('Item')
+            if items is None:
+                items = []
+                items_elem = item_group.find('Items')
+                if items_elem is not None:
+                    parse_item = self._parse_item
+                    for item_elem in _XP_ITEM.findall(items_elem):
+                        items.append(parse_item(item_elem))
+                        item_elem.clear()
             
             if items:
                 item_group_data['items'] = items
@@ -184,9 +210,146 @@ class ItemGroupParser(IliasComponentParser):
             return item_group_data
         
         except Exception as e:
-            logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
+            logger.exception("Fehler beim Parsen der XML-Daten: %s", e)
             return self._extract_basic_info()
     
+    def _parse_itgr_rec(self, rec: ET.Element) -> Dict[str, str]:
+        """
+        Extrahiert die Felder der ItemGroup aus einem ds:Rec mit Entity "itgr".
+        
+        Args:
+            rec: ds:Rec-Element
+            
+        Returns:
+            Dict mit den gefundenen Feldern (das letzte Vorkommen gewinnt)
+        """
+        fields = {}
+        keys = _ITGR_KEYS
+        # Itgr kann einen eigenen Namespace haben, daher direkt durch Kinder iterieren
+        for child in rec:
+            if local_name(child.tag) == 'Itgr':
+                # Ein Tabellenzugriff pro Kind-Element liefert den Ergebnis-Schlüssel
+                for elem in child:
+                    tag = elem.tag
+                    key = keys[tag] if tag in keys else _dispatch_key(keys, tag)
+                    if key is not None:
+                        fields[key] = elem.text or ''
+                break
+        return fields
+    
+    def _parse_itgr_item_rec(self, rec: ET.Element) -> Optional[Dict[str, Any]]:
+        """
+        Extrahiert eine Item-Referenz aus einem ds:Rec mit Entity "itgr_item".
+        
+        Args:
+            rec: ds:Rec-Element
+            
+        Returns:
+            Dict mit der Item-Referenz oder None ohne ItemId
+        """
+        # ItgrItem kann einen eigenen Namespace haben
+        for child in rec:
+            if local_name(child.tag) == 'ItgrItem':
+                ids = {'item_id': None, 'itgr_id': None}
+                keys = _ITGR_ITEM_KEYS
+                for elem in child:
+                    tag = elem.tag
+                    key = keys[tag] if tag in keys else _dispatch_key(keys, tag)
+                    if key is not None:
+                        ids[key] = elem.text or ''
+                
+                if ids['item_id']:
+                    ids['type'] = 'ref'  # Referenz auf ein anderes Item
+                    return ids
+                return None
+        return None
+    
+    def _parse_item(self, item_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert ein Item der alten ItemGroup-Struktur.
+        
+        Args:
+            item_elem: Item-Element
+            
+        Returns:
+            Dict mit den Item-Daten
+        """
+        # Methoden einmal als lokale Namen binden (LOAD_FAST statt Attributsuche in den Schleifen)
+        get_text = self._get_text
+        get_attribute = self._get_attribute
+        
+        item_data = {
+            'item_id': get_attribute(item_elem, 'id', ''),
+            'type': get_attribute(item_elem, 'type', '')
+        }
+        
+        # Weitere Informationen
+        item_data.update(self._field_texts(item_elem, _ITEM_FIELDS))
+        
+        # Metadaten
+        metadata_elem = item_elem.find('Metadata')
+        if metadata_elem is not None:
+            metadata = {}
+            for meta_elem in metadata_elem:
+                metadata[meta_elem.tag] = get_text(meta_elem)
+            if metadata:
+                item_data['metadata'] = metadata
+        
+        # Eigenschaften des Items
+        item_props_elem = item_elem.find('Properties')
+        if item_props_elem is not None:
+            item_props = {}
+            for prop_elem in item_props_elem:
+                item_props[prop_elem.tag] = get_text(prop_elem)
+            
+            if item_props:
+                item_data['properties'] = item_props
+        
+        # Medienobjekte
+        media_elem = item_elem.find('MediaObject')
+        if media_elem is not None:
+            media_data = {
+                'id': get_attribute(media_elem, 'id', ''),
+                'type': get_attribute(media_elem, 'type', '')
+            }
+            
+            # Weitere Informationen zum Medienobjekt
+            media_data.update(self._field_texts(media_elem, _MEDIA_OBJECT_FIELDS))
+            
+            if media_data:
+                item_data['media_object'] = media_data
+        
+        # Inhalte
+        content_elem = item_elem.find('Content')
+        if content_elem is not None:
+            # Extrahiere den HTML-Inhalt ohne das Content-Tag selbst
+            item_data['content_html'] = _inner_html(content_elem)
+        
+        return item_data
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Optional[Any]:
+        """
+        Extrahiert DataSet-Datensätze und Items beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: ds:Rec- oder Item-Element
+            
+        Returns:
+            (Entity, Daten) für ds:Rec, Dict für Items oder None für nicht benötigte Datensätze
+        """
+        if tag == 'Item':
+            return self._parse_item(elem)
+        if elem.tag != _DS_REC_TAG:
+            return None
+        entity = elem.get('Entity')
+        if entity == _ENTITY_ITGR:
+            return entity, self._parse_itgr_rec(elem)
+        if entity == _ENTITY_ITGR_ITEM:
+            item = self._parse_itgr_item_rec(elem)
+            return (entity, item) if item is not None else None
+        return None
+    
     def _extract_item_group_from_filesystem(self) -> Dict[str, Any]:
         """
         Extrahiert Informationen über die Item-Gruppe aus dem Dateisystem.
@@ -196,21 +359,17 @@ class ItemGroupParser(IliasComponentParser):
         """
         item_group_data = self._extract_basic_info()
         
-        # Suche nach HTML-Dateien im Komponenten-Pfad
-        html_files = []
-        for root, dirs, files in os.walk(self.component_path):
-            for file in files:
-                if file.lower().endswith('.html'):
-                    html_files.append(os.path.join(root, file))
+        # Suche nach HTML-Dateien im Komponenten-Pfad (Name, Pfad und Größe aus scandir)
+        html_files = [(filename, html_path, size)
+                      for filename, html_path, size in iter_files(self.component_path)
+                      if filename.lower().endswith('.html')]
         
         # Wenn HTML-Dateien gefunden wurden, extrahiere Inhalte
         items = []
-        for i, html_path in enumerate(html_files):
+        for i, (filename, html_path, size) in enumerate(html_files):
             try:
-                with open(html_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = _read_html(html_path, size)
                 
-                filename = os.path.basename(html_path)
                 items.append({
                     'item_id': f'item_{i}',
                     'title': filename,
@@ -218,7 +377,7 @@ class ItemGroupParser(IliasComponentParser):
                     'content_html': content
                 })
             except Exception as e:
-                logger.warning(f"Fehler beim Lesen der HTML-Datei {html_path}: {str(e)}")
+                logger.warning("Fehler beim Lesen der HTML-Datei %s: %s", html_path, e)
         
         if items:
             item_group_data['items'] = items
@@ -2,17 +2,30 @@
 Parser für ILIAS-Learning-Module-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 import os
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, compile_path
 
 logger = logging.getLogger(__name__)
 
+# Direkt unter ContentObject, MetaData bzw. Settings ausgewertete Felder
+_BASE_FIELDS = frozenset({'Title', 'Description'})
+_METADATA_FIELDS = frozenset({'Language', 'Keyword', 'Coverage'})
+_SETTINGS_FIELDS = frozenset({'DefaultLayout', 'PageHeader', 'TOC', 'NumberingEnabled',
+                              'PublicNotes', 'CleanFrames', 'HistoryUserComments'})
+
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_CONTENT_OBJECT = compile_path('.//ContentObject')
+_XP_LEARNING_MODULE = compile_path('.//LearningModule')
+
 class LearningModuleParser(IliasComponentParser):
     """Parser für ILIAS-Learning-Module (Lernmodule)."""
     
+    # Die Seiten mit ihren Inhalten sind direkte Kinder des ContentObject und
+    # machen den Großteil eines Lernmodul-Exports aus
+    STREAM_TAGS = {'PageObject': 'ContentObject'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten eines ILIAS-Learning-Moduls.
@@ -27,82 +40,31 @@ class LearningModuleParser(IliasComponentParser):
         
         try:
             # Suche nach ContentObject (Lernmodul)
-            content_object = self._find_element(root, './/ContentObject')
+            content_object = _XP_CONTENT_OBJECT.find(root)
             if content_object is None:
                 # Alternative Suche
-                content_object = self._find_element(root, './/LearningModule')
+                content_object = _XP_LEARNING_MODULE.find(root)
                 if content_object is None:
                     logger.warning("Kein ContentObject/LearningModule-Element gefunden")
                     return self._extract_basic_info()
             
             # Basis-Informationen
-            for field in ['Title', 'Description']:
-                elem = content_object.find(field)
-                if elem is not None:
-                    lm_data[field.lower()] = self._get_text(elem)
+            lm_data.update(self._field_texts(content_object, _BASE_FIELDS))
             
             # Meta-Daten
             meta_data_elem = content_object.find('MetaData')
             if meta_data_elem is not None:
-                metadata = {}
-                for field in ['Language', 'Keyword', 'Coverage']:
-                    elem = meta_data_elem.find(field)
-                    if elem is not None:
-                        metadata[field.lower()] = self._get_text(elem)
-                
+                metadata = self._field_texts(meta_data_elem, _METADATA_FIELDS)
                 if metadata:
                     lm_data['metadata'] = metadata
             
-            # Struktur-Objekte (Seiten und Kapitel)
-            structure_objects = []
-            for struct_obj in content_object.findall('.//StructureObject'):
-                struct_data = {
-                    'type': self._get_attribute(struct_obj, 'Type', 'st'),
-                    'title': self._get_text(struct_obj.find('Title') if struct_obj.find('Title') is not None else None)
-                }
-                structure_objects.append(struct_data)
-            
-            # Page-Objekte (Seiten mit Inhalten)
-            page_objects = []
-            for page_obj in content_object.findall('.//PageObject'):
-                page_data = {
-                    'title': self._get_text(page_obj.find('Title') if page_obj.find('Title') is not None else None),
-                    'layout': self._get_attribute(page_obj, 'Layout', 'standard')
-                }
-                
-                # MediaObject-Referenzen
-                media_objects = []
-                for media_obj in page_obj.findall('.//MediaObject'):
-                    media_data = {
-                        'alias': self._get_attribute(media_obj, 'Alias', ''),
-                        'type': self._get_attribute(media_obj, 'Type', '')
-                    }
-                    
-                    # MediaItem
-                    media_item = media_obj.find('MediaItem')
-                    if media_item is not None:
-                        media_data['location'] = self._get_attribute(media_item, 'Location', '')
-                        media_data['format'] = self._get_attribute(media_item, 'Format', '')
-                    
-                    media_objects.append(media_data)
-                
-                if media_objects:
-                    page_data['media_objects'] = media_objects
-                
-                # Paragraph-Content
-                paragraphs = []
-                for para in page_obj.findall('.//Paragraph'):
-                    para_data = {
-                        'language': self._get_attribute(para, 'Language', 'de'),
-                        'characteristic': self._get_attribute(para, 'Characteristic', 'Standard'),
-                        'content': self._get_text(para)
-                    }
-                    paragraphs.append(para_data)
-                
-                if paragraphs:
-                    page_data['paragraphs'] = paragraphs
-                
-                page_objects.append(page_data)
+            # Struktur- und Page-Objekte samt Medien und Absätzen in einem Durchlauf
+            # (beim inkrementellen Parsen bereits extrahierte Seiten werden übernommen)
+            streamed_pages = self._stream_records.get('PageObject')
+            structure_objects, page_objects = self._walk_content(
+                content_object,
+                streamed_pages=iter(streamed_pages) if streamed_pages is not None else None
+            )
             
             if structure_objects:
                 lm_data['structure_objects'] = structure_objects
@@ -113,13 +75,7 @@ class LearningModuleParser(IliasComponentParser):
             # Einstellungen
             settings_elem = content_object.find('Settings')
             if settings_elem is not None:
-                settings = {}
-                for field in ['DefaultLayout', 'PageHeader', 'TOC', 'NumberingEnabled', 
-                            'PublicNotes', 'CleanFrames', 'HistoryUserComments']:
-                    elem = settings_elem.find(field)
-                    if elem is not None:
-                        settings[field.lower()] = self._get_text(elem)
-                
+                settings = self._field_texts(settings_elem, _SETTINGS_FIELDS)
                 if settings:
                     lm_data['settings'] = settings
             
@@ -131,6 +87,107 @@ class LearningModuleParser(IliasComponentParser):
             return lm_data
         
         except Exception as e:
-            logger.error(f"Fehler beim Parsen der Learning-Module-XML: {str(e)}")
+            logger.error("Fehler beim Parsen der Learning-Module-XML: %s", e)
             return self._extract_basic_info()
-
+    
+    def _walk_content(self, content_object: ET.Element, include_self: bool = False,
+                      streamed_pages: Optional[Iterator[Dict[str, Any]]] = None
+                      ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Sammelt Struktur-Objekte und Page-Objekte in einem Durchlauf über den Teilbaum.
+        
+        Statt je einer Nachfahren-Suche nach StructureObject, PageObject, MediaObject
+        und Paragraph wird der Baum einmal in Dokumentreihenfolge durchlaufen. Medien
+        und Absätze werden allen sie umschließenden Page-Objekten zugeordnet.
+        
+        Args:
+            content_object: ContentObject- bzw. LearningModule-Element
+            include_self: content_object selbst mit auswerten (z.B. ein einzelnes PageObject)
+            streamed_pages: Bereits extrahierte Seiten für die (geleerten) direkten
+                PageObject-Kinder von content_object
+            
+        Returns:
+            Tupel aus (Struktur-Objekte, Page-Objekte)
+        """
+        get_attribute = self._get_attribute
+        get_text = self._get_text
+        text_of = self._text_of
+        structure_objects = []
+        page_objects = []
+        # Page-Daten mit ihren Medien- und Absatzlisten (werden am Ende nur bei Inhalt übernommen)
+        page_contents = []
+        stack = [(iter((content_object,)) if include_self else iter(content_object), ())]
+        while stack:
+            children, open_pages = stack[-1]
+            elem = next(children, None)
+            if elem is None:
+                stack.pop()
+                continue
+            
+            tag = elem.tag
+            if tag == 'StructureObject':
+                structure_objects.append({
+                    'type': get_attribute(elem, 'Type', 'st'),
+                    'title': text_of(elem, 'Title')
+                })
+            elif tag == 'PageObject' and streamed_pages is not None and len(stack) == 1:
+                page_data = next(streamed_pages, None)
+                if page_data is not None:
+                    page_objects.append(page_data)
+                continue
+            elif tag == 'PageObject':
+                page_data = {
+                    'title': text_of(elem, 'Title'),
+                    'layout': get_attribute(elem, 'Layout', 'standard')
+                }
+                contents = (page_data, [], [])
+                page_objects.append(page_data)
+                page_contents.append(contents)
+                open_pages = open_pages + (contents,)
+            elif tag == 'MediaObject' and open_pages:
+                media_data = {
+                    'alias': get_attribute(elem, 'Alias', ''),
+                    'type': get_attribute(elem, 'Type', '')
+                }
+                
+                # MediaItem
+                media_item = elem.find('MediaItem')
+                if media_item is not None:
+                    media_data['location'] = get_attribute(media_item, 'Location', '')
+                    media_data['format'] = get_attribute(media_item, 'Format', '')
+                
+                for _, media_objects, _ in open_pages:
+                    media_objects.append(media_data)
+            elif tag == 'Paragraph' and open_pages:
+                para_data = {
+                    'language': get_attribute(elem, 'Language', 'de'),
+                    'characteristic': get_attribute(elem, 'Characteristic', 'Standard'),
+                    'content': get_text(elem)
+                }
+                for _, _, paragraphs in open_pages:
+                    paragraphs.append(para_data)
+            
+            if len(elem):
+                stack.append((iter(elem), open_pages))
+        
+        for page_data, media_objects, paragraphs in page_contents:
+            if media_objects:
+                page_data['media_objects'] = media_objects
+            if paragraphs:
+                page_data['paragraphs'] = paragraphs
+        
+        return structure_objects, page_objects
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Optional[Dict[str, Any]]:
+        """
+        Extrahiert eine Seite beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: PageObject-Element
+            
+        Returns:
+            Dict mit den Seitendaten
+        """
+        _, page_objects = self._walk_content(elem, include_self=True)
+        return page_objects[0] if page_objects else None
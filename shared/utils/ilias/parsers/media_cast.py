@@ -2,18 +2,246 @@
 Parser für ILIAS-MediaCast-Komponenten.
 """
 
-from typing import Dict, Any
-import xml.etree.ElementTree as ET
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional, Tuple
+import json
 import logging
 import os
-from .base import IliasComponentParser
-import mimetypes
+import shutil
+import struct
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from .base import (IliasComponentParser, ET, MEDIA_EXTS, compile_path, find_export_item,
+                   guess_mime_type, iter_files)
+from .records import MediaItemRecord
 
 logger = logging.getLogger(__name__)
 
+# Basis-Informationen eines MediaCasts (direkte Kinder von MediaCast)
+_BASE_FIELDS = frozenset({'Title', 'Description', 'Id', 'Owner', 'CreateDate', 'LastUpdate', 'DefaultAccess'})
+# Textfelder eines MediaItems (Tag -> Attribut des Datensatzes)
+_ITEM_FIELDS = {
+    'Title': 'title',
+    'Description': 'description',
+    'Location': 'location',
+    'Format': 'format',
+    'MimeType': 'mimetype',
+    'Duration': 'duration',
+    'Width': 'width',
+    'Height': 'height',
+    'Size': 'size'
+}
+
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_MEDIA_CAST = compile_path('.//MediaCast')
+_XP_MEDIA_ITEM = compile_path('MediaItem')
+
+# Obergrenze gleichzeitig laufender ffprobe-Prozesse
+_PROBE_WORKERS = 8
+
+# Container im ISO-Base-Media-Format, deren Metadaten ohne ffprobe gelesen werden
+_MP4_EXTS = frozenset({'mp4', 'm4v', 'mov'})
+# Obergrenze für die eingelesene moov-Box (Schutz vor defekten Größenangaben)
+_MP4_MAX_MOOV_SIZE = 64 * 1024 * 1024
+# Box-Kopf: Größe (32 Bit, 1 = 64-Bit-Größe folgt, 0 = bis Dateiende) und Typ
+_BOX_HEADER = struct.Struct('>I4s')
+_BOX_LARGE_SIZE = struct.Struct('>Q')
+
+
+def _iter_boxes(data: bytes, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    Durchläuft die Boxen eines Bereichs einer MP4-Box.
+    
+    Args:
+        data: Inhalt der umschließenden Box
+        start: Beginn des Bereichs
+        end: Ende des Bereichs
+        
+    Returns:
+        Iterator über (Box-Typ, Beginn der Nutzdaten, Ende der Box)
+    """
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = _BOX_HEADER.unpack_from(data, pos)
+        header_size = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = _BOX_LARGE_SIZE.unpack_from(data, pos + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size or pos + size > end:
+            return
+        yield box_type, pos + header_size, pos + size
+        pos += size
+
+
+def _read_moov(f: BinaryIO) -> Optional[bytes]:
+    """
+    Sucht die moov-Box auf oberster Ebene und liest ihre Nutzdaten ein.
+    
+    Andere Boxen (insbesondere mdat mit den Mediendaten) werden nur übersprungen.
+    
+    Args:
+        f: Im Binärmodus geöffnete Datei
+        
+    Returns:
+        Nutzdaten der moov-Box oder None
+    """
+    file_size = os.fstat(f.fileno()).st_size
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        size, box_type = _BOX_HEADER.unpack_from(header)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                return None
+            size = _BOX_LARGE_SIZE.unpack_from(header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < header_size:
+            return None
+        if box_type == b'moov':
+            if size > _MP4_MAX_MOOV_SIZE:
+                return None
+            f.seek(pos + header_size)
+            payload = f.read(size - header_size)
+            return payload if len(payload) == size - header_size else None
+        pos += size
+    return None
+
+
+def _read_mp4_info(media_path: str) -> Optional[Dict[str, str]]:
+    """
+    Liest Dauer, Breite und Höhe direkt aus den Boxen einer MP4/MOV-Datei.
+    
+    Die Dauer stammt aus mvhd, Breite und Höhe aus dem tkhd der ersten Spur
+    mit Abmessungen (Audio-Spuren haben Breite und Höhe 0).
+    
+    Args:
+        media_path: Pfad zur Video-Datei
+        
+    Returns:
+        Dict mit den gefundenen Werten ('duration', 'width', 'height') oder None,
+        wenn die Datei keine lesbare moov-Box enthält
+    """
+    try:
+        with open(media_path, 'rb') as f:
+            moov = _read_moov(f)
+    except OSError as e:
+        logger.debug("Fehler beim Lesen der MP4-Datei %s: %s", media_path, e)
+        return None
+    if moov is None:
+        return None
+    
+    info = {}
+    try:
+        for box_type, start, end in _iter_boxes(moov, 0, len(moov)):
+            if box_type == b'mvhd' and 'duration' not in info:
+                # Version 1 mit 64-Bit-Zeitangaben, sonst 32 Bit
+                if moov[start] == 1:
+                    timescale, duration = struct.unpack_from('>IQ', moov, start + 20)
+                else:
+                    timescale, duration = struct.unpack_from('>II', moov, start + 12)
+                if timescale:
+                    # Gleiche Darstellung wie die Dauer von ffprobe
+                    info['duration'] = f'{duration / timescale:.6f}'
+            elif box_type == b'trak' and 'width' not in info:
+                for child_type, child_start, child_end in _iter_boxes(moov, start, end):
+                    if child_type == b'tkhd':
+                        # Breite und Höhe (16.16-Festkomma) bilden das Ende der Box
+                        width, height = struct.unpack_from('>II', moov, child_end - 8)
+                        if width >> 16 and height >> 16:
+                            info['width'] = str(width >> 16)
+                            info['height'] = str(height >> 16)
+                        break
+    except (struct.error, IndexError):
+        return None
+    return info
+
+
+def _probe_video(media_path: str) -> Optional[Dict[str, str]]:
+    """
+    Liest Dauer, Breite und Höhe einer Video-Datei mit ffprobe (JSON-Ausgabe).
+    
+    Args:
+        media_path: Pfad zur Video-Datei
+        
+    Returns:
+        Dict mit den gefundenen Werten ('duration', 'width', 'height') oder None
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_entries',
+             'format=duration:stream=width,height', media_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        if result.returncode != 0:
+            return None
+        probe = json.loads(result.stdout or '{}')
+    except (OSError, ValueError) as e:
+        logger.debug("Fehler beim Extrahieren von Video-Metadaten: %s", e)
+        return None
+    
+    info = {}
+    duration = probe.get('format', {}).get('duration')
+    if duration:
+        info['duration'] = str(duration)
+    # Der erste Stream mit Abmessungen ist der Video-Stream
+    for stream in probe.get('streams', []):
+        if stream.get('width') and stream.get('height'):
+            info['width'] = str(stream['width'])
+            info['height'] = str(stream['height'])
+            break
+    return info
+
+
+def _probe_videos(video_files: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Ermittelt Dauer und Abmessungen mehrerer Video-Dateien.
+    
+    MP4/MOV-Dateien werden direkt gelesen; nur für andere Formate und nicht lesbare
+    Dateien wird ffprobe gestartet, parallel in Threads (diese warten nur auf die
+    Unterprozesse und geben dabei den GIL frei).
+    
+    Args:
+        video_files: Pfade der Video-Dateien
+        
+    Returns:
+        Dict von Pfad zu den gefundenen Metadaten (nur erfolgreich untersuchte Dateien)
+    """
+    video_info = {}
+    remaining = []
+    for media_path in video_files:
+        info = None
+        if media_path.rpartition('.')[2].lower() in _MP4_EXTS:
+            info = _read_mp4_info(media_path)
+        if info:
+            video_info[media_path] = info
+        else:
+            remaining.append(media_path)
+    
+    if not remaining or shutil.which('ffprobe') is None:
+        return video_info
+    with ThreadPoolExecutor(max_workers=min(_PROBE_WORKERS, len(remaining))) as executor:
+        results = executor.map(_probe_video, remaining)
+        video_info.update((path, info) for path, info in zip(remaining, results) if info)
+    return video_info
+
+
 class MediaCastParser(IliasComponentParser):
     """Parser für ILIAS-MediaCast-Komponenten."""
     
+    # Die Liste der MediaItems ist der unbegrenzt große Teil eines MediaCast-Exports
+    STREAM_TAGS = {'MediaItem': 'MediaItems'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten einer ILIAS-MediaCast-Komponente.
@@ -28,71 +256,37 @@ class MediaCastParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/MediaCast
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_media_from_filesystem()
             
             # Suche nach MediaCast oder MediaItems
-            media_cast = export_item.find('.//MediaCast')
+            media_cast = _XP_MEDIA_CAST.find(export_item)
             if media_cast is None:
                 # Versuche alternative Pfade
-                media_cast = root.find('.//MediaCast')
+                media_cast = _XP_MEDIA_CAST.find(root)
                 if media_cast is None:
                     logger.warning("Kein MediaCast-Element gefunden")
                     return self._extract_media_from_filesystem()
             
-            # Basis-Informationen
-            title_elem = media_cast.find('Title')
-            if title_elem is not None:
-                media_data['title'] = self._get_text(title_elem)
-            
-            description_elem = media_cast.find('Description')
-            if description_elem is not None:
-                media_data['description'] = self._get_text(description_elem)
-            
-            # Weitere Metadaten extrahieren
-            for field in ['Id', 'Owner', 'CreateDate', 'LastUpdate', 'DefaultAccess']:
-                elem = media_cast.find(field)
-                if elem is not None:
-                    media_data[field.lower()] = self._get_text(elem)
-            
-            # MediaItems extrahieren
-            media_items = []
-            items_elem = media_cast.find('MediaItems')
+            # Basis-Informationen und weitere Metadaten in einem Durchlauf über die Kinder
+            media_data.update(self._field_texts(media_cast, _BASE_FIELDS))
             
-            if items_elem is not None:
-                for item_elem in items_elem.findall('MediaItem'):
-                    item_data = {
-                        'id': self._get_attribute(item_elem, 'id', ''),
-                        'format': self._get_attribute(item_elem, 'format', '')
-                    }
-                    
-                    # Weitere Informationen
-                    for field in ['Title', 'Description', 'Location', 'Format', 'MimeType', 'Duration', 'Width', 'Height', 'Size']:
-                        elem = item_elem.find(field)
-                        if elem is not None:
-                            item_data[field.lower()] = self._get_text(elem)
-                    
-                    # Lokation und Typ
-                    location_elem = item_elem.find('Location')
-                    if location_elem is not None:
-                        item_data['location'] = self._get_text(location_elem)
-                        item_data['location_type'] = self._get_attribute(location_elem, 'type', 'file')
-                    
-                    # Metadaten
-                    metadata_elem = item_elem.find('Metadata')
-                    if metadata_elem is not None:
-                        metadata = {}
-                        for meta_elem in metadata_elem:
-                            metadata[meta_elem.tag] = self._get_text(meta_elem)
-                        if metadata:
-                            item_data['metadata'] = metadata
-                    
-                    media_items.append(item_data)
+            # MediaItems extrahieren (beim inkrementellen Parsen bereits extrahiert)
+            media_items = self._stream_records.get('MediaItem')
+            if media_items is None:
+                media_items = []
+                items_elem = media_cast.find('MediaItems')
+                if items_elem is not None:
+                    parse_media_item = self._parse_media_item
+                    for item_elem in _XP_MEDIA_ITEM.findall(items_elem):
+                        media_items.append(parse_media_item(item_elem))
+                        item_elem.clear()
             
             if media_items:
-                media_data['media_items'] = media_items
+                # Erst an der Schnittstelle in Dicts umwandeln
+                media_data['media_items'] = [item.to_dict() for item in media_items]
             else:
                 logger.warning("Keine MediaItems gefunden")
                 # Suche nach Mediendateien im Dateisystem
@@ -103,9 +297,65 @@ class MediaCastParser(IliasComponentParser):
             return media_data
         
         except Exception as e:
-            logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
+            logger.exception("Fehler beim Parsen der XML-Daten: %s", e)
             return self._extract_media_from_filesystem()
     
+    def _parse_media_item(self, item_elem: ET.Element) -> MediaItemRecord:
+        """
+        Extrahiert ein MediaItem.
+        
+        Args:
+            item_elem: MediaItem-Element
+            
+        Returns:
+            Datensatz des MediaItems
+        """
+        item = MediaItemRecord(
+            id=self._get_attribute(item_elem, 'id', ''),
+            format=self._get_attribute(item_elem, 'format', '')
+        )
+        
+        # Textfelder, Lokationstyp und Metadaten in einem Durchlauf über die Kinder;
+        # jeweils das erste Vorkommen gewinnt
+        seen = set()
+        metadata_elem = None
+        item_field = _ITEM_FIELDS.get
+        for child in item_elem:
+            tag = child.tag
+            key = item_field(tag)
+            if key is not None:
+                if tag not in seen:
+                    seen.add(tag)
+                    setattr(item, key, child.text or '')
+                    if tag == 'Location':
+                        item.location_type = self._get_attribute(child, 'type', 'file')
+            elif tag == 'Metadata' and metadata_elem is None:
+                metadata_elem = child
+        
+        # Metadaten
+        if metadata_elem is not None:
+            metadata = {}
+            get_text = self._get_text
+            for meta_elem in metadata_elem:
+                metadata[meta_elem.tag] = get_text(meta_elem)
+            if metadata:
+                item.metadata = metadata
+        
+        return item
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> MediaItemRecord:
+        """
+        Extrahiert MediaItems beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: MediaItem-Element
+            
+        Returns:
+            Datensatz des MediaItems
+        """
+        return self._parse_media_item(elem)
+    
     def _extract_media_from_filesystem(self) -> Dict[str, Any]:
         """
         Extrahiert Mediendateien aus dem Dateisystem.
@@ -119,59 +369,37 @@ class MediaCastParser(IliasComponentParser):
             return media_data
         
         try:
-            # Suche nach Mediendateien im Komponenten-Pfad
+            # Ein scandir-Durchlauf liefert Name, Pfad und Größe (ohne weiteres stat())
             media_files = []
-            for root, dirs, files in os.walk(self.component_path):
-                for file in files:
-                    # Ignoriere XML-Dateien und versteckte Dateien
-                    if file.endswith('.xml') or file.startswith('.'):
-                        continue
-                    
-                    # Mediendateien
-                    if file.lower().endswith(('.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv')):
-                        media_files.append(os.path.join(root, file))
+            for filename, media_path, file_size in iter_files(self.component_path):
+                # Ignoriere versteckte Dateien (XML-Dateien fallen über die Endung heraus)
+                if filename.startswith('.'):
+                    continue
+                
+                # Mediendateien: eine Mengenabfrage auf die Endung
+                _, dot, ext = filename.lower().rpartition('.')
+                if dot and ext in MEDIA_EXTS:
+                    media_files.append((filename, media_path, file_size))
             
             if not media_files:
-                logger.warning(f"Keine Mediendateien im Komponenten-Pfad gefunden: {self.component_path}")
+                logger.warning("Keine Mediendateien im Komponenten-Pfad gefunden: %s", self.component_path)
                 return media_data
             
             # Verwende den Dateinamen als Titel
-            component_title = os.path.basename(media_files[0])
-            media_data['title'] = component_title
+            media_data['title'] = media_files[0][0]
+            
+            # Typen einmal bestimmen (pro Endung gecacht); Videos werden anschließend
+            # gesammelt untersucht
+            mime_types = {media_path: guess_mime_type(filename)
+                          for filename, media_path, _ in media_files}
+            video_files = [media_path for media_path, mime_type in mime_types.items()
+                           if mime_type and mime_type.startswith('video/')]
+            video_info = _probe_videos(video_files)
             
             # Füge Mediendateien zu den Daten hinzu
             media_items = []
-            for media_path in media_files:
-                filename = os.path.basename(media_path)
-                mime_type, encoding = mimetypes.guess_type(media_path)
-                file_size = os.path.getsize(media_path)
-                
-                # Versuche, weitere Metadaten zu extrahieren
-                duration = None
-                width = None
-                height = None
-                
-                # Für Video-Dateien versuche, Dauer, Breite und Höhe zu ermitteln
-                if mime_type and mime_type.startswith('video/'):
-                    try:
-                        import subprocess
-                        # Verwende ffprobe, falls verfügbar
-                        result = subprocess.run(
-                            ['ffprobe', '-v', 'error', '-show_entries', 
-                             'format=duration:stream=width,height', '-of', 
-                             'default=noprint_wrappers=1:nokey=1', media_path],
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True
-                        )
-                        if result.returncode == 0:
-                            lines = result.stdout.strip().split('\n')
-                            if len(lines) >= 3:
-                                duration = lines[0]
-                                width = lines[1]
-                                height = lines[2]
-                    except Exception as e:
-                        logger.debug(f"Fehler beim Extrahieren von Video-Metadaten: {str(e)}")
+            for filename, media_path, file_size in media_files:
+                mime_type = mime_types[media_path]
                 
                 item_data = {
                     'title': filename,
@@ -181,20 +409,16 @@ class MediaCastParser(IliasComponentParser):
                     'size': str(file_size)
                 }
                 
-                if duration:
-                    item_data['duration'] = duration
-                if width:
-                    item_data['width'] = width
-                if height:
-                    item_data['height'] = height
+                # Dauer, Breite und Höhe von Video-Dateien (sofern ffprobe verfügbar ist)
+                item_data.update(video_info.get(media_path, {}))
                 
                 media_items.append(item_data)
             
             media_data['media_items'] = media_items
-            logger.info(f"Mediendaten aus Dateisystem extrahiert: {len(media_items)} Dateien gefunden")
+            logger.info("Mediendaten aus Dateisystem extrahiert: %d Dateien gefunden", len(media_items))
             
             return media_data
         
         except Exception as e:
-            logger.warning(f"Fehler beim Extrahieren von Mediendaten aus dem Dateisystem: {str(e)}")
+            logger.warning("Fehler beim Extrahieren von Mediendaten aus dem Dateisystem: %s", e)
             return media_data 
\ No newline at end of file
@@ -2,17 +2,30 @@
 Parser für ILIAS-Media-Pool-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Union
 import logging
 import os
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, compile_path, find_export_item
+from .records import MediaItemRecord
 
 logger = logging.getLogger(__name__)
 
+# Basis-Informationen eines Media-Pools (direkte Kinder von MediaPool)
+_BASE_FIELDS = frozenset({'Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate'})
+# Textfelder eines MediaItems (direkte Kinder von MediaItem)
+_ITEM_FIELDS = frozenset({'Title', 'Location', 'Width', 'Height', 'Duration', 'Size'})
+
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_MEDIA_POOL = compile_path('.//MediaPool')
+_XP_MEDIA_ITEM = compile_path('MediaItem')
+_XP_FOLDER = compile_path('Folder')
+
 class MediaPoolParser(IliasComponentParser):
     """Parser für ILIAS-Media-Pools."""
     
+    # MediaItems und Ordner sind die unbegrenzt großen Teile eines Media-Pool-Exports
+    STREAM_TAGS = {'MediaItem': 'MediaItems', 'Folder': 'Folders'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten eines ILIAS-Media-Pools.
@@ -27,60 +40,47 @@ class MediaPoolParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/MediaPool
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Suche nach MediaPool
-            media_pool_elem = export_item.find('.//MediaPool')
+            media_pool_elem = _XP_MEDIA_POOL.find(export_item)
             if media_pool_elem is None:
                 # Versuche alternative Pfade
-                media_pool_elem = root.find('.//MediaPool')
+                media_pool_elem = _XP_MEDIA_POOL.find(root)
                 if media_pool_elem is None:
                     logger.warning("Kein MediaPool-Element gefunden")
                     return self._extract_basic_info()
             
             # Basis-Informationen
-            for field in ['Id', 'Title', 'Description', 'Owner', 'CreateDate', 'LastUpdate']:
-                elem = media_pool_elem.find(field)
-                if elem is not None:
-                    media_pool_data[field.lower()] = self._get_text(elem)
+            media_pool_data.update(self._field_texts(media_pool_elem, _BASE_FIELDS))
             
-            # Media-Items
-            media_items = []
-            media_items_elem = media_pool_elem.find('MediaItems')
-            if media_items_elem is not None:
-                for item_elem in media_items_elem.findall('MediaItem'):
-                    item_data = {
-                        'id': self._get_attribute(item_elem, 'id', ''),
-                        'title': self._get_text(item_elem.find('Title') if item_elem.find('Title') is not None else None),
-                        'type': self._get_attribute(item_elem, 'type', ''),
-                        'format': self._get_attribute(item_elem, 'format', ''),
-                        'location': self._get_text(item_elem.find('Location') if item_elem.find('Location') is not None else None)
-                    }
-                    
-                    # Weitere Metadaten
-                    for field in ['Width', 'Height', 'Duration', 'Size']:
-                        elem = item_elem.find(field)
-                        if elem is not None:
-                            item_data[field.lower()] = self._get_text(elem)
-                    
-                    media_items.append(item_data)
+            # Media-Items (beim inkrementellen Parsen bereits extrahiert)
+            media_items = self._stream_records.get('MediaItem')
+            if media_items is None:
+                media_items = []
+                media_items_elem = media_pool_elem.find('MediaItems')
+                if media_items_elem is not None:
+                    parse_media_item = self._parse_media_item
+                    for item_elem in _XP_MEDIA_ITEM.findall(media_items_elem):
+                        media_items.append(parse_media_item(item_elem))
+                        item_elem.clear()
             
             if media_items:
-                media_pool_data['media_items'] = media_items
+                # Erst an der Schnittstelle in Dicts umwandeln
+                media_pool_data['media_items'] = [item.to_dict() for item in media_items]
             
-            # Folder-Struktur
-            folders = []
-            folders_elem = media_pool_elem.find('Folders')
-            if folders_elem is not None:
-                for folder_elem in folders_elem.findall('Folder'):
-                    folder_data = {
-                        'id': self._get_attribute(folder_elem, 'id', ''),
-                        'title': self._get_text(folder_elem.find('Title') if folder_elem.find('Title') is not None else None)
-                    }
-                    folders.append(folder_data)
+            # Folder-Struktur (beim inkrementellen Parsen bereits extrahiert)
+            folders = self._stream_records.get('Folder')
+            if folders is None:
+                folders = []
+                folders_elem = media_pool_elem.find('Folders')
+                if folders_elem is not None:
+                    parse_folder = self._parse_folder
+                    for folder_elem in _XP_FOLDER.findall(folders_elem):
+                        folders.append(parse_folder(folder_elem))
             
             if folders:
                 media_pool_data['folders'] = folders
@@ -93,6 +93,60 @@ class MediaPoolParser(IliasComponentParser):
             return media_pool_data
         
         except Exception as e:
-            logger.error(f"Fehler beim Parsen der Media-Pool-XML: {str(e)}")
+            logger.error("Fehler beim Parsen der Media-Pool-XML: %s", e)
             return self._extract_basic_info()
-
+    
+    def _parse_media_item(self, item_elem: ET.Element) -> MediaItemRecord:
+        """
+        Extrahiert ein MediaItem.
+        
+        Args:
+            item_elem: MediaItem-Element
+            
+        Returns:
+            Datensatz des MediaItems
+        """
+        # Titel, Lokation und weitere Metadaten in einem Durchlauf über die Kinder
+        fields = self._field_texts(item_elem, _ITEM_FIELDS)
+        get_attribute = self._get_attribute
+        return MediaItemRecord(
+            id=get_attribute(item_elem, 'id', ''),
+            title=fields.get('title', ''),
+            type=get_attribute(item_elem, 'type', ''),
+            format=get_attribute(item_elem, 'format', ''),
+            location=fields.get('location', ''),
+            width=fields.get('width'),
+            height=fields.get('height'),
+            duration=fields.get('duration'),
+            size=fields.get('size')
+        )
+    
+    def _parse_folder(self, folder_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert einen Ordner.
+        
+        Args:
+            folder_elem: Folder-Element
+            
+        Returns:
+            Dict mit den Ordnerdaten
+        """
+        return {
+            'id': self._get_attribute(folder_elem, 'id', ''),
+            'title': self._text_of(folder_elem, 'Title')
+        }
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Union[MediaItemRecord, Dict[str, Any]]:
+        """
+        Extrahiert MediaItems und Ordner beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: MediaItem- oder Folder-Element
+            
+        Returns:
+            Datensatz des MediaItems bzw. Dict mit den Ordnerdaten
+        """
+        if tag == 'MediaItem':
+            return self._parse_media_item(elem)
+        return self._parse_folder(elem)
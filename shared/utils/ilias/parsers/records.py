@@ -0,0 +1,126 @@
+"""
+Datensätze für Aufgaben, Einreichungen, Dateien und MediaItems der ILIAS-Parser.
+
+Große Übungs-Exporte enthalten tausende Einreichungen mit jeweils mehreren
+Dateien, MediaCasts und Media-Pools entsprechend viele MediaItems. Als
+Dataclasses mit __slots__ belegen diese Datensätze deutlich weniger Speicher
+als gleich aufgebaute Dicts und sind schneller erzeugt.
+Erst an der Schnittstelle (Rückgabe von parse()) werden sie mit to_dict()
+in die bisherigen Dicts umgewandelt.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class FileRecord:
+    """Datei einer Aufgabe oder Einreichung."""
+    
+    name: str
+    size: str
+    type: str
+    path: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Konvertiert die Datei zu einem Dictionary."""
+        return {
+            'name': self.name,
+            'size': self.size,
+            'type': self.type,
+            'path': self.path
+        }
+
+
+@dataclass(slots=True)
+class SubmissionRecord:
+    """Einreichung eines Benutzers; nicht ermittelte Felder (None) fehlen in to_dict()."""
+    
+    id: str
+    user_id: str
+    date: Optional[str] = None
+    status: Optional[str] = None
+    feedback: Optional[str] = None
+    grade: Optional[str] = None
+    files: List[FileRecord] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Konvertiert die Einreichung zu einem Dictionary."""
+        data = {'id': self.id, 'user_id': self.user_id}
+        for key, value in (('date', self.date), ('status', self.status),
+                           ('feedback', self.feedback), ('grade', self.grade)):
+            if value is not None:
+                data[key] = value
+        if self.files:
+            data['files'] = [file.to_dict() for file in self.files]
+        return data
+
+
+@dataclass(slots=True)
+class AssignmentRecord:
+    """Aufgabe einer Übung; nicht ermittelte Felder (None) fehlen in to_dict()."""
+    
+    id: str
+    title: str
+    description: str
+    type: Optional[str] = None
+    startdate: Optional[str] = None
+    enddate: Optional[str] = None
+    submissiondate: Optional[str] = None
+    details: Optional[Dict[str, str]] = None
+    files: List[FileRecord] = field(default_factory=list)
+    submissions: List[SubmissionRecord] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Konvertiert die Aufgabe samt Dateien und Einreichungen zu einem Dictionary."""
+        data = {'id': self.id, 'title': self.title, 'description': self.description}
+        for key, value in (('type', self.type), ('startdate', self.startdate),
+                           ('enddate', self.enddate), ('submissiondate', self.submissiondate)):
+            if value is not None:
+                data[key] = value
+        if self.details:
+            data['details'] = self.details
+        if self.files:
+            data['files'] = [file.to_dict() for file in self.files]
+        if self.submissions:
+            data['submissions'] = [submission.to_dict() for submission in self.submissions]
+        return data
+
+
+@dataclass(slots=True)
+class MediaItemRecord:
+    """
+    MediaItem eines MediaCasts oder Media-Pools.
+    
+    Nicht ermittelte Felder (None) fehlen in to_dict().
+    """
+    
+    id: str
+    format: str
+    title: Optional[str] = None
+    type: Optional[str] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    location_type: Optional[str] = None
+    mimetype: Optional[str] = None
+    duration: Optional[str] = None
+    width: Optional[str] = None
+    height: Optional[str] = None
+    size: Optional[str] = None
+    metadata: Optional[Dict[str, str]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Konvertiert das MediaItem zu einem Dictionary."""
+        data = {'id': self.id, 'format': self.format}
+        for key, value in (('title', self.title), ('type', self.type),
+                           ('description', self.description),
+                           ('location', self.location),
+                           ('location_type', self.location_type),
+                           ('mimetype', self.mimetype),
+                           ('duration', self.duration), ('width', self.width),
+                           ('height', self.height), ('size', self.size)):
+            if value is not None:
+                data[key] = value
+        if self.metadata:
+            data['metadata'] = self.metadata
+        return data
@@ -2,14 +2,39 @@
 Parser für ILIAS-Test-Komponenten.
 """
 
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Optional
 import logging
-import os
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, compile_path, find_export_item, iter_files, parse_xml_files
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_TEST = compile_path('.//Test')
+_XP_QTI = compile_path('.//questestinterop')
+_XP_ASSESSMENT = compile_path('.//assessment')
+_XP_QTI_METADATA = compile_path('.//qtimetadata')
+_XP_QTI_METADATA_FIELD = compile_path('.//qtimetadatafield')
+_XP_ITEM = compile_path('.//item')
+_XP_PRESENTATION = compile_path('.//presentation')
+_XP_MATERIAL = compile_path('.//material')
+_XP_MATTEXT = compile_path('.//mattext')
+_XP_RESPONSE_LID = compile_path('.//response_lid')
+_XP_RENDER_CHOICE = compile_path('.//render_choice')
+_XP_RESPONSE_LABEL = compile_path('.//response_label')
+_XP_RESPROCESSING = compile_path('.//resprocessing')
+_XP_RESPCONDITION = compile_path('.//respcondition')
+_XP_VAREQUAL = compile_path('.//varequal')
+
+# Direkte Kinder einer Frage, die per Text übernommen werden (Tag -> Schlüssel)
+_QUESTION_FIELD_KEYS = {
+    'Title': 'title',
+    'Description': 'description',
+    'Author': 'author',
+    'Points': 'points',
+    'QuestionText': 'question_text'
+}
+_QUESTION_CHILDREN = frozenset(_QUESTION_FIELD_KEYS) | {'Answers', 'Feedback'}
+
 class TestParser(IliasComponentParser):
     """Parser für ILIAS-Tests."""
     
@@ -27,19 +52,19 @@ class TestParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/Test
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Suche nach Test oder QTI-Daten
-            test_elem = export_item.find('.//Test')
+            test_elem = _XP_TEST.find(export_item)
             if test_elem is None:
                 # Versuche alternative Pfade
-                test_elem = root.find('.//Test')
+                test_elem = _XP_TEST.find(root)
                 if test_elem is None:
                     # Versuche QTI-Daten zu finden
-                    qti_elem = root.find('.//questestinterop')
+                    qti_elem = _XP_QTI.find(root)
                     if qti_elem is not None:
                         return self._parse_qti(qti_elem)
                     
@@ -66,7 +91,7 @@ class TestParser(IliasComponentParser):
             mark_steps = []
             marks_elem = test_elem.find('MarkSteps')
             if marks_elem is not None:
-                for mark_elem in marks_elem.findall('MarkStep'):
+                for mark_elem in marks_elem.iterfind('MarkStep'):
                     mark_data = {
                         'short_name': self._get_attribute(mark_elem, 'short_name', ''),
                         'percentage': self._get_attribute(mark_elem, 'percentage', ''),
@@ -81,7 +106,7 @@ class TestParser(IliasComponentParser):
             questions = []
             questions_elem = test_elem.find('Questions')
             if questions_elem is not None:
-                for question_elem in questions_elem.findall('Question'):
+                for question_elem in questions_elem.iterfind('Question'):
                     question_data = self._parse_question(question_elem)
                     if question_data:
                         questions.append(question_data)
@@ -119,32 +144,32 @@ class TestParser(IliasComponentParser):
             'type': self._get_attribute(question_elem, 'type', '')
         }
         
-        # Basis-Informationen
-        for field in ['Title', 'Description', 'Author', 'Points']:
-            elem = question_elem.find(field)
-            if elem is not None:
-                question_data[field.lower()] = self._get_text(elem)
+        # Alle benötigten Kinder in einem Durchlauf
+        children = self._index_children(question_elem, _QUESTION_CHILDREN)
+        get_text = self._get_text
         
-        # Fragetext
-        question_text_elem = question_elem.find('QuestionText')
-        if question_text_elem is not None:
-            question_data['question_text'] = self._get_text(question_text_elem)
+        # Basis-Informationen und Fragetext
+        for tag, key in _QUESTION_FIELD_KEYS.items():
+            elem = children.get(tag)
+            if elem is not None:
+                question_data[key] = get_text(elem)
         
         # Antwortoptionen
         answers = []
-        answers_elem = question_elem.find('Answers')
+        answers_elem = children.get('Answers')
         if answers_elem is not None:
-            for answer_elem in answers_elem.findall('Answer'):
+            get_attribute = self._get_attribute
+            for answer_elem in answers_elem.iterfind('Answer'):
                 answer_data = {
-                    'id': self._get_attribute(answer_elem, 'id', ''),
-                    'points': self._get_attribute(answer_elem, 'points', '0'),
-                    'correct': self._get_attribute(answer_elem, 'correct', '0') == '1'
+                    'id': get_attribute(answer_elem, 'id', ''),
+                    'points': get_attribute(answer_elem, 'points', '0'),
+                    'correct': get_attribute(answer_elem, 'correct', '0') == '1'
                 }
                 
                 # Antworttext
                 text_elem = answer_elem.find('Text')
                 if text_elem is not None:
-                    answer_data['text'] = self._get_text(text_elem)
+                    answer_data['text'] = get_text(text_elem)
                 
                 answers.append(answer_data)
         
@@ -152,9 +177,9 @@ class TestParser(IliasComponentParser):
             question_data['answers'] = answers
         
         # Feedback
-        feedback_elem = question_elem.find('Feedback')
+        feedback_elem = children.get('Feedback')
         if feedback_elem is not None:
-            question_data['feedback'] = self._get_text(feedback_elem)
+            question_data['feedback'] = get_text(feedback_elem)
         
         return question_data
     
@@ -171,15 +196,15 @@ class TestParser(IliasComponentParser):
         qti_data = {}
         
         # Assessment
-        assessment_elem = qti_elem.find('.//assessment')
+        assessment_elem = _XP_ASSESSMENT.find(qti_elem)
         if assessment_elem is not None:
             qti_data['title'] = self._get_attribute(assessment_elem, 'title', '')
             
             # Metadaten
             metadata = {}
-            metadata_elem = assessment_elem.find('.//qtimetadata')
+            metadata_elem = _XP_QTI_METADATA.find(assessment_elem)
             if metadata_elem is not None:
-                for field_elem in metadata_elem.findall('.//qtimetadatafield'):
+                for field_elem in _XP_QTI_METADATA_FIELD.findall(metadata_elem):
                     label_elem = field_elem.find('fieldlabel')
                     entry_elem = field_elem.find('fieldentry')
                     if label_elem is not None and entry_elem is not None:
@@ -190,55 +215,54 @@ class TestParser(IliasComponentParser):
             
             # Fragen
             questions = []
-            for item_elem in assessment_elem.findall('.//item'):
+            get_attribute = self._get_attribute
+            get_text = self._get_text
+            material_text = self._material_text
+            for item_elem in _XP_ITEM.findall(assessment_elem):
                 question_data = {
-                    'id': self._get_attribute(item_elem, 'ident', ''),
-                    'title': self._get_attribute(item_elem, 'title', '')
+                    'id': get_attribute(item_elem, 'ident', ''),
+                    'title': get_attribute(item_elem, 'title', '')
                 }
                 
                 # Fragetext
-                presentation_elem = item_elem.find('.//presentation')
-                if presentation_elem is not None:
-                    material_elem = presentation_elem.find('.//material')
-                    if material_elem is not None:
-                        mattext_elem = material_elem.find('.//mattext')
-                        if mattext_elem is not None:
-                            question_data['question_text'] = self._get_text(mattext_elem)
-                
-                # Antwortoptionen
+                presentation_elem = _XP_PRESENTATION.find(item_elem)
                 answers = []
-                response_elem = presentation_elem.find('.//response_lid') if presentation_elem is not None else None
-                if response_elem is not None:
-                    for render_choice in response_elem.findall('.//render_choice'):
-                        for response_label in render_choice.findall('.//response_label'):
-                            answer_data = {
-                                'id': self._get_attribute(response_label, 'ident', '')
-                            }
-                            
-                            material_elem = response_label.find('.//material')
-                            if material_elem is not None:
-                                mattext_elem = material_elem.find('.//mattext')
-                                if mattext_elem is not None:
-                                    answer_data['text'] = self._get_text(mattext_elem)
-                            
-                            answers.append(answer_data)
+                if presentation_elem is not None:
+                    question_text = material_text(presentation_elem)
+                    if question_text is not None:
+                        question_data['question_text'] = question_text
+                    
+                    # Antwortoptionen
+                    response_elem = _XP_RESPONSE_LID.find(presentation_elem)
+                    if response_elem is not None:
+                        for render_choice in _XP_RENDER_CHOICE.findall(response_elem):
+                            for response_label in _XP_RESPONSE_LABEL.findall(render_choice):
+                                answer_data = {
+                                    'id': get_attribute(response_label, 'ident', '')
+                                }
+                                
+                                answer_text = material_text(response_label)
+                                if answer_text is not None:
+                                    answer_data['text'] = answer_text
+                                
+                                answers.append(answer_data)
                 
                 if answers:
                     question_data['answers'] = answers
                 
-                # Richtige Antworten
-                resprocessing_elem = item_elem.find('.//resprocessing')
+                # Richtige Antworten; die letzte Bedingung mit varequal entscheidet
+                resprocessing_elem = _XP_RESPROCESSING.find(item_elem)
                 if resprocessing_elem is not None:
-                    for respcondition in resprocessing_elem.findall('.//respcondition'):
-                        varequal_elem = respcondition.find('.//varequal')
+                    correct_answer = None
+                    for respcondition in _XP_RESPCONDITION.findall(resprocessing_elem):
+                        varequal_elem = _XP_VAREQUAL.find(respcondition)
                         if varequal_elem is not None:
-                            correct_answer = self._get_text(varequal_elem)
-                            # Markiere die richtige Antwort
-                            for answer in answers:
-                                if answer.get('id') == correct_answer:
-                                    answer['correct'] = True
-                                else:
-                                    answer['correct'] = False
+                            correct_answer = get_text(varequal_elem)
+                    
+                    # Markiere die richtige Antwort
+                    if correct_answer is not None:
+                        for answer in answers:
+                            answer['correct'] = answer.get('id') == correct_answer
                 
                 questions.append(question_data)
             
@@ -247,6 +271,24 @@ class TestParser(IliasComponentParser):
         
         return qti_data
     
+    def _material_text(self, elem: ET.Element) -> Optional[str]:
+        """
+        Liest den mattext des ersten material-Elements unterhalb von elem.
+        
+        Args:
+            elem: presentation- oder response_label-Element
+            
+        Returns:
+            Text oder None, falls kein material/mattext vorhanden ist
+        """
+        material_elem = _XP_MATERIAL.find(elem)
+        if material_elem is None:
+            return None
+        mattext_elem = _XP_MATTEXT.find(material_elem)
+        if mattext_elem is None:
+            return None
+        return self._get_text(mattext_elem)
+    
     def _extract_qti_from_filesystem(self) -> List[Dict[str, Any]]:
         """
         Extrahiert QTI-Daten aus dem Dateisystem.
@@ -262,19 +304,19 @@ class TestParser(IliasComponentParser):
         try:
             # Suche nach QTI-Dateien im Komponenten-Pfad
             qti_files = []
-            for root, dirs, files in os.walk(self.component_path):
-                for file in files:
-                    if file.lower().endswith('.xml') and ('qti' in file.lower() or 'assessment' in file.lower()):
-                        qti_files.append(os.path.join(root, file))
+            for file, file_path, _ in iter_files(self.component_path):
+                name = file.lower()
+                if name.endswith('.xml') and ('qti' in name or 'assessment' in name):
+                    qti_files.append(file_path)
             
-            # Parse QTI-Dateien
-            for qti_path in qti_files:
+            # Parse QTI-Dateien (parallel, Auswertung in Fundreihenfolge, sobald geparst)
+            for qti_path, (root, error) in parse_xml_files(qti_files):
                 try:
-                    tree = ET.parse(qti_path)
-                    root = tree.getroot()
+                    if error is not None:
+                        raise error
                     
                     # Suche nach QTI-Daten
-                    qti_elem = root.find('.//questestinterop')
+                    qti_elem = _XP_QTI.find(root)
                     if qti_elem is not None:
                         qti_data = self._parse_qti(qti_elem)
                         if 'questions' in qti_data:
@@ -3,17 +3,52 @@ Parser für ILIAS-Wiki-Komponenten.
 """
 
 from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
 import logging
 import os
 import glob
-from .base import IliasComponentParser
+from .base import IliasComponentParser, ET, compile_path, find_export_item, iter_files, parse_xml_files
 
 logger = logging.getLogger(__name__)
 
+# Einmalig vorbereitete Pfade (mit lxml als kompiliertes XPath)
+_XP_WIKI = compile_path('.//Wiki')
+_XP_TITLE = compile_path('.//Title')
+_XP_CONTENT = compile_path('.//Content')
+_XP_AUTHOR = compile_path('.//Author')
+_XP_CREATE_DATE = compile_path('.//CreateDate')
+_XP_IS_STARTPAGE = compile_path('.//IsStartpage')
+_XP_COMMENT = compile_path('.//Comment')
+
+# Direkte Kinder von Page, Version und Attachment (Tag -> Schlüssel im Ergebnis)
+_PAGE_FIELD_KEYS = {
+    'Title': 'title',
+    'Content': 'content',
+    'Author': 'author',
+    'CreateDate': 'create_date',
+    'LastUpdate': 'last_update',
+    'IsStartpage': 'is_startpage'
+}
+_VERSION_FIELD_KEYS = {
+    'Number': 'number',
+    'Content': 'content',
+    'Author': 'author',
+    'CreateDate': 'create_date',
+    'Comment': 'comment'
+}
+_ATTACHMENT_FIELD_KEYS = {
+    'Name': 'name',
+    'Size': 'size',
+    'Type': 'type',
+    'Path': 'path'
+}
+_PAGE_LISTS = frozenset({'Versions', 'Attachments'})
+
 class WikiParser(IliasComponentParser):
     """Parser für ILIAS-Wikis."""
     
+    # Die Seiten (samt Versionen) sind der unbegrenzt große Teil eines Wiki-Exports
+    STREAM_TAGS = {'Page': 'Pages'}
+    
     def _parse_xml(self, root: ET.Element) -> Dict[str, Any]:
         """
         Parst die XML-Daten eines ILIAS-Wikis.
@@ -28,16 +63,16 @@ class WikiParser(IliasComponentParser):
         
         try:
             # Suche nach ExportItem/Wiki
-            export_item = self._find_element(root, './/exp:ExportItem', self.namespaces)
+            export_item = find_export_item(root)
             if export_item is None:
                 logger.warning("Kein ExportItem-Element gefunden")
                 return self._extract_basic_info()
             
             # Suche nach Wiki
-            wiki_elem = export_item.find('.//Wiki')
+            wiki_elem = _XP_WIKI.find(export_item)
             if wiki_elem is None:
                 # Versuche alternative Pfade
-                wiki_elem = root.find('.//Wiki')
+                wiki_elem = _XP_WIKI.find(root)
                 if wiki_elem is None:
                     logger.warning("Kein Wiki-Element gefunden")
                     return self._extract_basic_info()
@@ -60,56 +95,15 @@ class WikiParser(IliasComponentParser):
                 if settings:
                     wiki_data['settings'] = settings
             
-            # Wiki-Seiten
-            pages = []
-            pages_elem = wiki_elem.find('Pages')
-            if pages_elem is not None:
-                for page_elem in pages_elem.findall('Page'):
-                    page_data = {
-                        'id': self._get_attribute(page_elem, 'id', ''),
-                        'title': self._get_text(page_elem.find('Title')),
-                        'content': self._get_text(page_elem.find('Content')),
-                        'author': self._get_text(page_elem.find('Author')),
-                        'create_date': self._get_text(page_elem.find('CreateDate')),
-                        'last_update': self._get_text(page_elem.find('LastUpdate')),
-                        'is_startpage': self._get_text(page_elem.find('IsStartpage')) == '1'
-                    }
-                    
-                    # Versionen
-                    versions = []
-                    versions_elem = page_elem.find('Versions')
-                    if versions_elem is not None:
-                        for version_elem in versions_elem.findall('Version'):
-                            version_data = {
-                                'id': self._get_attribute(version_elem, 'id', ''),
-                                'number': self._get_text(version_elem.find('Number')),
-                                'content': self._get_text(version_elem.find('Content')),
-                                'author': self._get_text(version_elem.find('Author')),
-                                'create_date': self._get_text(version_elem.find('CreateDate')),
-                                'comment': self._get_text(version_elem.find('Comment'))
-                            }
-                            versions.append(version_data)
-                    
-                    if versions:
-                        page_data['versions'] = versions
-                    
-                    # Anhänge
-                    attachments = []
-                    attachments_elem = page_elem.find('Attachments')
-                    if attachments_elem is not None:
-                        for attachment_elem in attachments_elem.findall('Attachment'):
-                            attachment_data = {
-                                'name': self._get_text(attachment_elem.find('Name')),
-                                'size': self._get_text(attachment_elem.find('Size')),
-                                'type': self._get_text(attachment_elem.find('Type')),
-                                'path': self._get_text(attachment_elem.find('Path'))
-                            }
-                            attachments.append(attachment_data)
-                    
-                    if attachments:
-                        page_data['attachments'] = attachments
-                    
-                    pages.append(page_data)
+            # Wiki-Seiten (beim inkrementellen Parsen bereits extrahiert)
+            pages = self._stream_records.get('Page')
+            if pages is None:
+                pages = []
+                pages_elem = wiki_elem.find('Pages')
+                if pages_elem is not None:
+                    for page_elem in pages_elem.iterfind('Page'):
+                        pages.append(self._parse_page(page_elem))
+                        page_elem.clear()
             
             if pages:
                 wiki_data['pages'] = pages
@@ -125,6 +119,60 @@ class WikiParser(IliasComponentParser):
             logger.exception(f"Fehler beim Parsen der XML-Daten: {str(e)}")
             return self._extract_basic_info()
     
+    def _parse_page(self, page_elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert eine Wiki-Seite samt Versionen und Anhängen.
+        
+        Args:
+            page_elem: Page-Element
+            
+        Returns:
+            Dict mit den Seitendaten
+        """
+        page_data = {'id': self._get_attribute(page_elem, 'id', '')}
+        page_data.update(self._keyed_texts(page_elem, _PAGE_FIELD_KEYS))
+        page_data['is_startpage'] = page_data['is_startpage'] == '1'
+        children = self._index_children(page_elem, _PAGE_LISTS)
+        get_attribute = self._get_attribute
+        keyed_texts = self._keyed_texts
+        
+        # Versionen
+        versions = []
+        versions_elem = children.get('Versions')
+        if versions_elem is not None:
+            for version_elem in versions_elem.iterfind('Version'):
+                version_data = {'id': get_attribute(version_elem, 'id', '')}
+                version_data.update(keyed_texts(version_elem, _VERSION_FIELD_KEYS))
+                versions.append(version_data)
+        
+        if versions:
+            page_data['versions'] = versions
+        
+        # Anhänge
+        attachments = []
+        attachments_elem = children.get('Attachments')
+        if attachments_elem is not None:
+            for attachment_elem in attachments_elem.iterfind('Attachment'):
+                attachments.append(keyed_texts(attachment_elem, _ATTACHMENT_FIELD_KEYS))
+        
+        if attachments:
+            page_data['attachments'] = attachments
+        
+        return page_data
+    
+    def _handle_stream_element(self, tag: str, elem: ET.Element) -> Dict[str, Any]:
+        """
+        Extrahiert Wiki-Seiten beim inkrementellen Parsen.
+        
+        Args:
+            tag: Lokaler Name des Elements
+            elem: Page-Element
+            
+        Returns:
+            Dict mit den Seitendaten
+        """
+        return self._parse_page(elem)
+    
     def _extract_pages_from_filesystem(self) -> List[Dict[str, Any]]:
         """
         Extrahiert Wiki-Seiteninformationen aus dem Dateisystem.
@@ -138,10 +186,26 @@ class WikiParser(IliasComponentParser):
             return pages
         
         try:
-            # Suche nach Seitenverzeichnissen
-            page_dirs = glob.glob(os.path.join(self.component_path, "page_*"))
+            # Zuerst alle Seiten- und Versionsverzeichnisse auflisten, damit die
+            # XML-Dateien gesammelt und parallel geparst werden können
+            layout = []
+            xml_paths = []
+            for page_dir in glob.glob(os.path.join(self.component_path, "page_*")):
+                page_xml_files = glob.glob(os.path.join(page_dir, "*.xml"))
+                xml_paths.extend(page_xml_files)
+                version_layout = []
+                for version_dir in glob.glob(os.path.join(page_dir, "version_*")):
+                    version_xml_files = glob.glob(os.path.join(version_dir, "*.xml"))
+                    xml_paths.extend(version_xml_files)
+                    version_layout.append((version_dir, version_xml_files))
+                layout.append((page_dir, page_xml_files, version_layout))
+            # Die Bäume kommen in der Reihenfolge von xml_paths an, also genau in der
+            # Reihenfolge, in der sie unten abgeholt werden; jeder wird nach der
+            # Auswertung verworfen
+            parsed = parse_xml_files(xml_paths)
             
-            for page_dir in page_dirs:
+            # Ergebnisse in der Reihenfolge der Verzeichnisse zusammenführen
+            for page_dir, page_xml_files, version_layout in layout:
                 page_id = os.path.basename(page_dir).replace("page_", "")
                 
                 # Basis-Informationen aus dem Verzeichnisnamen
@@ -151,33 +215,33 @@ class WikiParser(IliasComponentParser):
                     'content': f"Aus dem Dateisystem extrahierte Seite {page_id}"
                 }
                 
-                # Suche nach XML-Dateien für weitere Informationen
-                xml_files = glob.glob(os.path.join(page_dir, "*.xml"))
-                for xml_file in xml_files:
+                # Geparste XML-Dateien für weitere Informationen
+                for xml_file in page_xml_files:
                     try:
-                        tree = ET.parse(xml_file)
-                        xml_root = tree.getroot()
+                        _, (xml_root, error) = next(parsed)
+                        if error is not None:
+                            raise error
                         
                         # Suche nach Titel und Inhalt
-                        title_elem = xml_root.find(".//Title")
+                        title_elem = _XP_TITLE.find(xml_root)
                         if title_elem is not None and title_elem.text:
                             page_data['title'] = title_elem.text
                         
-                        content_elem = xml_root.find(".//Content")
+                        content_elem = _XP_CONTENT.find(xml_root)
                         if content_elem is not None and content_elem.text:
                             page_data['content'] = content_elem.text
                         
                         # Suche nach Autor und Datum
-                        author_elem = xml_root.find(".//Author")
+                        author_elem = _XP_AUTHOR.find(xml_root)
                         if author_elem is not None and author_elem.text:
                             page_data['author'] = author_elem.text
                         
-                        create_date_elem = xml_root.find(".//CreateDate")
+                        create_date_elem = _XP_CREATE_DATE.find(xml_root)
                         if create_date_elem is not None and create_date_elem.text:
                             page_data['create_date'] = create_date_elem.text
                         
                         # Prüfe, ob es sich um die Startseite handelt
-                        is_startpage_elem = xml_root.find(".//IsStartpage")
+                        is_startpage_elem = _XP_IS_STARTPAGE.find(xml_root)
                         if is_startpage_elem is not None and is_startpage_elem.text:
                             page_data['is_startpage'] = is_startpage_elem.text == '1'
                     
@@ -186,9 +250,7 @@ class WikiParser(IliasComponentParser):
                 
                 # Suche nach Versionen
                 versions = []
-                version_dirs = glob.glob(os.path.join(page_dir, "version_*"))
-                
-                for version_dir in version_dirs:
+                for version_dir, version_xml_files in version_layout:
                     version_id = os.path.basename(version_dir).replace("version_", "")
                     
                     # Basis-Informationen aus dem Verzeichnisnamen
@@ -198,29 +260,29 @@ class WikiParser(IliasComponentParser):
                         'content': f"Aus dem Dateisystem extrahierte Version {version_id}"
                     }
                     
-                    # Suche nach XML-Dateien für weitere Informationen
-                    xml_files = glob.glob(os.path.join(version_dir, "*.xml"))
-                    for xml_file in xml_files:
+                    # Geparste XML-Dateien für weitere Informationen
+                    for xml_file in version_xml_files:
                         try:
-                            tree = ET.parse(xml_file)
-                            xml_root = tree.getroot()
+                            _, (xml_root, error) = next(parsed)
+                            if error is not None:
+                                raise error
                             
                             # Suche nach Inhalt
-                            content_elem = xml_root.find(".//Content")
+                            content_elem = _XP_CONTENT.find(xml_root)
                             if content_elem is not None and content_elem.text:
                                 version_data['content'] = content_elem.text
                             
                             # Suche nach Autor und Datum
-                            author_elem = xml_root.find(".//Author")
+                            author_elem = _XP_AUTHOR.find(xml_root)
                             if author_elem is not None and author_elem.text:
                                 version_data['author'] = author_elem.text
                             
-                            create_date_elem = xml_root.find(".//CreateDate")
+                            create_date_elem = _XP_CREATE_DATE.find(xml_root)
                             if create_date_elem is not None and create_date_elem.text:
                                 version_data['create_date'] = create_date_elem.text
                             
                             # Suche nach Kommentar
-                            comment_elem = xml_root.find(".//Comment")
+                            comment_elem = _XP_COMMENT.find(xml_root)
                             if comment_elem is not None and comment_elem.text:
                                 version_data['comment'] = comment_elem.text
                         
@@ -235,19 +297,16 @@ class WikiParser(IliasComponentParser):
                 # Suche nach Anhängen
                 attachments = []
                 attachment_dir = os.path.join(page_dir, "attachments")
-                if os.path.exists(attachment_dir):
-                    for root, _, filenames in os.walk(attachment_dir):
-                        for filename in filenames:
-                            file_path = os.path.join(root, filename)
-                            file_size = os.path.getsize(file_path)
-                            file_type = os.path.splitext(filename)[1][1:]  # Entferne den Punkt
-                            
-                            attachments.append({
-                                'name': filename,
-                                'size': str(file_size),
-                                'type': file_type,
-                                'path': os.path.relpath(file_path, self.component_path)
-                            })
+                # Die Größe stammt aus dem scandir-Eintrag, ohne weiteres stat()
+                for filename, file_path, file_size in iter_files(attachment_dir, missing_ok=True):
+                    file_type = os.path.splitext(filename)[1][1:]  # Entferne den Punkt
+                    
+                    attachments.append({
+                        'name': filename,
+                        'size': str(file_size),
+                        'type': file_type,
+                        'path': os.path.relpath(file_path, self.component_path)
+                    })
                 
                 if attachments:
                     page_data['attachments'] = attachments
@@ -0,0 +1,943 @@
+"""
+Tests für die ILIAS-Komponenten-Parser.
+"""
+
+import os
+import pytest
+import tempfile
+import shutil
+
+from shared.utils.ilias.parsers.base import IliasComponentParser
+from shared.utils.ilias.parsers.course import CourseParser
+
+
+@pytest.fixture
+def temp_component_dir():
+    """Erstellt ein temporäres Komponenten-Verzeichnis im ILIAS-Namensschema."""
+    temp_dir = tempfile.mkdtemp()
+    component_dir = os.path.join(temp_dir, '1695736035__0__crs_6623')
+    os.makedirs(component_dir)
+    yield component_dir
+    shutil.rmtree(temp_dir)
+
+
+def _write(path, content):
+    """Schreibt eine Datei und legt fehlende Verzeichnisse an."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def test_basic_info_from_directory_name(temp_component_dir):
+    """Test: Typ und ID werden aus dem Verzeichnisnamen gelesen."""
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info == {"id": "6623", "title": "Unbekannt", "type": "crs"}
+
+
+def test_basic_info_title_from_description_file(temp_component_dir):
+    """Test: Eine Beschreibungsdatei hat Vorrang vor export.xml."""
+    _write(os.path.join(temp_component_dir, 'sub', 'title.txt'), 'Mein Titel\n')
+    _write(os.path.join(temp_component_dir, 'Modules', 'export.xml'),
+           '<Export><Title>XML-Titel</Title></Export>')
+
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info["title"] == "Mein Titel"
+
+
+def test_basic_info_title_from_export_xml(temp_component_dir):
+    """Test: Der Titel wird aus einer verschachtelten export.xml gelesen."""
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'),
+           '<Export xmlns:x="urn:x"><x:Title>Namespaced</x:Title></Export>')
+
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info["title"] == "Namespaced"
+
+
+def test_basic_info_media_files(temp_component_dir):
+    """Test: Mediendateien werden als media_items übernommen."""
+    _write(os.path.join(temp_component_dir, 'a', 'clip.mp4'), 'x')
+    _write(os.path.join(temp_component_dir, 'a', '.hidden.mp4'), 'x')
+    _write(os.path.join(temp_component_dir, 'skript.pdf'), 'x')
+
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info["title"] == "clip.mp4"
+    assert info["media_items"] == [
+        {"location": "clip.mp4", "format": "video/mp4", "location_type": "file"}
+    ]
+
+
+def test_basic_info_document_file(temp_component_dir):
+    """Test: Ohne Medien wird die erste Dokumentdatei verwendet."""
+    _write(os.path.join(temp_component_dir, 'skript.pdf'), 'abc')
+
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info["title"] == "skript.pdf"
+    assert info["filename"] == "skript.pdf"
+    assert info["size"] == "3"
+    assert info["type"] == "application/pdf"
+
+
+COURSE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<exp:Export xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1" Entity="crs">
+  <exp:ExportItem Id="6623">
+    <Course>
+      <Id>6623</Id>
+      <Title>Testkurs</Title>
+      <Description>Beschreibung</Description>
+      <Settings>
+        <Syllabus>Inhalte</Syllabus>
+        <ContactName>Max</ContactName>
+      </Settings>
+      <Activation type="limited">
+        <Start>2025-01-01</Start>
+        <End>2025-12-31</End>
+      </Activation>
+      <Container view="simple" sorting="manual">
+        <Items>
+          <Item ref_id="1" type="fold">Ordner</Item>
+          <Item ref_id="2" type="file">Datei</Item>
+        </Items>
+      </Container>
+      <Registration type="password" waiting_list="1" max_members="10"/>
+      <Members>
+        <Member id="7" login="max" role="admin"/>
+      </Members>
+    </Course>
+  </exp:ExportItem>
+</exp:Export>
+"""
+
+
+def test_course_parser(temp_component_dir):
+    """Test: Der CourseParser extrahiert Basisdaten, Einstellungen und Listen."""
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'), COURSE_XML)
+
+    data = CourseParser(temp_component_dir).parse()
+
+    assert data["id"] == "6623"
+    assert data["title"] == "Testkurs"
+    assert data["description"] == "Beschreibung"
+    assert data["settings"] == {"syllabus": "Inhalte", "contactname": "Max"}
+    assert data["activation"] == {"type": "limited", "start": "2025-01-01", "end": "2025-12-31"}
+    assert data["container_settings"] == {
+        "view": "simple",
+        "sorting": "manual",
+        "items": [
+            {"ref_id": "1", "type": "fold", "title": "Ordner"},
+            {"ref_id": "2", "type": "file", "title": "Datei"},
+        ],
+    }
+    assert data["registration"] == {
+        "type": "password", "waiting_list": True, "max_members": "10", "min_members": "0"
+    }
+    assert data["members"] == [{"id": "7", "login": "max", "role": "admin"}]
+
+
+def test_find_first_returns_first_walk_match(temp_component_dir):
+    """Test: _find_first liefert den ersten Treffer in der Reihenfolge von os.walk."""
+    _write(os.path.join(temp_component_dir, 'a', 'b', 'export.xml'), '<x/>')
+    _write(os.path.join(temp_component_dir, 'z', 'export.xml'), '<x/>')
+
+    parser = IliasComponentParser(temp_component_dir)
+    first_walk_match = next(os.path.join(root, 'export.xml')
+                            for root, dirs, files in os.walk(temp_component_dir)
+                            if 'export.xml' in files)
+
+    assert parser._find_first('export.xml') == first_walk_match
+    assert parser._find_first('missing.xml') is None
+
+
+def test_course_parser_streaming_matches_tree_parse(temp_component_dir, monkeypatch):
+    """Test: Inkrementelles Parsen liefert dieselben Kursdaten wie ET.parse."""
+    from shared.utils.ilias.parsers import base
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'), COURSE_XML)
+    expected = CourseParser(temp_component_dir).parse()
+
+    monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    parser = CourseParser(temp_component_dir)
+    streamed = parser.parse()
+
+    assert streamed == expected
+    assert len(parser._stream_records['Item']) == 2
+
+
+def test_basic_info_is_cached_per_instance(temp_component_dir):
+    """Test: _extract_basic_info wird pro Instanz nur einmal berechnet."""
+    parser = IliasComponentParser(temp_component_dir)
+    first = parser._extract_basic_info()
+    first["title"] = "Geändert"
+
+    # Neue Dateien werden nach dem ersten Aufruf nicht mehr berücksichtigt
+    _write(os.path.join(temp_component_dir, 'title.txt'), 'Später')
+
+    assert parser._extract_basic_info()["title"] == "Unbekannt"
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_course_parser_default_namespace(temp_component_dir, monkeypatch, stream):
+    """Test: Kurs-Elemente in einem Default-Namespace werden gefunden."""
+    from shared.utils.ilias.parsers import base
+
+    if stream:
+        monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    xml = COURSE_XML.replace('<Course>', '<Course xmlns="http://www.ilias.de/Modules/Course/crs/4_1">')
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'), xml)
+
+    parser = CourseParser(temp_component_dir)
+    data = parser.parse()
+
+    assert data["title"] == "Testkurs"
+    assert data["container_settings"]["items"][0] == {"ref_id": "1", "type": "fold", "title": "Ordner"}
+    assert data["members"] == [{"id": "7", "login": "max", "role": "admin"}]
+    assert ('Member' in parser._stream_records) == stream
+
+
+def test_hidden_directories_are_skipped(temp_component_dir):
+    """Test: Versteckte Verzeichnisse werden nicht durchsucht."""
+    _write(os.path.join(temp_component_dir, '.git', 'export.xml'), '<Export><Title>Git</Title></Export>')
+    _write(os.path.join(temp_component_dir, '.cache', 'clip.mp4'), 'x')
+
+    parser = IliasComponentParser(temp_component_dir)
+
+    assert parser._find_first('export.xml') is None
+    assert parser._extract_basic_info()["title"] == "Unbekannt"
+
+
+def test_file_names_without_extension_are_not_media(temp_component_dir):
+    """Test: Ein Dateiname ohne Punkt (z.B. 'mp4') gilt nicht als Endung."""
+    _write(os.path.join(temp_component_dir, 'mp4'), 'x')
+    _write(os.path.join(temp_component_dir, 'pdf'), 'x')
+
+    info = IliasComponentParser(temp_component_dir)._extract_basic_info()
+
+    assert info["title"] == "Unbekannt"
+    assert "media_items" not in info
+
+
+def test_basic_info_copies_are_independent(temp_component_dir):
+    """Test: Änderungen an einem Ergebnis von _extract_basic_info wirken nicht auf spätere."""
+    _write(os.path.join(temp_component_dir, 'video.mp4'), 'x')
+    parser = IliasComponentParser(temp_component_dir)
+
+    first = parser._extract_basic_info()
+    first["media_items"].append({"title": "fremd"})
+
+    assert len(parser._extract_basic_info()["media_items"]) == 1
+
+
+def test_find_first_uses_scan_order(temp_component_dir):
+    """Test: parse() und _extract_basic_info wählen dieselbe export.xml (Reihenfolge von os.walk)."""
+    # Mehrere tiefe Treffer und ein flacher: eine Breitensuche fände meist einen anderen
+    for sub in ('a/tief', 'b/tief', 'c/tief', 'd/tief', 'e/tief', 'f/tief', 'flach'):
+        _write(os.path.join(temp_component_dir, sub, 'export.xml'), '<x/>')
+    parser = IliasComponentParser(temp_component_dir)
+    walk_order = [os.path.join(root, 'export.xml')
+                  for root, dirs, files in os.walk(temp_component_dir) if 'export.xml' in files]
+
+    assert parser._find_first('export.xml') == walk_order[0]
+    assert parser._scan_component()["export"] == walk_order
+
+
+def test_package_import_does_not_load_parser_modules():
+    """Test: Der Import des ILIAS-Pakets lädt die Parser-Module erst bei Bedarf."""
+    import subprocess
+    import sys
+
+    code = ("import sys, shared.utils.ilias; "
+            "from shared.utils.ilias import ParserFactory; "
+            "assert 'shared.utils.ilias.parsers.course' not in sys.modules; "
+            "ParserFactory.get_parser_class('crs'); "
+            "assert 'shared.utils.ilias.parsers.course' in sys.modules; "
+            "assert 'shared.utils.ilias.parsers.wiki' not in sys.modules")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+
+
+def test_parse_components_in_parallel(temp_component_dir):
+    """Test: parse_components liefert die Ergebnisse in Eingabereihenfolge."""
+    from shared.utils.ilias.factory import parse_components
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'), COURSE_XML)
+
+    results = parse_components([
+        ('crs', temp_component_dir),
+        ('unbekannt', temp_component_dir),
+        ('crs', temp_component_dir),
+    ], max_workers=2)
+
+    assert results[0][0]["title"] == "Testkurs"
+    assert results[0][1] is None
+    assert results[1] == (None, None)
+    assert results[2] == results[0]
+
+
+def test_parse_components_returns_error_for_failed_parser(temp_component_dir):
+    """Test: Komponenten, deren Parser fehlschlägt, liefern die Fehlermeldung statt leerer Daten."""
+    from shared.utils.ilias.factory import parse_components
+
+    class FailingParser(IliasComponentParser):
+        def parse(self, xml_path=None):
+            raise RuntimeError("kaputt")
+
+    results = parse_components([('kaputt', temp_component_dir)], parser_map={'kaputt': FailingParser})
+
+    (data, error), = results
+    assert data is None
+    assert error.startswith(f"Fehler beim Parsen der Komponente {temp_component_dir}: kaputt")
+    assert "RuntimeError" in error
+
+
+def test_analyzer_logs_parser_failures(temp_component_dir, monkeypatch, caplog):
+    """Test: Parser-Fehler erscheinen im Analyzer-Logger, die Komponente wird übersprungen."""
+    from shared.utils.ilias.analyzer import IliasAnalyzer
+    from shared.utils.ilias.factory import ParserFactory
+
+    class FailingParser(IliasComponentParser):
+        def parse(self, xml_path=None):
+            raise RuntimeError("kaputt")
+
+    _write(os.path.join(temp_component_dir, 'manifest.xml'), '<Manifest MainEntity="kaputt" Title="T"/>')
+    monkeypatch.setitem(ParserFactory._parsers, 'kaputt', FailingParser)
+    analyzer = IliasAnalyzer(os.path.dirname(temp_component_dir))
+
+    with caplog.at_level('ERROR', logger='shared.utils.ilias.analyzer'):
+        analyzer._analyze_components([temp_component_dir])
+
+    assert analyzer.components == []
+    assert any(record.name == 'shared.utils.ilias.analyzer' and 'kaputt' in record.getMessage()
+               for record in caplog.records)
+
+
+def test_parse_components_process_pool_is_opt_in(temp_component_dir):
+    """Test: Ein Prozess-Pool wird nur mit max_workers genutzt; nicht picklebare Parser fallen zurück."""
+    from shared.utils.ilias import factory
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml'), COURSE_XML)
+    jobs = [('crs', temp_component_dir)] * factory._PARALLEL_MIN_JOBS
+
+    class LocalParser(CourseParser):
+        pass
+
+    sequential = factory.parse_components(jobs)
+    pooled = factory.parse_components(jobs, max_workers=2)
+    fallback = factory.parse_components(jobs, parser_map={'crs': LocalParser}, max_workers=2)
+
+    assert [data["title"] for data, error in sequential] == ["Testkurs"] * len(jobs)
+    assert pooled == sequential
+    assert fallback == sequential
+
+
+EXERCISE_XML = """<?xml version="1.0" encoding="utf-8"?>
+<exp:Export xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1" Entity="exc">
+  <exp:ExportItem Id="5">
+    <Exercise>
+      <Id>5</Id>
+      <Title>Übung</Title>
+      <Settings>
+        <PassMode>all</PassMode>
+      </Settings>
+      <Assignments>
+        <Assignment id="a1">
+          <Title>Aufgabe 1</Title>
+          <StartDate>2025-01-01</StartDate>
+          <Details>
+            <MaxFile>3</MaxFile>
+          </Details>
+          <Files>
+            <File><Name>blatt.pdf</Name><Size>12</Size></File>
+          </Files>
+          <Submissions>
+            <Submission id="s1" user_id="7">
+              <Status>passed</Status>
+              <Files>
+                <File><Name>loesung.pdf</Name></File>
+              </Files>
+            </Submission>
+          </Submissions>
+        </Assignment>
+      </Assignments>
+    </Exercise>
+  </exp:ExportItem>
+</exp:Export>
+"""
+
+
+def test_exercise_parser(temp_component_dir):
+    """Test: Der ExerciseParser extrahiert Aufgaben, Dateien und Einreichungen."""
+    from shared.utils.ilias.parsers.exercise import ExerciseParser
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Exercise', 'set_1', 'export.xml'), EXERCISE_XML)
+
+    data = ExerciseParser(temp_component_dir).parse()
+
+    assert data["id"] == "5"
+    assert data["title"] == "Übung"
+    assert data["settings"] == {"passmode": "all"}
+    assignment = data["assignments"][0]
+    assert assignment["id"] == "a1"
+    assert assignment["title"] == "Aufgabe 1"
+    assert assignment["startdate"] == "2025-01-01"
+    assert assignment["details"] == {"maxfile": "3"}
+    assert assignment["files"] == [{"name": "blatt.pdf", "size": "12", "type": "", "path": ""}]
+    submission = assignment["submissions"][0]
+    assert submission["id"] == "s1"
+    assert submission["user_id"] == "7"
+    assert submission["status"] == "passed"
+    assert submission["files"][0]["name"] == "loesung.pdf"
+
+
+def test_exercise_parser_streaming_matches_tree_parse(temp_component_dir, monkeypatch):
+    """Test: Inkrementelles Parsen liefert dieselben Übungsdaten wie ET.parse."""
+    from shared.utils.ilias.parsers import base
+    from shared.utils.ilias.parsers.exercise import ExerciseParser
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Exercise', 'set_1', 'export.xml'), EXERCISE_XML)
+    expected = ExerciseParser(temp_component_dir).parse()
+
+    monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    parser = ExerciseParser(temp_component_dir)
+
+    assert parser.parse() == expected
+    assert len(parser._stream_records['Assignment']) == 1
+
+
+def test_iter_files_matches_os_walk(temp_component_dir):
+    """Test: iter_files liefert dieselben Dateien und Größen wie os.walk."""
+    from shared.utils.ilias.parsers.base import iter_files
+
+    _write(os.path.join(temp_component_dir, 'a.txt'), 'abc')
+    _write(os.path.join(temp_component_dir, 'x', 'y', 'b.pdf'), 'abcdef')
+    _write(os.path.join(temp_component_dir, 'x', 'c.zip'), '')
+
+    expected = []
+    for root, _, filenames in os.walk(temp_component_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            expected.append((filename, path, os.path.getsize(path)))
+
+    assert list(iter_files(temp_component_dir)) == expected
+
+
+def test_parse_xml_files_streams_in_order(temp_component_dir, monkeypatch):
+    """Test: parse_xml_files liefert in Eingabereihenfolge und parst nur begrenzt voraus."""
+    from shared.utils.ilias.parsers import base
+
+    paths = []
+    for i in range(10):
+        path = os.path.join(temp_component_dir, f'{i}.xml')
+        _write(path, f'<Page id="{i}"/>' if i != 3 else '<Page>')
+        paths.append(path)
+
+    submitted = []
+    parse = base._try_parse_xml_file
+    monkeypatch.setattr(base, '_try_parse_xml_file', lambda path: submitted.append(path) or parse(path))
+    monkeypatch.setattr(base, '_READ_WORKERS', 1)
+    monkeypatch.setattr(base, '_PARSE_AHEAD', 2)
+
+    parsed = base.parse_xml_files(paths)
+    first_path, (root, error) = next(parsed)
+    assert first_path == paths[0] and root.get('id') == '0' and error is None
+    assert len(submitted) <= 3
+
+    rest = list(parsed)
+    assert [path for path, _ in rest] == paths[1:]
+    assert rest[2][1][0] is None and rest[2][1][1] is not None
+
+
+def test_exercise_assignments_from_filesystem(temp_component_dir):
+    """Test: Ohne Aufgaben in der XML werden sie aus dem Dateisystem gelesen."""
+    from shared.utils.ilias.parsers.exercise import ExerciseParser
+
+    assignment_dir = os.path.join(temp_component_dir, 'assignment_3')
+    _write(os.path.join(assignment_dir, 'assignment.xml'), '<A><Title>Blatt 3</Title><EndDate>2025-02-01</EndDate></A>')
+    _write(os.path.join(assignment_dir, 'files', 'blatt.pdf'), 'abcde')
+    _write(os.path.join(assignment_dir, 'submissions', '7', 'loesung.zip'), 'ab')
+    _write(os.path.join(temp_component_dir, 'assignment_notes.txt'), 'kein Verzeichnis')
+
+    assignments = ExerciseParser(temp_component_dir)._extract_assignments_from_filesystem()
+
+    assert assignments == [{
+        'id': '3',
+        'title': 'Blatt 3',
+        'description': 'Aus dem Dateisystem extrahierte Aufgabe 3',
+        'enddate': '2025-02-01',
+        'files': [{'name': 'blatt.pdf', 'size': '5', 'type': 'pdf',
+                   'path': os.path.join('assignment_3', 'files', 'blatt.pdf')}],
+        'submissions': [{'id': '3_7', 'user_id': '7', 'files': [
+            {'name': 'loesung.zip', 'size': '2', 'type': 'zip',
+             'path': os.path.join('assignment_3', 'submissions', '7', 'loesung.zip')}]}],
+    }]
+
+
+def test_exercise_filesystem_fallback_is_resolved(temp_component_dir, monkeypatch):
+    """Test: Der Dateisystem-Fallback ist im Ergebnis von parse() bereits enthalten."""
+    from shared.utils.ilias.parsers.exercise import ExerciseParser
+
+    xml = EXERCISE_XML.split('<Assignments>')[0] + '</Exercise></exp:ExportItem></exp:Export>'
+    _write(os.path.join(temp_component_dir, 'Modules', 'Exercise', 'set_1', 'export.xml'), xml)
+    monkeypatch.setattr(ExerciseParser, '_extract_assignments_from_filesystem',
+                        lambda self: [{'id': '1'}])
+
+    data = ExerciseParser(temp_component_dir).parse()
+
+    # Auch C-seitige Zugriffe (z.B. durch JSON-Serialisierer) sehen die Aufgaben
+    assert type(data) is dict
+    assert dict.get(data, 'assignments') == [{'id': '1'}]
+    assert data == {'id': '5', 'title': 'Übung', 'settings': {'passmode': 'all'},
+                    'assignments': [{'id': '1'}]}
+
+
+def test_scan_xml_fields_stops_after_all_fields(temp_component_dir):
+    """Test: scan_xml_fields bricht ab, sobald alle Felder gefunden wurden."""
+    from shared.utils.ilias.parsers.base import scan_xml_fields
+
+    path = os.path.join(temp_component_dir, 'a.xml')
+    # Der defekte Rest der Datei wird nicht mehr gelesen
+    _write(path, '<A><Title>T1</Title><Title>T2</Title><Empty/><Date>d</Date><Broken></A>')
+
+    assert scan_xml_fields(path, frozenset({'Title', 'Date'})) == {'Title': 'T1', 'Date': 'd'}
+    assert scan_xml_fields(path, frozenset({'Empty'})) == {'Empty': None}
+
+
+def test_compiled_path_union():
+    """Test: Pfad-Vereinigungen funktionieren mit lxml und mit der Standardbibliothek."""
+    from shared.utils.ilias.parsers.base import ET, compile_path
+
+    elem = ET.fromstring('<S><Grade>1</Grade><X/><Date>d</Date><Date>d2</Date></S>')
+    selector = compile_path('Date|Status|Grade')
+
+    assert sorted(e.text for e in selector.findall(elem)) == ['1', 'd', 'd2']
+    assert selector.find(elem).tag in ('Date', 'Grade')
+    assert compile_path('Status|Feedback').find(elem) is None
+
+
+def test_filesystem_scan_is_cached_until_directory_changes(temp_component_dir, monkeypatch):
+    """Test: Dateisystem-Durchläufe werden pro Pfad und Änderungszeit gecacht."""
+    from shared.utils.ilias.parsers.exercise import ExerciseParser
+
+    _write(os.path.join(temp_component_dir, 'assignment_1', 'files', 'a.pdf'), 'x')
+    calls = []
+    scan = ExerciseParser._scan_assignments_from_filesystem
+    monkeypatch.setattr(ExerciseParser, '_scan_assignments_from_filesystem',
+                        lambda self: calls.append(1) or scan(self))
+
+    first = ExerciseParser(temp_component_dir)._extract_assignments_from_filesystem()
+    first[0]['title'] = 'Geändert'
+    second = ExerciseParser(temp_component_dir)._extract_assignments_from_filesystem()
+
+    assert calls == [1]
+    assert second[0]['title'] == 'Aufgabe 1'
+
+    # Ein neuer Eintrag ändert die Änderungszeit des Komponenten-Verzeichnisses
+    os.makedirs(os.path.join(temp_component_dir, 'assignment_2'))
+    st = os.stat(temp_component_dir)
+    os.utime(temp_component_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    third = ExerciseParser(temp_component_dir)._extract_assignments_from_filesystem()
+
+    assert calls == [1, 1]
+    assert len(third) == 2
+
+
+FORUM_XML = """<?xml version="1.0" encoding="utf-8"?>
+<exp:Export xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1" Entity="frm">
+  <exp:ExportItem Id="3">
+    <Forum>
+      <Id>3</Id>
+      <Title>Forum</Title>
+      <Settings>
+        <Anonymized>0</Anonymized>
+      </Settings>
+      <Topics>
+        <Topic id="t1">
+          <Title>Thema</Title>
+          <Sticky>1</Sticky>
+          <Posts>
+            <Post id="p1">
+              <Message>Hallo</Message>
+              <CreateDate>2025-01-01</CreateDate>
+              <Attachments>
+                <Attachment><Name>notiz.txt</Name><Size>4</Size></Attachment>
+              </Attachments>
+            </Post>
+          </Posts>
+        </Topic>
+      </Topics>
+    </Forum>
+  </exp:ExportItem>
+</exp:Export>
+"""
+
+
+def test_forum_parser(temp_component_dir):
+    """Test: Themen, Beiträge und Anhänge eines Forums werden extrahiert."""
+    from shared.utils.ilias.parsers.forum import ForumParser
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Forum', 'set_1', 'export.xml'), FORUM_XML)
+
+    data = ForumParser(temp_component_dir).parse()
+
+    assert data["title"] == "Forum"
+    assert data["settings"] == {"anonymized": "0"}
+    topic = data["topics"][0]
+    assert topic["id"] == "t1"
+    assert topic["title"] == "Thema"
+    assert topic["sticky"] is True
+    assert topic["closed"] is False
+    post = topic["posts"][0]
+    assert post["message"] == "Hallo"
+    assert post["create_date"] == "2025-01-01"
+    assert post["title"] == ""
+    assert post["attachments"] == [{"name": "notiz.txt", "size": "4", "type": "", "path": ""}]
+
+
+def test_forum_topics_from_filesystem(temp_component_dir):
+    """Test: Themen und Beiträge werden aus Verzeichnissen und deren XML-Dateien gelesen."""
+    from shared.utils.ilias.parsers.forum import ForumParser
+
+    topic_dir = os.path.join(temp_component_dir, 'topic_4')
+    _write(os.path.join(topic_dir, 'topic.xml'),
+           '<Topic><Head><Title>Fragen</Title></Head><Description/><Author>anna</Author></Topic>')
+    _write(os.path.join(topic_dir, 'post_9', 'post.xml'), '<Post><Message>Text</Message></Post>')
+    _write(os.path.join(topic_dir, 'post_9', 'attachments', 'a.txt'), 'abc')
+
+    topics = ForumParser(temp_component_dir)._extract_topics_from_filesystem()
+
+    assert topics == [{
+        'id': '4',
+        'title': 'Fragen',
+        'description': 'Aus dem Dateisystem extrahiertes Thema 4',
+        'author': 'anna',
+        'posts': [{
+            'id': '9',
+            'title': 'Beitrag 9',
+            'message': 'Text',
+            'attachments': [{'name': 'a.txt', 'size': '3', 'type': 'txt',
+                             'path': os.path.join('topic_4', 'post_9', 'attachments', 'a.txt')}]
+        }]
+    }]
+
+
+def test_forum_parser_streaming_matches_tree_parse(temp_component_dir, monkeypatch):
+    """Test: Inkrementelles Parsen liefert dieselben Forumdaten wie ET.parse."""
+    from shared.utils.ilias.parsers import base
+    from shared.utils.ilias.parsers.forum import ForumParser
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Forum', 'set_1', 'export.xml'), FORUM_XML)
+    expected = ForumParser(temp_component_dir).parse()
+
+    monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    parser = ForumParser(temp_component_dir)
+
+    assert parser.parse() == expected
+    assert len(parser._stream_records['Topic']) == 1
+
+
+def test_forum_iter_topics_streams_topics(temp_component_dir):
+    """Test: iter_topics liefert die Themen einzeln wie parse()."""
+    import types
+    from shared.utils.ilias.parsers.forum import ForumParser
+
+    _write(os.path.join(temp_component_dir, 'Modules', 'Forum', 'set_1', 'export.xml'), FORUM_XML)
+    parser = ForumParser(temp_component_dir)
+    topics = parser.iter_topics()
+
+    assert isinstance(topics, types.GeneratorType)
+    assert list(topics) == parser.parse()['topics']
+
+
+def test_find_descendant_matches_local_name():
+    """Test: find_descendant findet das erste Element unabhängig vom Namespace."""
+    from shared.utils.ilias.parsers.base import ET, find_descendant
+
+    root = ET.fromstring('<a xmlns:x="urn:x"><b><x:Title>n</x:Title></b><Title>p</Title></a>')
+
+    assert find_descendant(root, 'Title').text == 'n'
+    assert find_descendant(root, 'Description') is None
+    assert find_descendant(ET.fromstring('<Title>r</Title>'), 'Title') is None
+
+
+def test_forum_filesystem_topics_are_cached(temp_component_dir, monkeypatch):
+    """Test: Themen aus dem Dateisystem werden pro Pfad und Änderungszeit nur einmal gesucht."""
+    from shared.utils.ilias.parsers.forum import ForumParser
+
+    _write(os.path.join(temp_component_dir, 'topic_1', 'post_1', 'post.xml'), '<Post/>')
+    calls = []
+    scan = ForumParser._scan_topics_from_filesystem
+    monkeypatch.setattr(ForumParser, '_scan_topics_from_filesystem',
+                        lambda self: calls.append(1) or scan(self))
+
+    first = ForumParser(temp_component_dir)._extract_topics_from_filesystem()
+    second = ForumParser(temp_component_dir)._extract_topics_from_filesystem()
+
+    assert calls == [1]
+    assert first == second
+    assert first is not second
+
+
+def test_group_structure_from_filesystem(temp_component_dir):
+    """Test: Container-Items werden aus den Verzeichnisnamen und export.xml gelesen."""
+    from shared.utils.ilias.parsers.group import GroupParser
+
+    _write(os.path.join(temp_component_dir, '1700000000__0__file_42', 'export.xml'),
+           '<Export><Item><Title>Skript</Title></Item></Export>')
+    os.makedirs(os.path.join(temp_component_dir, '1700000000__0__fold'))
+    os.makedirs(os.path.join(temp_component_dir, 'ohne_typ'))
+    # Komponenten in Unter-Containern gehören nicht zur Gruppe selbst
+    os.makedirs(os.path.join(temp_component_dir, '1700000000__0__fold', '1700000001__0__crs_7'))
+
+    data = GroupParser(temp_component_dir)._extract_group_structure_from_filesystem()
+
+    assert sorted(data['container_settings']['items'], key=lambda item: item['type']) == [
+        {'ref_id': '42', 'type': 'file', 'title': 'Skript'},
+        {'ref_id': 'unknown', 'type': 'fold', 'title': '1700000000__0__fold'}
+    ]
+
+
+def test_group_parser_falls_back_to_filesystem_items(temp_component_dir):
+    """Test: Ohne Items in der XML werden die Container-Items aus dem Dateisystem gelesen."""
+    from shared.utils.ilias.parsers.group import GroupParser
+
+    _write(os.path.join(temp_component_dir, 'export.xml'),
+           '<exp:Export xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1" Entity="grp">'
+           '<exp:ExportItem Id="5"><Group><Title>Gruppe</Title>'
+           '<Container view="simple"/></Group></exp:ExportItem></exp:Export>')
+    _write(os.path.join(temp_component_dir, '1700000000__0__file_42', 'export.xml'),
+           '<Export><Item><Title>Skript</Title></Item></Export>')
+
+    data = GroupParser(temp_component_dir).parse()
+
+    assert data['title'] == 'Gruppe'
+    assert data['container_settings'] == {
+        'view': 'simple',
+        'sorting': 'title',
+        'items': [{'ref_id': '42', 'type': 'file', 'title': 'Skript'}]
+    }
+
+
+def test_looks_like_xml(tmp_path):
+    """Test: Die Vorprüfung erkennt XML auch mit BOM und lehnt Binärdateien ab."""
+    from shared.utils.ilias.parsers.base import looks_like_xml
+
+    xml_file = tmp_path / 'a.xml'
+    xml_file.write_bytes(b'\xef\xbb\xbf\n  <?xml version="1.0"?><A/>')
+    binary_file = tmp_path / 'b.xml'
+    binary_file.write_bytes(b'\x89PNG\r\n\x1a\n')
+
+    assert looks_like_xml(str(xml_file))
+    assert not looks_like_xml(str(binary_file))
+    assert not looks_like_xml(str(tmp_path / 'fehlt.xml'))
+    assert looks_like_xml(b'<Forum/>')
+    assert not looks_like_xml(b'')
+
+
+def test_learning_module_pages_collect_nested_content(temp_component_dir):
+    """Test: Medien und Absätze werden dem umschließenden Page-Objekt zugeordnet."""
+    from shared.utils.ilias.parsers.learning_module import LearningModuleParser
+
+    _write(os.path.join(temp_component_dir, 'export.xml'), '''<Export><ContentObject>
+        <Title>Modul</Title>
+        <StructureObject><Title>Kapitel</Title>
+            <PageObject Layout="1c"><Title>Seite</Title><PageContent>
+                <Paragraph Characteristic="Headline1">Kopf</Paragraph>
+                <MediaObject Alias="il_1" Type="img"><MediaItem Location="a.png" Format="image/png"/></MediaObject>
+            </PageContent></PageObject>
+        </StructureObject>
+        <Paragraph>Außerhalb</Paragraph>
+        <PageObject><Title>Leer</Title></PageObject>
+    </ContentObject></Export>''')
+
+    data = LearningModuleParser(temp_component_dir).parse()
+
+    assert data['structure_objects'] == [{'type': 'st', 'title': 'Kapitel'}]
+    assert data['page_objects'] == [
+        {'title': 'Seite', 'layout': '1c',
+         'media_objects': [{'alias': 'il_1', 'type': 'img', 'location': 'a.png', 'format': 'image/png'}],
+         'paragraphs': [{'language': 'de', 'characteristic': 'Headline1', 'content': 'Kopf'}]},
+        {'title': 'Leer', 'layout': 'standard'}
+    ]
+
+
+def test_item_group_dataset_streaming_matches_tree_parse(temp_component_dir, monkeypatch):
+    """Test: Inkrementelles Parsen der DataSet-Datensätze liefert dieselben Daten."""
+    from shared.utils.ilias.parsers import base
+    from shared.utils.ilias.parsers.item_group import ItemGroupParser
+
+    _write(os.path.join(temp_component_dir, 'export.xml'), '''<exp:Export
+        xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1"
+        xmlns:ds="http://www.ilias.de/Services/DataSet/ds/4_3"><exp:ExportItem><ds:DataSet>
+        <ds:Rec Entity="itgr"><Itgr><Id>1</Id><Title>Gruppe</Title></Itgr></ds:Rec>
+        <ds:Rec Entity="itgr_item"><ItgrItem><ItgrId>1</ItgrId><ItemId>55</ItemId></ItgrItem></ds:Rec>
+        <ds:Rec Entity="itgr_item"><ItgrItem><ItgrId>1</ItgrId></ItgrItem></ds:Rec>
+    </ds:DataSet></exp:ExportItem></exp:Export>''')
+    expected = ItemGroupParser(temp_component_dir).parse()
+
+    monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    parser = ItemGroupParser(temp_component_dir)
+
+    assert parser.parse() == expected
+    assert expected['items'] == [{'item_id': '55', 'itgr_id': '1', 'type': 'ref'}]
+    assert len(parser._stream_records['Rec']) == 2
+
+
+def test_item_group_content_html_without_content_tag(temp_component_dir):
+    """Test: content_html enthält nur den Inhalt von Content, ohne Tag und Namespaces."""
+    from shared.utils.ilias.parsers.item_group import ItemGroupParser
+
+    _write(os.path.join(temp_component_dir, 'export.xml'), '''<exp:Export
+        xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1"><exp:ExportItem><ItemGroup>
+        <Title>Alt</Title><Items><Item id="1"><Content>a &lt; b <p>Absatz</p>!</Content>
+        </Item></Items></ItemGroup></exp:ExportItem></exp:Export>''')
+
+    data = ItemGroupParser(temp_component_dir).parse()
+
+    assert data['items'][0]['content_html'] == 'a &lt; b <p>Absatz</p>!'
+
+
+def test_media_cast_filesystem_probes_videos(temp_component_dir, monkeypatch):
+    """Test: Video-Metadaten werden aus der JSON-Ausgabe von ffprobe gelesen."""
+    import subprocess
+    from shared.utils.ilias.parsers import media_cast
+    from shared.utils.ilias.parsers.media_cast import MediaCastParser
+
+    _write(os.path.join(temp_component_dir, 'objects', 'clip.mp4'), 'xxxx')
+    _write(os.path.join(temp_component_dir, 'objects', 'ton.mp3'), 'yy')
+    probed = []
+
+    def fake_run(args, **kwargs):
+        probed.append(args[-1])
+        stdout = '{"streams": [{}, {"width": 640, "height": 360}], "format": {"duration": "12.5"}}'
+        return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr='')
+
+    monkeypatch.setattr(media_cast.shutil, 'which', lambda name: '/usr/bin/ffprobe')
+    monkeypatch.setattr(media_cast.subprocess, 'run', fake_run)
+
+    items = {item['title']: item for item in MediaCastParser(temp_component_dir)._extract_media_from_filesystem()['media_items']}
+
+    assert [os.path.basename(path) for path in probed] == ['clip.mp4']
+    assert items['clip.mp4']['duration'] == '12.5'
+    assert (items['clip.mp4']['width'], items['clip.mp4']['height']) == ('640', '360')
+    assert 'duration' not in items['ton.mp3']
+
+
+def test_get_attribute_interns_short_values(temp_component_dir):
+    """Test: Kurze Attributwerte teilen sich über Datensätze hinweg ein String-Objekt."""
+    from shared.utils.ilias.parsers.base import ET
+
+    parser = CourseParser(temp_component_dir)
+    first, second = ET.fromstring('<R><P Language="de"/><P Language="de"/></R>')
+    long_value = 'x' * 100
+
+    assert parser._get_attribute(first, 'Language') is parser._get_attribute(second, 'Language')
+    assert parser._get_attribute(first, 'Missing', long_value) is long_value
+    assert parser._get_attribute(first, 'Missing', None) is None
+
+
+def test_find_export_item_searches_non_export_roots():
+    """Test: Das ExportItem wird auch unter einer Wurzel außerhalb des Export-Namespace gefunden."""
+    from shared.utils.ilias.parsers.base import ET, NS_EXP, find_export_item
+
+    export = ET.fromstring(f'<exp:Export xmlns:exp="{NS_EXP}"><exp:ExportItem Id="1"/></exp:Export>')
+    other = ET.fromstring(f'<Other><exp:ExportItem xmlns:exp="{NS_EXP}" Id="2"/></Other>')
+    wrapper = ET.fromstring(f'<Wrapper xmlns:exp="{NS_EXP}"><Set><exp:ExportItem Id="3"/></Set></Wrapper>')
+    plain = ET.fromstring('<Other><ExportItem Id="4"/></Other>')
+
+    assert find_export_item(export).get('Id') == '1'
+    assert find_export_item(export[0]) is export[0]
+    assert find_export_item(other).get('Id') == '2'
+    assert find_export_item(wrapper).get('Id') == '3'
+    assert find_export_item(plain) is None
+
+
+def test_parse_result_cache_is_opt_in(temp_component_dir, monkeypatch):
+    """Test: Mit CACHE_RESULTS wird eine unveränderte XML-Datei nicht erneut geparst."""
+    xml_path = os.path.join(temp_component_dir, 'Modules', 'Course', 'set_1', 'export.xml')
+    _write(xml_path, COURSE_XML)
+    calls = []
+    original = CourseParser._parse_xml
+
+    def counting_parse_xml(self, root):
+        calls.append(root)
+        return original(self, root)
+
+    monkeypatch.setattr(CourseParser, '_parse_xml', counting_parse_xml)
+    monkeypatch.setattr(IliasComponentParser, '_result_cache', type(IliasComponentParser._result_cache)())
+
+    CourseParser(temp_component_dir).parse()
+    CourseParser(temp_component_dir).parse()
+    assert len(calls) == 2
+
+    monkeypatch.setattr(CourseParser, 'CACHE_RESULTS', True)
+    first = CourseParser(temp_component_dir).parse()
+    first['title'] = 'Verändert'
+    second = CourseParser(temp_component_dir).parse()
+    assert len(calls) == 3
+    assert second['title'] == 'Testkurs'
+
+    # Eine geänderte Datei wird neu geparst
+    _write(xml_path, COURSE_XML.replace('Testkurs', 'Neuer Kurs'))
+    assert CourseParser(temp_component_dir).parse()['title'] == 'Neuer Kurs'
+    assert len(calls) == 4
+
+
+def _mp4_box(box_type, payload):
+    """Baut eine MP4-Box aus Typ und Nutzdaten."""
+    import struct
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def test_media_cast_reads_mp4_boxes_without_ffprobe(temp_component_dir, monkeypatch):
+    """Test: Dauer und Abmessungen von MP4-Dateien werden ohne ffprobe aus den Boxen gelesen."""
+    import struct
+    from shared.utils.ilias.parsers import media_cast
+
+    mvhd = _mp4_box(b'mvhd', struct.pack('>B3xIIII', 0, 0, 0, 1000, 12500) + bytes(80))
+    # Audio-Spur ohne Abmessungen vor der Video-Spur (tkhd Version 1)
+    audio = _mp4_box(b'trak', _mp4_box(b'tkhd', bytes(84)))
+    video = _mp4_box(b'trak', _mp4_box(b'tkhd', b'\x01' + bytes(87) + struct.pack('>II', 640 << 16, 360 << 16)))
+    data = _mp4_box(b'ftyp', b'isom' + bytes(4)) + _mp4_box(b'mdat', bytes(64)) + _mp4_box(b'moov', mvhd + audio + video)
+    path = os.path.join(temp_component_dir, 'clip.mp4')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError('ffprobe darf nicht gestartet werden')
+
+    monkeypatch.setattr(media_cast.shutil, 'which', lambda name: '/usr/bin/ffprobe')
+    monkeypatch.setattr(media_cast.subprocess, 'run', fail_run)
+
+    assert media_cast._probe_videos([path]) == {
+        path: {'duration': '12.500000', 'width': '640', 'height': '360'}
+    }
+
+
+def test_wiki_pages_streaming_matches_tree_parse(temp_component_dir, monkeypatch):
+    """Test: Inkrementelles Parsen der Wiki-Seiten liefert dieselben Daten."""
+    from shared.utils.ilias.parsers import base
+    from shared.utils.ilias.parsers.wiki import WikiParser
+
+    _write(os.path.join(temp_component_dir, 'export.xml'), '''<exp:Export
+        xmlns:exp="http://www.ilias.de/Services/Export/exp/4_1"><exp:ExportItem><Wiki>
+        <Title>Wiki</Title><Pages>
+        <Page id="1"><Title>Start</Title><IsStartpage>1</IsStartpage>
+            <Versions><Version id="v1"><Number>1</Number><Comment>Neu</Comment></Version></Versions></Page>
+        <Page id="2"><Title>Zweite</Title>
+            <Attachments><Attachment><Name>a.pdf</Name><Size>3</Size></Attachment></Attachments></Page>
+    </Pages></Wiki></exp:ExportItem></exp:Export>''')
+    expected = WikiParser(temp_component_dir).parse()
+
+    monkeypatch.setattr(base, '_STREAM_MIN_SIZE', 0)
+    parser = WikiParser(temp_component_dir)
+
+    assert parser.parse() == expected
+    assert [page['title'] for page in expected['pages']] == ['Start', 'Zweite']
+    assert expected['pages'][0]['is_startpage'] is True
+    assert expected['pages'][0]['versions'][0]['comment'] == 'Neu'
+    assert expected['pages'][1]['attachments'][0]['name'] == 'a.pdf'
+    assert len(parser._stream_records['Page']) == 2